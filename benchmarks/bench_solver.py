@@ -0,0 +1,385 @@
+"""Benchmarks for the hot paths of the solver.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_solver                 # run and write results
+    python -m benchmarks.bench_solver --save-baseline # store a new baseline
+    python -m benchmarks.bench_solver --full          # use the full word lists
+
+Every run writes its timings to a JSON file (`benchmarks/results/latest.json`
+by default). If a baseline file exists, each benchmark is compared against it
+and any benchmark which became slower than the allowed tolerance is reported
+as a regression, in which case the script exits with a non-zero status.
+
+No baseline is shipped with the repository, since the timings only mean
+something on the machine which recorded them. Before changing the solver,
+record one on the current commit with `--save-baseline` (using the same
+`--full` and `--backend` options that will be used afterwards), then run the
+script again after the change to compare against it. The baseline is written
+to `benchmarks/baseline.json` unless `--baseline` is given.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import platform
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from json import load, dump
+from random import seed, sample
+from time import perf_counter
+from typing import Callable, Optional
+
+import wordle_autosolver_lite.solver as solver
+from wordle_autosolver_lite.common import GameMode, set_response_data
+from wordle_autosolver_lite.common import get_response, filter_remaining
+from wordle_autosolver_lite.common import count_remaining, best_guesses
+from wordle_autosolver_lite.common import best_avg_guesses
+from wordle_autosolver_lite.common import best_entropy_guesses
+from wordle_autosolver_lite.common import set_backend, BACKENDS, AUTO
+from wordle_autosolver_lite.data import load_all_data
+
+
+BENCH_PATH = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BENCH_PATH, 'results', 'latest.json')
+DEFAULT_BASELINE = os.path.join(BENCH_PATH, 'baseline.json')
+MODES = {
+    'default': GameMode.DEFAULT,
+    'hard': GameMode.HARD,
+    'master': GameMode.MASTER,
+    'liar': GameMode.LIAR
+}
+WORD_LISTS = ('curated', 'nyt')
+BOARD_COUNTS = (1, 4, 8, 32)
+STARTER = 'roate'
+RANDOM_SEED = 2022
+SAMPLE_SIZES = (240, 1200)  # the answers and guesses sampled without --full
+
+Case = tuple[str, Callable[[], Callable[[], object]]]
+
+
+def load_words(mode: str, word_list: str, full: bool,
+               sizes: tuple[int, int] = SAMPLE_SIZES
+               ) -> tuple[list[str], list[str], dict[str, float]]:
+    """Loads the answers, guesses, and frequencies used by a benchmark.
+
+    Args:
+        mode:
+            The name of the game mode (one of the keys of `MODES`)
+        word_list:
+            Either "curated" or "nyt"
+        full:
+            A boolean value representing whether to use the full word lists;
+            otherwise, smaller samples are used so the suite finishes quickly
+        sizes:
+            The number of answers and the number of guesses to sample when
+            `full` is not set (default: SAMPLE_SIZES)
+
+    Returns:
+        A 3-tuple holding the list of answers, the list of guesses, and the
+        dict mapping every guess to its frequency of use.
+    """
+    game_mode = GameMode(MODES[mode])
+    answers, guesses, _, freq, _, _ = load_all_data(
+        game_mode.hard, game_mode.master, game_mode.liar,
+        word_list == 'nyt', False)
+    if not full:
+        seed(RANDOM_SEED)
+        answers = sorted(sample(answers, sizes[0]))
+        guesses = sorted(set(sample(guesses, sizes[1])) | set(answers)
+                         | {STARTER})
+    return answers, guesses, freq
+
+
+def _after_starter(answers: list[str], mode: GameMode) -> list[str]:
+    """Helper function which gives a realistic mid-game list of answers."""
+    partitions = {}
+    for answer in answers:
+        response = get_response(STARTER, answer, GameMode(mode.value & ~3))
+        partitions.setdefault(response, []).append(answer)
+    # pick the most common response so the remaining list is not trivial
+    return max(partitions.values(), key=len)
+
+
+def build_cases(full: bool = False,
+                sizes: tuple[int, int] = SAMPLE_SIZES) -> list[Case]:
+    """Builds every benchmark case.
+
+    Args:
+        full:
+            A boolean value representing whether to use the full word lists
+            (default: False)
+        sizes:
+            The number of answers and the number of guesses to sample when
+            `full` is not set (default: SAMPLE_SIZES)
+
+    Returns:
+        A list of 2-tuples where the first element is the name of the case and
+        the second element is a setup function. Calling the setup function
+        prepares the inputs and returns the function which should be timed.
+    """
+    cases = []
+    for word_list in WORD_LISTS:
+        for mode_name, value in MODES.items():
+            prefix = '{}/{}/'.format(word_list, mode_name)
+            cases += _kernel_cases(prefix, mode_name, word_list, full,
+                                   sizes, GameMode(value))
+            for num_boards in BOARD_COUNTS:
+                cases += _session_cases(prefix, mode_name, word_list, full,
+                                        sizes, GameMode(value), num_boards)
+    return cases
+
+
+def _kernel_cases(prefix: str, mode_name: str, word_list: str, full: bool,
+                  sizes: tuple[int, int], mode: GameMode) -> list[Case]:
+    """Helper function for `build_cases`."""
+    def words():
+        return load_words(mode_name, word_list, full, sizes)
+
+    def setup_get_response():
+        answers, guesses, _ = words()
+        sampled = guesses[:1000]
+
+        def run():
+            for guess in sampled:
+                for answer in answers[:100]:
+                    get_response(guess, answer, mode)
+        return run
+
+    def setup_filter_remaining():
+        answers, _, _ = words()
+        responses = [get_response(STARTER, answer) for answer in answers[:50]]
+
+        def run():
+            for response in responses:
+                filter_remaining(answers, STARTER, response, mode)
+        return run
+
+    def setup_count_remaining():
+        answers, _, _ = words()
+        responses = [get_response(STARTER, answer) for answer in answers[:50]]
+
+        def run():
+            for response in responses:
+                count_remaining(answers, STARTER, response, mode)
+        return run
+
+    def setup_best_guesses():
+        answers, guesses, _ = words()
+        remaining = _after_starter(answers, mode)
+        return lambda: best_guesses(remaining, guesses, mode)
+
+    def setup_best_avg_guesses():
+        answers, guesses, _ = words()
+        remaining = _after_starter(answers, mode)
+        return lambda: best_avg_guesses(remaining, guesses, mode)
+
+    def setup_best_entropy_guesses():
+        answers, guesses, _ = words()
+        remaining = _after_starter(answers, mode)
+        return lambda: best_entropy_guesses(remaining, guesses, mode)
+
+    return [
+        (prefix + 'get_response', setup_get_response),
+        (prefix + 'filter_remaining', setup_filter_remaining),
+        (prefix + 'count_remaining', setup_count_remaining),
+        (prefix + 'best_guesses', setup_best_guesses),
+        (prefix + 'best_avg_guesses', setup_best_avg_guesses),
+        (prefix + 'best_entropy_guesses', setup_best_entropy_guesses)
+    ]
+
+
+def _session_cases(prefix: str, mode_name: str, word_list: str, full: bool,
+                   sizes: tuple[int, int], mode: GameMode, num_boards: int
+                   ) -> list[Case]:
+    """Helper function for `build_cases`."""
+    prefix += '{}_boards/'.format(num_boards)
+
+    def new_session() -> solver.SessionInfo:
+        answers, guesses, freq = load_words(mode_name, word_list, full, sizes)
+        return solver.SessionInfo(num_boards, answers, guesses, {}, freq,
+                                  [STARTER], GameMode(mode.value))
+
+    def setup_find_best_overall_guess():
+        session = new_session()
+        seed(RANDOM_SEED)
+        solver.simulated_answers = sample(session.answers, num_boards)
+        solver._enter_guess(session, solver.simulated_guess, False)
+        solver._apply_responses(session, solver.simulated_response(session),
+                                solver.simulated_response, False)
+        return lambda: solver._find_best_overall_guess(session, False)
+
+    def setup_simulate():
+        session = new_session()
+        total_sims = 8 if num_boards == 1 else 1
+
+        def run():
+            seed(RANDOM_SEED)
+            # every repeat starts without any saved best guesses, since a
+            # tree filled in by an earlier repeat would skip the search
+            solver.simulate(session.copy(saved_best={}), total_sims,
+                            show=False)
+        return run
+
+    def setup_simulate_saved_best():
+        session = new_session()
+        total_sims = 8 if num_boards == 1 else 1
+        # play the same games once so every board has its best guesses saved
+        seed(RANDOM_SEED)
+        solver.simulate(session, total_sims, show=False)
+
+        def run():
+            seed(RANDOM_SEED)
+            solver.simulate(session, total_sims, show=False)
+        return run
+
+    return [
+        (prefix + '_find_best_overall_guess', setup_find_best_overall_guess),
+        (prefix + 'simulate', setup_simulate),
+        (prefix + 'simulate_saved_best', setup_simulate_saved_best)
+    ]
+
+
+def run_cases(cases: list[Case], repeat: int = 3,
+              pattern: Optional[str] = None, show: bool = True
+              ) -> dict[str, dict[str, float]]:
+    """Times every benchmark case.
+
+    Args:
+        cases:
+            A list of cases as returned by `build_cases`
+        repeat:
+            The number of times each case is timed (default: 3)
+        pattern:
+            If set, only cases with this substring in their name are run
+            (default: None)
+        show:
+            A boolean value representing whether to print each result as it is
+            measured (default: True)
+
+    Returns:
+        A dict mapping the name of each case to a dict holding its fastest
+        time (`min`), average time (`mean`), and number of repeats.
+    """
+    results = {}
+    for name, setup in cases:
+        if pattern is not None and pattern not in name:
+            continue
+        run = setup()
+        times = []
+        for _ in range(repeat):
+            # start every repeat with empty caches, or later repeats would
+            # only time cache hits
+            set_response_data({})
+            set_response_data({}, master=True)
+            start = perf_counter()
+            run()
+            times.append(perf_counter() - start)
+        results[name] = {
+            'min': min(times),
+            'mean': sum(times) / len(times),
+            'repeat': repeat
+        }
+        if show:
+            print('{:<60} {:>10.4f}s'.format(name, min(times)))
+    return results
+
+
+def compare_results(current: dict[str, dict[str, float]],
+                    baseline: dict[str, dict[str, float]],
+                    tolerance: float = 0.1
+                    ) -> list[tuple[str, float, float, float]]:
+    """Compares benchmark results against a baseline.
+
+    Args:
+        current:
+            The results of the current run, as returned by `run_cases`
+        baseline:
+            The results of a previous run in the same format
+        tolerance:
+            The fraction by which a case may become slower before it is
+            reported as a regression (default: 0.1)
+
+    Returns:
+        A list of 4-tuples for every case which regressed, holding the name of
+        the case, its baseline time, its current time, and the ratio between
+        the two. Cases which are missing from either run are ignored.
+    """
+    regressions = []
+    for name in sorted(current):
+        if name not in baseline or baseline[name]['min'] <= 0:
+            continue
+        before, after = baseline[name]['min'], current[name]['min']
+        ratio = after / before
+        if ratio > 1 + tolerance:
+            regressions.append((name, before, after, ratio))
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Main entry point into the benchmark suite."""
+    parser = ArgumentParser(description='Benchmark the solver hot paths.')
+    parser.add_argument('--full', action='store_true',
+                        help='use the full word lists (this may be very slow)')
+    parser.add_argument('--filter', metavar='PATTERN', default=None,
+                        help='only run cases whose name contains PATTERN')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of times to time each case (default: 3)')
+    parser.add_argument('--output', metavar='FILE', default=DEFAULT_OUTPUT,
+                        help='where to write the JSON results')
+    parser.add_argument('--baseline', metavar='FILE', default=DEFAULT_BASELINE,
+                        help='the JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help=('allowed slowdown before a case is flagged as a '
+                              'regression (default: 0.1, i.e. 10%%)'))
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='also write the results to the baseline file')
+    parser.add_argument('--backend', choices=BACKENDS, default=AUTO,
+                        help='which response kernels to use (default: auto)')
+    args = parser.parse_args(argv)
+    backend = set_backend(args.backend)
+    results = run_cases(build_cases(args.full), args.repeat, args.filter)
+    report = {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'full': args.full,
+            'repeat': args.repeat,
+            'backend': backend
+        },
+        'results': results
+    }
+    paths = [args.output] + ([args.baseline] if args.save_baseline else [])
+    for path in paths:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as outfile:
+            dump(report, outfile, indent=2, sort_keys=True)
+    if args.save_baseline:
+        return 0
+    if not os.path.exists(args.baseline):
+        print('\nNo baseline to compare against; run with --save-baseline '
+              'to record one.')
+        return 0
+    with open(args.baseline, 'r') as infile:
+        baseline = load(infile)
+    if baseline['meta'].get('full') != args.full:
+        print('\nBaseline was recorded with a different word list size.')
+        return 0
+    if baseline['meta'].get('backend', 'python') != backend:
+        print('\nBaseline was recorded with a different backend.')
+        return 0
+    regressions = compare_results(results, baseline['results'],
+                                  args.tolerance)
+    if len(regressions) == 0:
+        print('\nNo regressions against the baseline.')
+        return 0
+    print('\nREGRESSIONS:')
+    for name, before, after, ratio in regressions:
+        print('  {:<58} {:>8.4f}s > {:<8.4f}s (x{:.2f})'.format(
+            name, before, after, ratio))
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+from pytest import raises
+
+import wordle_autosolver_lite.api as api
+from wordle_autosolver_lite.common import GameMode, get_response
+from wordle_autosolver_lite.common import set_response_data
+from wordle_autosolver_lite.common import set_backend, PYTHON
+
+
+def test_next_guesses__no_history():
+    best = api.next_guesses(GameMode(), 1, [])
+    assert(len(best) == 16)
+    assert(best == api.next_guesses(GameMode.DEFAULT, 1, [], limit=16))
+
+
+def test_next_guesses__memoized():
+    api.clear_memo()
+    history = [('roate', [get_response('roate', 'value')]),
+               ('until', [get_response('until', 'value')])]
+    assert(api.next_guesses(GameMode(), 1, history) == ['value'])
+    hits = api.memo_info()['ranked_guesses'][0]
+    # the history is normalized before it is used as the memo key
+    assert(api.next_guesses(GameMode.PLAY_DEFAULT, 1,
+                            [('ROATE', '..+.o'), (' Until', ('+...+',))])
+           == ['value'])
+    assert(api.memo_info()['ranked_guesses'][0] == hits + 1)
+
+
+def test_next_guesses__shared_prefix():
+    api.clear_memo()
+    history = [('roate', ['..+.O'])]
+    api.next_guesses(GameMode(), 1, history + [('until', ['+...+'])])
+    misses = api.memo_info()['remaining_after'][1]
+    api.remaining_answers(GameMode(), 1, history)
+    assert(api.memo_info()['remaining_after'][1] == misses)
+
+
+def test_remaining_answers__modes():
+    api.clear_memo()
+    set_response_data({})
+    set_response_data({}, master=True)
+    history = [('roate', ['O+...'])]
+    answers = api._word_data(GameMode.MASTER, False)[0]
+    expected = [answer for answer in answers
+                if get_response('roate', answer, GameMode(GameMode.MASTER),
+                                use_cache=False) == 'O+...']
+    set_backend(PYTHON)  # every response goes through the response cache
+    try:
+        # calls in one mode do not change the answers found in another
+        default = api.remaining_answers(GameMode(), 1, history)
+        assert(api.remaining_answers(GameMode.MASTER, 1, history)
+               == [expected])
+        assert(api.remaining_answers(GameMode(), 1, history) == default)
+        assert(len(default[0]) < len(expected))
+        api.clear_memo()
+        assert(api.remaining_answers(GameMode.MASTER, 1, history)
+               == [expected])
+        assert(api.remaining_answers(GameMode(), 1, history) == default)
+    finally:
+        set_backend()
+        api.clear_memo()
+
+
+def test_next_guesses__multi():
+    history = [
+        ('roate', [get_response('roate', 'value'),
+                   get_response('roate', 'roate')]),
+        ('until', [get_response('until', 'value'), None])
+    ]
+    assert(api.remaining_answers(GameMode(), 2, history)
+           == [['value'], ['roate']])
+    assert(api.next_guesses(GameMode(), 2, history) == ['value'])
+
+
+def test_next_guesses__ranked_by_worst_case():
+    history = [('roate', ['..+.O'])]
+    remaining = api.remaining_answers(GameMode(), 1, history)[0]
+    assert(len(remaining) == 52)
+    best = api.next_guesses(GameMode(), 1, history, limit=None)
+    assert(len(best) > 0)
+    assert('roate' not in best)
+
+
+def test_next_guesses__bad_history():
+    with raises(ValueError):
+        api.next_guesses(GameMode(), 2, [('roate', ['.....'])])
+    with raises(ValueError):
+        api.next_guesses(GameMode(), 1, [('roate', ['OOOO+'])])
+    with raises(ValueError):
+        api.next_guesses(GameMode(), 0, [])
@@ -0,0 +1,44 @@
+from benchmarks import bench_solver
+
+
+def test_build_cases():
+    names = [name for name, _ in bench_solver.build_cases()]
+    assert(len(names) == len(set(names)))
+    for hot_path in ['get_response', 'filter_remaining', 'count_remaining',
+                     'best_guesses', 'best_avg_guesses', 'simulate',
+                     '_find_best_overall_guess']:
+        assert(any(name.endswith('/' + hot_path) for name in names))
+    assert('nyt/liar/32_boards/simulate' in names)
+    assert('curated/default/1_boards/simulate_saved_best' in names)
+    assert('curated/hard/4_boards/_find_best_overall_guess' in names)
+
+
+def test_every_case_runs():
+    # tiny word lists, so that every case can be run once as a smoke test
+    cases = bench_solver.build_cases(sizes=(40, 60))
+    results = bench_solver.run_cases(cases, repeat=1, show=False)
+    assert(list(results) == [name for name, _ in cases])
+
+
+def test_run_cases():
+    calls = []
+
+    def setup():
+        return lambda: calls.append(1)
+
+    results = bench_solver.run_cases([('a/case', setup), ('b/case', setup)],
+                                     repeat=2, pattern='a/', show=False)
+    assert(list(results) == ['a/case'])
+    assert(results['a/case']['repeat'] == 2)
+    assert(results['a/case']['min'] <= results['a/case']['mean'])
+    assert(len(calls) == 2)
+
+
+def test_compare_results():
+    baseline = {'fast': {'min': 1.0}, 'slow': {'min': 1.0},
+                'same': {'min': 2.0}, 'old': {'min': 1.0}}
+    current = {'fast': {'min': 0.5}, 'slow': {'min': 1.5},
+               'same': {'min': 2.1}, 'new': {'min': 9.0}}
+    assert(bench_solver.compare_results(current, baseline, 0.1)
+           == [('slow', 1.0, 1.5, 1.5)])
+    assert(bench_solver.compare_results(current, baseline, 0.6) == [])
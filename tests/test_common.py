@@ -1,4 +1,13 @@
+from json import load
+from collections.abc import Sequence
+from random import sample
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import raises
+
 import wordle_autosolver_lite.common as common
+from wordle_autosolver_lite.store import ResultStore
 
 
 ###############################################################################
@@ -331,6 +340,14 @@ def test_filter_remaining__liar(example_guess_remaining):
                'basic', 'share'])
 
 
+def test_filter_remaining__liar_all_right():
+    mode = common.GameMode(common.GameMode.LIAR)
+    remaining = ['rhyme', 'thyme', 'shame']
+    assert(common.filter_remaining(remaining, 'rhyme', 'OOOOO', mode,
+                                   use_cache=False)
+           == ['rhyme', 'thyme'])
+
+
 ###############################################################################
 #                           TEST COUNT REMAINING                              #
 ###############################################################################
@@ -436,6 +453,28 @@ def test_best_guess__master(small_sample_words):
            == set(['women', 'minor']))
 
 
+def test_best_guess__liar(small_sample_words):
+    mode = common.GameMode(common.GameMode.LIAR)
+    answers = ['flick', 'fling', 'clink', 'bring', 'penny', 'venue']
+    worst_case = common.best_guesses(answers, small_sample_words, mode,
+                                     return_all=True, use_cache=False)
+    # compare against every possible lie for every possible answer
+    for guess in ['flick', 'penne', 'gowfs']:
+        expected = 0
+        for answer in answers:
+            honest = common.get_response(guess, answer, use_cache=False)
+            for index, sym in enumerate(honest):
+                for alt in common.SYM_ALTS[sym]:
+                    lie = honest[:index] + alt + honest[index + 1:]
+                    expected = max(expected, common.count_remaining(
+                        answers, guess, lie, mode, use_cache=False))
+        assert(worst_case[guess] == expected)
+    # the recommendations do not depend on which lies the game picks
+    best = common.best_guesses(answers, small_sample_words, mode)
+    assert(all(common.best_guesses(answers, small_sample_words, mode) == best
+               for _ in range(3)))
+
+
 def test_best_guess__return_all():
     worst_case = common.best_guesses(['croup', 'crony', 'crown', 'croon'],
                                      return_all=True, use_cache=False)
@@ -493,6 +532,282 @@ def test_average_guess__return_all():
     assert(avg_case['croup'] == 2.5)
 
 
+def test_guess_classes():
+    classes = common.guess_classes(['croup', 'crony', 'crown', 'croon'],
+                                   ['crown', 'fight', 'sight', 'wight',
+                                    'frown', 'brown', 'night'])
+    assert(classes['fight'] == 'fight')
+    assert(classes['sight'] == 'fight')
+    assert(classes['wight'] == 'wight')
+    assert(classes['frown'] == 'frown')
+    assert(classes['brown'] == 'frown')
+    assert(classes['night'] == 'night')
+    assert(set(common.best_guesses(['croup', 'crony', 'crown', 'croon'],
+                                   ['fight', 'frown', 'brown', 'sight'],
+                                   use_cache=False))
+           == set(['frown', 'brown']))
+
+
+def test_order_by_coverage(small_sample_words):
+    answers = ['track', 'draft', 'actor', 'craft', 'altar', 'tract', 'graft',
+               'trawl', 'argot']
+    ordered = common.order_by_coverage(answers, small_sample_words)
+    assert(sorted(ordered) == sorted(small_sample_words))
+    assert(ordered.index('diact') < ordered.index('penny'))
+    # the order in which guesses are scored does not change the result
+    assert(common.best_guesses(answers, small_sample_words, use_cache=False)
+           == common.best_guesses(answers, small_sample_words[::-1],
+                                  use_cache=False))
+
+
+def test_response_counts():
+    answers = ['croup', 'crony', 'crown', 'croon']
+    assert(common.response_counts('crown', answers, use_cache=False)
+           == {'OOO..': 1, 'OOO.+': 1, 'OOOOO': 1, 'OOO.O': 1})
+    assert(common.response_counts('croup', answers, use_cache=False)
+           == {'OOOOO': 1, 'OOO..': 3})
+    assert(max(common.response_counts('croup', answers, limit=1,
+                                      use_cache=False).values()) == 2)
+    # in liar mode, every answer can give ten different responses
+    liar = common.response_counts('crown', answers[:2],
+                                  common.GameMode(common.GameMode.LIAR),
+                                  use_cache=False)
+    assert(sum(liar.values()) == 20)
+    assert('OOOOO' not in liar)
+
+
+def test_backend(sample_words):
+    assert(common.set_backend('python') == 'python')
+    assert(common.get_backend() == 'python')
+    mode = common.GameMode(common.GameMode.MASTER)
+    expected = [common.response_counts('trips', sample_words, mode,
+                                       use_cache=False),
+                common.filter_remaining(sample_words, 'trips', 'O+...', mode,
+                                        use_cache=False)]
+    with raises(ValueError):
+        common.set_backend('fortran')
+    if not common.NUMPY_AVAILABLE:
+        with raises(ModuleNotFoundError):
+            common.set_backend('numpy')
+        assert(common.set_backend() == 'python')
+        return
+    assert(common.set_backend('numpy') == 'numpy')
+    assert([common.response_counts('trips', sample_words, mode),
+            common.filter_remaining(sample_words, 'trips', 'O+...', mode)]
+           == expected)
+    assert(max(common.response_counts('trips', sample_words,
+                                      limit=3).values()) <= 4)
+    assert(common.set_backend() == 'numpy')
+
+
+def test_entropy_guess__easy(small_sample_words):
+    assert(common.response_entropy('crown', ['croup', 'crony', 'crown',
+                                             'croon'], use_cache=False)
+           == 2.0)
+    assert(set(common.best_entropy_guesses(['track', 'draft', 'actor',
+                                            'craft', 'altar', 'tract',
+                                            'graft', 'trawl', 'argot'],
+                                           small_sample_words,
+                                           use_cache=False))
+           == set(['diact']))
+    assert(set(common.best_entropy_guesses(['croup', 'crony', 'crown',
+                                            'croon'], use_cache=False))
+           == set(['crown', 'croon']))
+
+
+def test_entropy_guess__return_all():
+    entropy = common.best_entropy_guesses(['croup', 'crony', 'crown',
+                                           'croon'],
+                                          return_all=True, use_cache=False)
+    assert(entropy['crown'] == 2.0)
+    assert(entropy['crony'] == 1.5)
+    assert(entropy['croup'] < entropy['crony'])
+
+
+def test_rank_guesses__result_store(small_sample_words):
+    answers = ['track', 'draft', 'actor', 'craft', 'altar', 'tract', 'graft',
+               'trawl', 'argot']
+    best = common.best_guesses(answers, small_sample_words, use_cache=False)
+    store = ResultStore()
+    common.set_result_store(store)
+    common.set_profiling()
+    try:
+        assert(common.rank_guesses(answers, small_sample_words) == best)
+        assert(store.get(0, common.MINIMAX, answers, small_sample_words)
+               == (best, common.worst_case_remaining(best[0], answers)))
+        # any path which leaves the same answers reuses the result
+        assert(common.rank_guesses(answers[::-1], small_sample_words)
+               == best)
+        assert(common.get_profile_data()['result_store.hits']['calls'] == 1)
+        common.rank_guesses(answers, small_sample_words,
+                            strategy=common.ENTROPY)
+        assert(common.get_profile_data()['result_store.misses']['calls']
+               == 2)
+    finally:
+        common.set_profiling(False)
+        common.set_result_store(None)
+
+
+def test_anytime_best_guesses(small_sample_words, sample_words):
+    answers = ['track', 'draft', 'actor', 'craft', 'altar', 'tract', 'graft',
+               'trawl', 'argot']
+    best = common.best_guesses(answers, small_sample_words, use_cache=False)
+    # without a limit, every guess is scored
+    assert(common.anytime_best_guesses(answers, small_sample_words,
+                                       use_cache=False)
+           == (best, True))
+    assert(common.anytime_best_guesses(answers, small_sample_words,
+                                       time_limit=60, use_cache=False)
+           == (best, True))
+    # a single guess is always scored, even if the budget is spent
+    best = common.best_guesses(sample_words, use_cache=False)
+    found, proven = common.anytime_best_guesses(sample_words, budget=1,
+                                                use_cache=False)
+    assert(not proven)
+    assert(len(found) > 0)
+    assert(common.worst_case_remaining(found[0], sample_words)
+           >= common.worst_case_remaining(best[0], sample_words))
+    found, proven = common.anytime_best_guesses(answers, small_sample_words,
+                                                time_limit=0, use_cache=False)
+    assert(len(found) > 0)
+    # a guess which splits every answer apart cannot be improved on, so the
+    # budget only stops the search for a better one, not for ties
+    found, proven = common.anytime_best_guesses(['croup', 'crony'],
+                                                budget=1, use_cache=False)
+    assert(proven)
+    assert(sorted(found) == ['crony', 'croup'])
+    answers = ['flick', 'fling', 'crown']
+    found, proven = common.anytime_best_guesses(answers, small_sample_words,
+                                                time_limit=60,
+                                                use_cache=False)
+    assert(proven)
+    assert(sorted(found)
+           == sorted(common.best_guesses(answers, small_sample_words,
+                                         use_cache=False)))
+
+
+def test_rank_guesses__time_limit(small_sample_words):
+    answers = ['track', 'draft', 'actor', 'craft', 'altar', 'tract', 'graft',
+               'trawl', 'argot']
+    best = common.best_guesses(answers, small_sample_words, use_cache=False)
+    store = ResultStore()
+    common.set_result_store(store)
+    try:
+        assert(common.rank_guesses(answers, small_sample_words,
+                                   time_limit=60, return_proven=True)
+               == (best, True))
+        assert(len(store) == 1)
+        # results which may not be the best are never stored
+        found, proven = common.rank_guesses(answers, small_sample_words,
+                                            strategy=common.HYBRID,
+                                            time_limit=0, return_proven=True)
+        assert(len(found) > 0)
+        assert(len(store) == 1 + int(proven))
+    finally:
+        common.set_result_store(None)
+
+
+def test_rank_guesses__hybrid_time_limit(default_session):
+    answers = list(default_session.answers)
+    guesses = list(default_session.guesses)
+    start = perf_counter()
+    # the entropy prefilter stops at the time limit too
+    best, proven = common.rank_guesses(answers, guesses,
+                                       strategy=common.HYBRID,
+                                       time_limit=0.05, return_proven=True)
+    assert(perf_counter() - start < 2)
+    assert(not proven)
+    assert(len(best) > 0)
+
+
+def test_partition_cache(small_sample_words):
+    answers = ['track', 'draft', 'actor', 'craft', 'altar', 'tract', 'graft',
+               'trawl', 'argot']
+    worst = dict((guess, common.worst_case_remaining(guess, answers))
+                 for guess in small_sample_words)
+    entropy = common.response_entropy('diact', answers)
+    common.set_partition_cache()
+    common.set_profiling()
+    try:
+        best = common.best_guesses(answers, small_sample_words)
+        hits = common.get_profile_data().get('partition_cache.hits',
+                                             {'calls': 0})['calls']
+        # the guesses scored by `best_guesses` are not partitioned again
+        assert(all(common.worst_case_remaining(guess, answers)
+                   == worst[guess] for guess in best))
+        assert(common.get_profile_data()['partition_cache.hits']['calls']
+               == hits + len(best))
+        assert(common.response_entropy('diact', answers) == entropy)
+        assert(common.response_entropy('diact', answers) == entropy)
+        assert(common.get_profile_data()['partition_cache.hits']['calls']
+               == hits + len(best) + 1)
+        # an equal list is a different set of remaining answers
+        assert(common.worst_case_remaining('diact', answers[:])
+               == worst['diact'])
+        assert(common.get_profile_data()['partition_cache.hits']['calls']
+               == hits + len(best) + 1)
+        # every thread has its own cache
+        with ThreadPoolExecutor(1) as executor:
+            assert(executor.submit(common.get_partition_cache).result()
+                   is None)
+        # a partition which stopped early is not cached
+        common.response_counts('women', answers[:3], limit=0)
+        assert(common.worst_case_remaining('women', answers[:3])
+               == common.worst_case_remaining('women', answers[:3]))
+    finally:
+        common.set_profiling(False)
+        common.set_partition_cache(False)
+
+
+def test_top_guesses(small_sample_words):
+    answers = ['track', 'draft', 'actor', 'craft', 'altar', 'tract', 'graft',
+               'trawl', 'argot']
+    info = common.best_guesses(answers, small_sample_words, return_all=True,
+                               use_cache=False)
+    ranked = sorted(small_sample_words, key=lambda x: info[x])
+    assert(common.top_guesses(answers, small_sample_words, size=8)
+           == ranked[:8])
+    common.set_result_store(ResultStore())
+    common.set_profiling()
+    try:
+        assert(common.top_guesses(answers, small_sample_words, size=8)
+               == ranked[:8])
+        assert(common.top_guesses(answers, small_sample_words, size=4)
+               == ranked[:4])
+        assert(common.get_profile_data()['result_store.hits']['calls'] == 1)
+        # a longer list than the one stored has to be ranked again
+        assert(common.top_guesses(answers, small_sample_words, size=16)
+               == ranked[:16])
+        assert(common.get_profile_data()['result_store.misses']['calls']
+               == 2)
+        # only the answers are scored in hard mode
+        hard = common.GameMode(common.GameMode.HARD)
+        ranked = common.top_guesses(answers, small_sample_words, hard, size=16)
+        assert(sorted(ranked) == sorted(answers))
+        assert(common.top_guesses(answers, small_sample_words, hard, size=16)
+               == ranked)
+        assert(common.get_profile_data()['result_store.hits']['calls'] == 2)
+    finally:
+        common.set_profiling(False)
+        common.set_result_store(None)
+    guesses = answers + ['lymph', 'bongo', 'wreck']
+    tree = common.rec_build_best_tree(answers, guesses, 'bongo', hard, 3,
+                                      show=False)
+    assert('bongo' in tree)
+
+
+def test_best_guess__prefilter(small_sample_words):
+    answers = ['track', 'draft', 'actor', 'craft', 'altar', 'tract', 'graft',
+               'trawl', 'argot']
+    assert(set(common.best_guesses(answers, small_sample_words,
+                                   use_cache=False, prefilter=4))
+           == set(common.best_guesses(answers, small_sample_words,
+                                      use_cache=False)))
+    assert(len(common.best_guesses(answers, small_sample_words,
+                                   use_cache=False, prefilter=4,
+                                   return_all=True)) == 4)
+
+
 ###############################################################################
 #                         TEST REC BUILD BEST TREE                            #
 ###############################################################################
@@ -530,6 +845,98 @@ def test_rec_build_best_tree__good(small_sample_words, default_guesses):
            != {})
 
 
+def test_constraints(sample_words):
+    constraints = common.Constraints()
+    constraints.update('trips', 'O.+..')
+    assert(constraints.greens == ['t', None, None, None, None])
+    assert(constraints.min_count == {'t': 1, 'i': 1})
+    assert(constraints.max_count == {'r': 0, 'p': 0, 's': 0})
+    assert(constraints.allows('tiled'))
+    assert(not constraints.allows('think'))
+    assert(not constraints.allows('tripe'))
+    assert(sorted(constraints.filter(sample_words))
+           == sorted(common.filter_remaining(sample_words, 'trips',
+                                             'O.+..')))
+    other = constraints.copy()
+    other.update('tiled', 'OOOOO')
+    assert(other.filter(sample_words + ['tiled']) == ['tiled'])
+    assert(constraints.greens[1] is None)
+
+
+def test_constraints__repeated_letters():
+    constraints = common.Constraints()
+    constraints.update('geese', common.get_response('geese', 'reset'))
+    assert(constraints.min_count['e'] == 2)
+    assert(constraints.max_count['e'] == 2)
+    assert(constraints.allows('reset'))
+    assert(not constraints.allows('ester'))
+    assert(not constraints.allows('eerie'))
+
+
+def test_filter_history(default_guesses):
+    history = [('roate', common.get_response('roate', 'think')),
+               ('glint', common.get_response('glint', 'think'))]
+    expected = default_guesses
+    for guess, response in history:
+        expected = common.filter_remaining(expected, guess, response)
+    index = common.WordIndex(default_guesses)
+    assert(common.filter_history(default_guesses, history) == expected)
+    assert(common.filter_history(default_guesses, history, index=index)
+           == expected)
+    assert(common.filter_history(default_guesses, []) == default_guesses)
+
+
+def test_filter_history__master(sample_words):
+    mode = common.GameMode(common.GameMode.MASTER)
+    history = [('trips', 'O+...'), ('crane', '+....')]
+    expected = common.filter_remaining(sample_words, 'trips', 'O+...', mode)
+    expected = common.filter_remaining(expected, 'crane', '+....', mode)
+    assert(common.filter_history(sample_words, history, mode) == expected)
+
+
+def test_word_set():
+    words = common.WordSet(['crown', 'croup', 'crony'])
+    assert('croup' in words)
+    words.remove('croup')
+    assert('croup' not in words)
+    assert(words == ['crown', 'crony'])
+    assert(words[:] == ['crown', 'crony'])
+    assert(words[-1] == 'crony')
+    words.append('croon')
+    assert(words[-1] == 'croon')
+    # it is a Sequence, so it can be sampled like a list
+    assert(isinstance(words, Sequence))
+    assert(sorted(sample(words, 3)) == ['crony', 'croon', 'crown'])
+    other = words.copy()
+    other.remove('crown')
+    assert(list(words) == ['crown', 'crony', 'croon'])
+    assert(len(other) == 2)
+    with raises(ValueError):
+        words.remove('xxxxx')
+
+
+def test_word_list():
+    words = common.WordList(['*****', '*****', 'crown'])
+    assert('*****' in words)
+    words[0] = 'crony'
+    assert('*****' in words)
+    words[1] = 'c****'
+    assert('*****' not in words)
+    assert(words.index('crown') == 2)
+    words.append('crown')
+    words.remove('crown')
+    assert(words == ['crony', 'c****', 'crown'])
+    assert('crown' in words)
+    assert(words.pop() == 'crown')
+    assert('crown' not in words)
+    with raises(ValueError):
+        words.index('crown')
+    del words[0]
+    assert('crony' not in words)
+    words += ['croon']
+    assert('croon' in words)
+
+
 ###############################################################################
 #                            TEST MISCELLANEOUS                               #
 ###############################################################################
@@ -552,6 +959,13 @@ def test_response_data():
     response_data = {'alert': {'olive': '.O+..'}}
     common.set_response_data(response_data)
     assert(common.get_response_data()['alert']['olive'] == '.O+..')
+    # master responses are cached apart from the responses of other modes
+    common.set_response_data({}, master=True)
+    master = common.GameMode(common.GameMode.MASTER)
+    assert(common.get_response('alert', 'olive', master) == 'O+...')
+    assert(common.get_response_data(master=True)['alert']['olive']
+           == 'O+...')
+    assert(common.get_response('alert', 'olive') == '.O+..')
 
 
 def test_colored_response():
@@ -568,3 +982,35 @@ def test_colored_response():
                "\x1b[38;5;103m\x1b[48;5;30m+\x1b[0m"
                "."
                "."))
+
+
+def test_profiling__disabled():
+    common.set_profiling(False)
+    assert(common.get_profiling() is False)
+    common.get_response('trips', 'tried')
+    common.profile_count('counter')
+    assert(common.get_profile_data() == {})
+
+
+def test_profiling__enabled(sample_words, tmp_path):
+    common.set_profiling()
+    try:
+        assert(common.get_profiling() is True)
+        common.set_response_data({})
+        common.get_response('trips', 'tried', use_cache=True)
+        common.get_response('trips', 'tried', use_cache=True)
+        data = common.get_profile_data()
+        assert(data['response_cache.hits']['calls'] == 1)
+        assert(data['response_cache.misses']['calls'] == 1)
+        common.filter_remaining(sample_words, 'trips', '+....')
+        common.profile_count('counter', 3)
+        data = common.get_profile_data()
+        assert(data['filter_remaining']['calls'] == 1)
+        assert(data['counter'] == {'calls': 3, 'seconds': 0.0})
+        assert('response_cache hit rate:' in common.format_profile_data())
+        filename = tmp_path / 'profile.json'
+        common.save_profile_data(str(filename))
+        with open(filename, 'r') as infile:
+            assert(load(infile)['counter']['calls'] == 3)
+    finally:
+        common.set_profiling(False)
@@ -0,0 +1,100 @@
+from io import StringIO
+from json import loads
+
+import wordle_autosolver_lite.events as events
+import wordle_autosolver_lite.solver as solver
+
+
+class Recorder(events.Observer):
+    def __init__(self):
+        self.events = []
+
+    def notify(self, event, data):
+        self.events.append((event, data))
+
+
+def test_progress__unobserved():
+    items = list(range(10))
+    assert(events.progress(items, 'test') is items)
+    recorder = Recorder()
+    events.add_observer(recorder)
+    try:
+        assert(events.progress(items, 'test', show=False) is items)
+    finally:
+        events.remove_observer(recorder)
+    assert(recorder.events == [])
+
+
+def test_progress__observed():
+    recorder = Recorder()
+    events.add_observer(recorder)
+    try:
+        assert(list(events.progress(range(1000), 'test', total=1000))
+               == list(range(1000)))
+    finally:
+        events.remove_observer(recorder)
+    assert(events.get_observers() == [])
+    names = [event for event, _ in recorder.events]
+    assert(names[0] == 'progress.start' and names[-1] == 'progress.finish')
+    # updates are only sent at a coarse granularity
+    assert(names.count('progress.update') == events.PROGRESS_STEPS)
+    assert(recorder.events[-1][1]['done'] == 1000)
+    assert(len(set(data['id'] for _, data in recorder.events)) == 1)
+
+
+def test_log_observer():
+    stream = StringIO()
+    observer = events.LogObserver(stream)
+    events.add_observer(observer)
+    try:
+        events.emit('best_guess', guess='crown')
+        list(events.progress(['a', 'b'], 'test'))
+    finally:
+        events.remove_observer(observer)
+    lines = [loads(line) for line in stream.getvalue().splitlines()]
+    assert(lines[0]['event'] == 'best_guess' and lines[0]['guess'] == 'crown')
+    assert([line['event'] for line in lines[1:]]
+           == ['progress.start', 'progress.update', 'progress.update',
+               'progress.finish'])
+
+
+def test_console_observer(capsys, mini_session):
+    recorder = Recorder()
+    for observer in (recorder, events.ConsoleObserver(),
+                     events.ProgressBarObserver()):
+        events.add_observer(observer)
+    try:
+        avg, _ = solver.simulate(mini_session)
+    finally:
+        for observer in events.get_observers():
+            events.remove_observer(observer)
+    output = capsys.readouterr().out
+    assert('Simulation complete.' in output)
+    assert('AVERAGE = {:.2f}'.format(avg) in output)
+    finish = [data for event, data in recorder.events
+              if event == 'simulate.finish']
+    assert(len(finish) == 1 and finish[0]['average'] == avg)
+    assert(sum(finish[0]['scores'].values()) == finish[0]['total'])
+
+
+def test_solver_events__no_print(capsys, micro_session):
+    recorder = Recorder()
+    for observer in (recorder, events.ConsoleObserver()):
+        events.add_observer(observer)
+    try:
+        session = solver.solve_wordle(micro_session.copy(num_boards=2),
+                                      solver.simulated_guess,
+                                      solver.simulated_response)
+    finally:
+        for observer in events.get_observers():
+            events.remove_observer(observer)
+    # every event is still sent, but none of them are printed
+    assert(capsys.readouterr().out == '')
+    names = [event for event, _ in recorder.events]
+    assert(all(not data['show'] for _, data in recorder.events))
+    assert(names[:2] == ['solve.start', 'solve.starter'])
+    assert('best_guess' in names and 'board.response' in names)
+    answers = [data['answer'] for event, data in recorder.events
+               if event == 'board.answer']
+    assert(sorted(answers) == sorted(session.solved))
+    assert('solve.finish' in names)
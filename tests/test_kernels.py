@@ -0,0 +1,84 @@
+from pytest import importorskip
+
+import wordle_autosolver_lite.common as common
+from wordle_autosolver_lite.kernels import NumpyKernel
+
+importorskip('numpy')
+
+SYMBOLS = common.WRONG + common.CLOSE + common.RIGHT
+
+
+def test_numpy_kernel__responses(sample_words):
+    kernel = NumpyKernel(SYMBOLS)
+    for guess in ['trips', 'added', 'geese', 'llama', 'which']:
+        responses = kernel.responses(guess, sample_words)
+        for answer, response in zip(sample_words, responses):
+            assert(''.join(SYMBOLS[sym] for sym in response)
+                   == common.get_response(guess, answer, use_cache=False))
+        responses = kernel.responses(guess, sample_words, master=True)
+        for answer, response in zip(sample_words, responses):
+            assert(''.join(SYMBOLS[sym] for sym in response)
+                   == common.get_response(guess, answer,
+                                          common.GameMode(
+                                              common.GameMode.MASTER),
+                                          use_cache=False))
+
+
+def test_numpy_kernel__response_counts(sample_words):
+    kernel = NumpyKernel(SYMBOLS)
+    counts = {}
+    for answer in sample_words:
+        response = common.get_response('trips', answer, use_cache=False)
+        counts[response] = counts.get(response, 0) + 1
+    # the responses are kept in the order in which they first appear
+    assert(list(kernel.response_counts('trips', sample_words).items())
+           == list(counts.items()))
+    assert(kernel.response_counts('trips', []) == {})
+
+
+def test_numpy_kernel__filter_remaining(example_guess_remaining):
+    kernel = NumpyKernel(SYMBOLS)
+    guess, remaining = example_guess_remaining
+    response = common.get_response(guess, 'heart', use_cache=False)
+    assert(kernel.filter_remaining(remaining, guess, response)
+           == ['other', 'after', 'water', 'later', 'heart', 'court', 'north',
+               'earth'])
+    assert(kernel.filter_remaining(remaining, guess, 'GUESS') == [])
+    liar = kernel.filter_remaining(remaining, guess, 'OOOOO', liar=True)
+    assert(liar == [answer for answer in remaining
+                    if common.get_response(guess, answer, use_cache=False)
+                    .count(common.RIGHT) == 4])
+
+    class Unindexed(common.WordSet):
+        """Helper class which cannot be indexed."""
+        def __getitem__(self, index):
+            raise AssertionError('indexed a WordSet')
+
+    # a WordSet is read once instead of being indexed for every answer
+    assert(kernel.filter_remaining(Unindexed(remaining), guess, response)
+           == kernel.filter_remaining(remaining, guess, response))
+
+
+def test_numpy_kernel__encode_cache(sample_words):
+    kernel = NumpyKernel(SYMBOLS, cache_size=1)
+    words = tuple(sample_words)
+    array = kernel.encode(words)
+    assert(array.shape == (len(words), 5))
+    assert(kernel.encode(words) is array)
+    kernel.encode(tuple(sample_words))
+    assert(kernel.encode(words) is not array)
+    # a list may be changed in place, so it is never cached
+    words = sample_words[:]
+    array = kernel.encode(words)
+    words[0] = 'value'
+    assert(kernel.encode(words) is not array)
+    assert(bytes(kernel.encode(words)[0]) == b'value')
+
+
+def test_filter_remaining__changed_in_place(sample_words):
+    words = [word for word in sample_words if word != 'value']
+    assert(len(words) >= NumpyKernel(SYMBOLS).min_size)
+    response = common.get_response('valve', 'value', use_cache=False)
+    assert(common.filter_remaining(words, 'valve', response) == [])
+    words[0] = 'value'
+    assert(common.filter_remaining(words, 'valve', response) == ['value'])
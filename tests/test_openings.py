@@ -0,0 +1,139 @@
+from pytest import raises
+
+import wordle_autosolver_lite.common as common
+import wordle_autosolver_lite.data as data
+import wordle_autosolver_lite.openings as openings
+from wordle_autosolver_lite.solver import BEST_STARTERS, SessionInfo
+from wordle_autosolver_lite.solver import solve_wordle, simulated_guess
+from wordle_autosolver_lite.solver import simulated_response, _apply_responses
+
+
+def test_build_first_moves(small_sample_words):
+    table = openings.build_first_moves(small_sample_words, ['crown', 'flick'])
+    assert(table['size'] == len(small_sample_words))
+    assert(table['fingerprint']
+           == openings.answers_fingerprint(small_sample_words))
+    assert(set(table['moves']) == set(['crown', 'flick']))
+    assert(sum(len(ids) for ids in table['moves']['crown'].values())
+           == len(small_sample_words))
+    # the indexes are delta-encoded, so every entry after the first is > 0
+    assert(all(all(delta > 0 for delta in ids[1:])
+               for ids in table['moves']['flick'].values()))
+
+
+def test_first_move_remaining(small_sample_words):
+    openings.set_first_moves([
+        openings.build_first_moves(small_sample_words, ['crown', 'three'])])
+    try:
+        for value in (common.GameMode.DEFAULT, common.GameMode.HARD,
+                      common.GameMode.MASTER, common.GameMode.LIAR):
+            mode = common.GameMode(value)
+            for guess in ['crown', 'three']:
+                responses = common.response_counts(guess, small_sample_words,
+                                                   mode, use_cache=False)
+                for response in list(responses) + ['OOOOO', '.....']:
+                    assert(openings.first_move_remaining(
+                               small_sample_words, guess, response, mode)
+                           == common.filter_remaining(
+                               small_sample_words, guess, response, mode,
+                               use_cache=False))
+        # unknown starters and answer lists fall back to live filtering
+        assert(openings.first_move_remaining(small_sample_words, 'flick',
+                                             '.....') is None)
+        assert(openings.first_move_remaining(small_sample_words[::-1],
+                                             'crown', '.....') is None)
+    finally:
+        openings.set_first_moves()
+
+
+def test_first_moves__shipped(default_answers):
+    openings.set_first_moves()
+    table = openings.get_first_moves(default_answers)
+    assert(table is not None)
+    assert(set(BEST_STARTERS) <= set(table['moves']))
+    response = common.get_response('adobe', 'hater', use_cache=False)
+    assert(openings.first_move_remaining(default_answers, 'adobe', response)
+           == common.filter_remaining(default_answers, 'adobe', response,
+                                      use_cache=False))
+
+
+def test_first_moves__session(default_answers, default_guesses):
+    session = SessionInfo(1, default_answers, default_guesses, {}, {
+        word: 0.0 for word in default_guesses}, ['roate'])
+    common.set_profiling()
+    try:
+        openings.set_first_moves([
+            openings.build_first_moves(default_answers, ['roate'])])
+        session = solve_wordle(session, simulated_guess, simulated_response,
+                               False)
+        assert(common.get_profile_data()['first_moves.hits']['calls'] == 1)
+    finally:
+        common.set_profiling(False)
+        openings.set_first_moves()
+
+
+def test_build_book(small_sample_words, tmp_path, monkeypatch):
+    monkeypatch.setattr(data, 'DATA_PATH', str(tmp_path) + '/')
+    answers = small_sample_words[:24]
+    freq = {word: float(index) for index, word in
+            enumerate(small_sample_words)}
+    book = openings.build_book(answers, small_sample_words, freq, ['crown'],
+                               filename='book.jsonl', jobs=1, show=False)
+    assert(book == data.load_book('book.jsonl'))
+    assert(all(len(common.filter_remaining(answers, 'crown', row['response'],
+                                           use_cache=False)) > 1
+               for row in book[1:]))
+    # resuming the build only adds the entries which are missing
+    with open(str(tmp_path) + '/book.jsonl', 'a') as file:
+        file.write('{"starter":"flick","resp')  # an interrupted write
+    book = openings.build_book(answers, small_sample_words, freq,
+                               ['crown', 'flick'], filename='book.jsonl',
+                               jobs=2, show=False)
+    rows = data.load_book('book.jsonl')
+    assert(rows == book)
+    keys = [(row['starter'], row['response']) for row in rows[1:]]
+    assert(len(keys) == len(set(keys)))
+    assert(set(row['starter'] for row in rows[1:]) == set(['crown', 'flick']))
+    with raises(ValueError):
+        openings.build_book(answers, small_sample_words, freq, ['crown'],
+                            common.GameMode(common.GameMode.MASTER),
+                            filename='book.jsonl', jobs=1, show=False)
+
+
+def test_book_guesses(small_sample_words):
+    answers = small_sample_words[:24]
+    freq = {word: float(index) for index, word in
+            enumerate(small_sample_words)}
+    openings.set_books([openings.build_book(
+        answers, small_sample_words, freq, ['crown'], jobs=1, show=False)])
+    common.set_profiling()
+    try:
+        counts = common.response_counts('crown', answers, use_cache=False)
+        response = max(counts, key=lambda x: counts[x])
+        guesses = [word for word in small_sample_words if word != 'crown']
+        best = openings.book_guesses(answers, guesses, 'crown', response)
+        assert(best == sorted(common.best_guesses(
+            common.filter_remaining(answers, 'crown', response,
+                                    use_cache=False), guesses),
+            key=lambda x: freq[x], reverse=True)[:16])
+        # the solver uses the book for its second guess
+        session = SessionInfo(1, answers, small_sample_words, {}, freq,
+                              ['crown'])
+        session.entered.append('crown')
+        session.guesses.remove('crown')
+        _apply_responses(session, [(response, 0)], simulated_response, False)
+        assert(session.best[0] == best)
+        assert(common.get_profile_data()['book.hits']['calls'] == 2)
+        # other strategies, modes, and word lists are not in this book
+        assert(openings.book_guesses(answers, guesses, 'crown', response,
+                                     strategy=common.ENTROPY) is None)
+        assert(openings.book_guesses(answers, guesses, 'crown', response,
+                                     common.GameMode(common.GameMode.HARD))
+               is None)
+        assert(openings.book_guesses(answers, guesses[:-1], 'crown',
+                                     response) is None)
+        assert(openings.book_guesses(answers[:-1], guesses, 'crown',
+                                     response) is None)
+    finally:
+        common.set_profiling(False)
+        openings.set_books()
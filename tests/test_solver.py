@@ -1,8 +1,15 @@
+import asyncio
 from pytest import raises
 from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+import csv
 
 import wordle_autosolver_lite.solver as solver
-from wordle_autosolver_lite.common import GameMode
+from wordle_autosolver_lite.common import GameMode, get_response
+from wordle_autosolver_lite.common import set_profiling, get_profile_data
+from wordle_autosolver_lite.common import get_partition_cache
+from wordle_autosolver_lite.common import set_response_data
 
 
 def test_session_info_to_str(default_session):
@@ -25,6 +32,14 @@ def test_session_info_to_str(default_session):
     ))
 
 
+def test_get_worst_liar_response(sample_words):
+    for answer in sample_words[:20]:
+        honest = solver.get_response('trips', answer)
+        response = solver.get_worst_liar_response('trips', answer,
+                                                  sample_words)
+        assert(sum(int(a != b) for a, b in zip(honest, response)) == 1)
+
+
 ###############################################################################
 #                      TEST SIMULATED GUESS AND RESPONSE                      #
 ###############################################################################
@@ -81,6 +96,20 @@ def test_manual_guess__hard(monkeypatch, default_session):
     assert(solver.manual_guess(default_session) == "break")
 
 
+def test_manual_guess__hard_illegal(monkeypatch, medium_session):
+    session = medium_session.copy(num_boards=2, mode=GameMode(GameMode.HARD))
+    session.entered.append('roate')
+    responses = [(get_response('roate', answer), board)
+                 for board, answer in enumerate(['short', 'water'])]
+    solver._apply_responses(session, responses, solver.simulated_response,
+                            False)
+    # 'which' is a valid guess, but it is not left on either board
+    assert('which' in session.guesses)
+    assert(all('which' not in answers for answers in session.remaining))
+    monkeypatch.setattr('sys.stdin', StringIO('which\nwater\n'))
+    assert(solver.manual_guess(session) == 'water')
+
+
 def test_manual_response__easy(monkeypatch, default_session):
     input_string = StringIO('+oo+.\n')
     monkeypatch.setattr('sys.stdin', input_string)
@@ -144,6 +173,189 @@ def test_solve_wordle__hard(medium_session):
     assert(result.entered == ['roate', 'front', 'short'])
 
 
+def test_solve_wordle__strategies(medium_session):
+    for strategy in ('entropy', 'hybrid'):
+        solver.simulated_answers = ['short', 'water']
+        result = solver.solve_wordle(
+            medium_session.copy(num_boards=2, strategy=strategy),
+            solver.simulated_guess,
+            solver.simulated_response
+        )
+        assert(result.strategy == strategy)
+        assert(result.solved == ['short', 'water'])
+    with raises(ValueError):
+        medium_session.copy(strategy='random')
+
+
+def test_solve_wordle__time_limit(medium_session):
+    solver.simulated_answers = ['short']
+    session = medium_session.copy(saved_best={}, time_limit=0)
+    assert(session.time_limit == 0)
+    assert(session.copy().time_limit == 0)
+    result = solver.solve_wordle(session, solver.simulated_guess,
+                                 solver.simulated_response)
+    assert(result.solved == ['short'])
+
+
+def test_solve_wordle_async__matches_sync(medium_session):
+    games = [['short', 'water'], ['found', 'place'], ['never', 'women']]
+
+    def make_response(answers):
+        """Helper function which responds to the guesses in one game."""
+        def respond(session):
+            return [(get_response(session.entered[-1], answers[board],
+                                  session.mode), board)
+                    for board in session.expected]
+        return respond
+
+    def make_async_response(answers):
+        """Helper function which responds after yielding to the loop."""
+        respond = make_response(answers)
+
+        async def async_respond(session):
+            await asyncio.sleep(0)
+            return respond(session)
+        return async_respond
+
+    async def async_guess(session):
+        await asyncio.sleep(0)
+        return session.actual_best
+
+    async def play_all(executor=None):
+        """Helper function which plays every game at the same time."""
+        return await asyncio.gather(*[
+            solver.solve_wordle_async(
+                medium_session.copy(num_boards=2, starters=['roate']),
+                async_guess, make_async_response(answers),
+                executor=executor)
+            for answers in games
+        ])
+
+    expected = [
+        solver.solve_wordle(
+            medium_session.copy(num_boards=2, starters=['roate']),
+            solver.simulated_guess, make_response(answers))
+        for answers in games
+    ]
+    results = asyncio.run(play_all())
+    for answers, result, sync in zip(games, results, expected):
+        assert(result.solved == answers)
+        assert(result.entered == sync.entered)
+        assert(result.remaining == sync.remaining)
+        assert(result.best == sync.best)
+    # games whose turns run on separate threads do not share partitions
+    with ThreadPoolExecutor(len(games)) as executor:
+        results = asyncio.run(play_all(executor))
+    for result, sync in zip(results, expected):
+        assert(result.entered == sync.entered)
+        assert(result.best == sync.best)
+    # plain functions work the same way
+    solver.simulated_answers = ['short', 'water']
+    result = asyncio.run(solver.solve_wordle_async(
+        medium_session.copy(num_boards=2), solver.simulated_guess,
+        solver.simulated_response))
+    assert(result.solved == ['short', 'water'])
+
+
+def test_solve_wordle__saved_best(medium_session):
+    tree = {}
+    session = medium_session.copy(saved_best=tree, starters=['roate'])
+    solver.simulated_answers = ['short']
+    first = solver.solve_wordle(session.copy(), solver.simulated_guess,
+                                solver.simulated_response)
+    node = tree['roate'][get_response('roate', 'short')]
+    entry = node[solver.SAVED_BEST]
+    assert(first.entered[1] in entry['guesses'])
+    assert(entry['strategy'] == 'minimax')
+    assert(entry['score'] >= 1)
+    assert(all(guess in node for guess in entry['guesses']))
+    # a second visit to the same node reuses the saved guesses
+    set_profiling()
+    try:
+        solver.simulated_answers = ['short']
+        second = solver.solve_wordle(session.copy(), solver.simulated_guess,
+                                     solver.simulated_response)
+        assert(get_profile_data()['saved_best.hits']['calls'] >= 1)
+        assert('best_guesses' not in get_profile_data())
+    finally:
+        set_profiling(False)
+    assert(second.entered == first.entered)
+    # the saved guesses are ignored by any other strategy
+    solver.simulated_answers = ['short']
+    solver.solve_wordle(session.copy(strategy='entropy'),
+                        solver.simulated_guess, solver.simulated_response)
+    assert(node[solver.SAVED_BEST]['strategy'] == 'entropy')
+    # the saved guesses are ignored once the remaining answers are different
+    response = get_response('roate', 'short')
+    answers = [answer for answer in session.answers
+               if answer == 'short' or get_response('roate', answer)
+               != response or answer[0] != 's']
+    assert(len(answers) < len(session.answers))
+    stale = node[solver.SAVED_BEST]
+    set_profiling()
+    try:
+        solver.simulated_answers = ['short']
+        solver.solve_wordle(session.copy(answers=answers, strategy='entropy'),
+                            solver.simulated_guess, solver.simulated_response)
+        assert('saved_best.hits' not in get_profile_data())
+    finally:
+        set_profiling(False)
+    assert(node[solver.SAVED_BEST]['remaining'] != stale['remaining'])
+
+
+def test_solve_wordle__hard_legal_guesses(medium_session):
+    session = medium_session.copy(mode=GameMode(GameMode.HARD))
+    session.entered.append('roate')
+    _, answers = solver._parse_response('.+.O.', 0, solver.simulated_response,
+                                        session, False)
+    assert(len(session.legal[0]) < len(session.guesses))
+    assert(all(session.constraints[0].allows(x) for x in session.legal[0]))
+    assert((set(answers) & set(session.guesses)) <= set(session.legal[0]))
+    # constraints are replaced rather than modified, so forks can share them
+    assert(session.constraints[0].greens[3] == 't')
+    assert(medium_session.constraints[0].greens[3] is None)
+    assert(session.fork().constraints[0] is session.constraints[0])
+
+
+def test_apply_responses__shared_boards(micro_session):
+    session = micro_session.copy(num_boards=3)
+    assert(session.remaining[0] is session.remaining[2])
+    session.entered.append('roate')
+    responses = [(get_response('roate', answer), board)
+                 for board, answer in enumerate(['leant', 'least', 'black'])]
+    set_profiling()
+    try:
+        solver._apply_responses(session, responses, solver.simulated_response,
+                                False)
+        calls = get_profile_data()['best_guesses']['calls']
+    finally:
+        set_profiling(False)
+    assert(session.remaining[0] is session.remaining[1])
+    assert(session.remaining[0] is not session.remaining[2])
+    assert(session.best[0] == session.best[1])
+    assert(calls == 1)
+
+
+def test_apply_responses__partition_cache(medium_session):
+    session = medium_session.copy(num_boards=2, saved_best={},
+                                  starters=['roate'])
+    session.entered.append('roate')
+    responses = [(get_response('roate', answer), board)
+                 for board, answer in enumerate(['short', 'water'])]
+    set_profiling()
+    try:
+        solver._apply_responses(session, responses, solver.simulated_response,
+                                False)
+        hits = get_profile_data()['partition_cache.hits']['calls']
+    finally:
+        set_profiling(False)
+    # every option is scored on both boards, and was already partitioned on
+    # the board which ranked it
+    assert(len(set().union(*session.best)) > 2)
+    assert(hits >= sum(len(best) for best in session.best))
+    assert(get_partition_cache() is None)
+
+
 def test_solve_wordle__simulate_multi(medium_session):
     solver.simulated_answers = ["water", "light", "white", "class"]
     result = solver.solve_wordle(
@@ -210,6 +422,33 @@ def test_simulate__less_than_max__multi(mini_session):
     assert(worst >= 3)
 
 
+def test_simulate__records(mini_session):
+    stream = StringIO()
+    avg, worst = solver.simulate(mini_session.copy(num_boards=2), 32,
+                                 show=False, records=stream)
+    rows = list(csv.reader(StringIO(stream.getvalue())))
+    assert(tuple(rows[0]) == solver.RECORD_FIELDS)
+    assert(len(rows) == 33)
+    assert([int(row[0]) for row in rows[1:]] == list(range(32)))
+    assert(len(set(row[1] for row in rows[1:])) == 32)
+    for row in rows[1:]:
+        answers, guesses = row[1].split(' '), row[2].split(' ')
+        assert(len(answers) == 2)
+        assert(all(answer in guesses for answer in answers))
+        assert(float(row[4]) >= 0)
+    scores = [int(row[3]) for row in rows[1:]]
+    assert(min(scores) == worst)
+    assert(sum(scores) / len(scores) == avg)
+
+
+def test_sample_games():
+    words = ['heart', 'white', 'least', 'value', 'model', 'black', 'water']
+    games = list(solver._sample_games(words, 3, 35))
+    assert(sorted(games) == sorted(combinations(words, 3)))
+    games = list(solver._sample_games(words, 2, 10))
+    assert(len(games) == len(set(games)) == 10)
+
+
 def test_simulate__failure(medium_session):
     _, worst = solver.simulate(medium_session.copy(starters=[
         'these', 'seven', 'words', 'prove', 'fails', 'still', 'occur'
@@ -224,3 +463,92 @@ def test_simulate__return_early(medium_session):
     ]), best=BEST, return_if_worse=True)
     assert(avg < BEST)
     assert(worst < BEST)
+
+
+###############################################################################
+#                               TEST SOLVE BATCH                              #
+###############################################################################
+
+
+def test_session_info_fork(tiny_session):
+    session = tiny_session.copy(num_boards=2)
+    session.entered.append('roate')
+    other = session.fork()
+    other.entered.append('value')
+    other.remaining[0] = ['value']
+    other.solved[0] = 'value'
+    assert(session.entered == ['roate'])
+    assert(len(session.remaining[0]) == len(tiny_session.answers))
+    assert(session.solved == ['*****', '*****'])
+    assert(other.saved_best is session.saved_best)
+
+
+def test_session_info_compact(tiny_session):
+    session = tiny_session.copy(num_boards=500)
+    assert(not hasattr(session, '__dict__'))
+    assert(all(r is session.remaining[0] for r in session.remaining))
+    assert(all(c is session.constraints[0] for c in session.constraints))
+    assert(all(g is session.legal[0] for g in session.legal))
+
+
+def test_session_info_word_containers(tiny_session):
+    session = tiny_session.copy()
+    session.entered = ['roate']
+    assert('roate' in session.entered)
+    session.entered.append('value')
+    assert(session.entered == ['roate', 'value'])
+    session.guesses.remove('value')
+    assert('value' not in session.guesses)
+    assert('value' in tiny_session.guesses)
+    other = session.fork()
+    other.guesses.remove('roate')
+    other.solved[0] = 'value'
+    assert('roate' in session.guesses)
+    assert('value' not in session.solved)
+
+
+def test_solve_batch__matches_single(mini_session):
+    jobs = [(None, [answer]) for answer in mini_session.answers]
+    jobs += [(None, ['white', 'water']), (None, ['earth', 'heart']),
+             (None, ['white', 'water'])]
+    results = solver.solve_batch(mini_session, jobs)
+    assert(len(results) == len(jobs))
+    for (_, answers), result in zip(jobs, results):
+        solver.simulated_answers = answers
+        expected = solver.solve_wordle(
+            mini_session.copy(num_boards=len(answers)),
+            solver.simulated_guess,
+            solver.simulated_response
+        )
+        assert(result.solved == answers)
+        assert(result.entered == expected.entered)
+        assert(result.unentered_answers == expected.unentered_answers)
+    assert(results[-1] is not results[-3])
+
+
+def test_solve_batch__modes(micro_session):
+    jobs = [(GameMode(GameMode.MASTER), ['heart']),
+            (GameMode(GameMode.HARD), ['heart']),
+            (GameMode(GameMode.MASTER), ['black'])]
+    results = solver.solve_batch(micro_session, jobs)
+    assert([r.mode for r in results] == [GameMode.MASTER, GameMode.HARD,
+                                        GameMode.MASTER])
+    assert([r.solved for r in results] == [['heart'], ['heart'], ['black']])
+
+
+def test_solve_batch__mixed_modes(medium_session):
+    session = medium_session.copy(saved_best={}, starters=['roate'])
+    jobs = [(GameMode(value), [answer])
+            for answer in list(session.answers)[:12]
+            for value in (GameMode.DEFAULT, GameMode.MASTER)]
+    # each mode has to work from its own responses, even on a fresh cache
+    set_response_data({})
+    set_response_data({}, master=True)
+    results = solver.solve_batch(session, jobs)
+    for (mode, answers), result in zip(jobs, results):
+        solver.simulated_answers = answers
+        expected = solver.solve_wordle(
+            session.copy(mode=mode, saved_best={}), solver.simulated_guess,
+            solver.simulated_response)
+        assert(result.solved == answers)
+        assert(result.entered == expected.entered)
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from wordle_autosolver_lite.store import ResultStore, fingerprint
+
+
+def test_fingerprint():
+    assert(fingerprint(['crown', 'flick']) == fingerprint(['flick', 'crown']))
+    assert(fingerprint(['crown', 'flick']) != fingerprint(['crown']))
+
+
+def test_result_store(tmp_path):
+    filename = str(tmp_path / 'results.sqlite')
+    store = ResultStore(filename)
+    assert(len(store) == 0)
+    assert(store.get(0, 'minimax', ['crown', 'croon'], ['crown']) is None)
+    store.put(0, 'minimax', ['crown', 'croon'], ['crown', 'croon'],
+              ['croon'], 1)
+    # the order of the words does not matter
+    assert(store.get(0, 'minimax', ['croon', 'crown'], ['croon', 'crown'])
+           == (['croon'], 1.0))
+    assert(store.get(1, 'minimax', ['crown', 'croon'], ['crown', 'croon'])
+           is None)
+    assert(store.get(0, 'entropy', ['crown', 'croon'], ['crown', 'croon'])
+           is None)
+    store.put(0, 'minimax', ['crown', 'croon'], ['crown', 'croon'],
+              ['crown'], 1)
+    assert(len(store) == 1)
+    store.close()
+    # results are kept after the store is closed
+    store = ResultStore(filename)
+    assert(store.get(0, 'minimax', ['crown', 'croon'], ['crown', 'croon'])
+           == (['crown'], 1.0))
+    store.close()
+
+
+def test_result_store__pool_changes():
+    store = ResultStore()
+    pool = ['crown', 'croon', 'flick']
+    store.put(0, 'minimax', ['crown', 'croon'], pool, ['crown'], 1)
+    pool.remove('flick')
+    assert(store.get(0, 'minimax', ['crown', 'croon'], pool) is None)
+    pool.append('flick')
+    assert(store.get(0, 'minimax', ['crown', 'croon'], pool)
+           == (['crown'], 1.0))
+    # a pool changed in place without changing its size is a new pool
+    pool[pool.index('flick')] = 'fling'
+    assert(store.get(0, 'minimax', ['crown', 'croon'], pool) is None)
+    pool = ('crown', 'croon', 'flick')
+    assert(store.get(0, 'minimax', ['crown', 'croon'], pool)
+           == (['crown'], 1.0))
+    assert(store.get(0, 'minimax', ['crown', 'croon'], pool)
+           == (['crown'], 1.0))
+
+
+def test_result_store__threads(tmp_path):
+    store = ResultStore(str(tmp_path / 'results.sqlite'))
+
+    def work(thread):
+        for index in range(200):
+            remaining = ['t{}'.format(thread), 'r{}'.format(index)]
+            store.put(0, 'minimax', remaining, ['crown'], ['crown'], index)
+            assert(store.get(0, 'minimax', remaining, ['crown'])
+                   == (['crown'], index))
+            if index % 50 == 0:
+                store.commit()
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(work, range(8)))
+    assert(len(store) == 8 * 200)
+    store.close()
@@ -0,0 +1,78 @@
+from wordle_autosolver_lite.common import SAVED_BEST, rec_build_best_tree
+from wordle_autosolver_lite.tree import DecisionTree, ROOT
+
+
+def test_response_codes():
+    tree = DecisionTree()
+    tree.add_guess(ROOT, 'crown')
+    for response in ('.....', 'OOOOO', '+.O.+', 'O++..'):
+        assert(tree.decode(tree.encode(response)) == response)
+    assert(tree.encode('.....') == 0)
+    assert(tree.encode('OOOOO') == 3 ** 5 - 1)
+
+
+def test_decision_tree__dict(small_sample_words):
+    answers = ['track', 'draft', 'actor', 'craft', 'altar', 'tract', 'graft',
+               'trawl', 'argot']
+    saved = rec_build_best_tree(answers, small_sample_words, 'diact', depth=2,
+                                show=False)
+    saved['diact']['+...+'] = {SAVED_BEST: {'guesses': ['actor'], 'score': 1,
+                                            'remaining': '', 'strategy':
+                                            'minimax'}, 'actor': {}}
+    tree = DecisionTree.from_dict(saved)
+    assert(tree.to_dict() == saved)
+    assert(list(tree.to_dict()['diact']) == list(saved['diact']))
+    # the saved best guesses keep their place among the guesses of a node
+    entry = {'guesses': ['croon'], 'score': 1, 'remaining': '',
+             'strategy': 'minimax'}
+    for keys in ([SAVED_BEST, 'croon', 'crown'],
+                 ['croon', SAVED_BEST, 'crown'],
+                 ['croon', 'crown', SAVED_BEST]):
+        saved = dict((key, entry if key == SAVED_BEST else {})
+                     for key in keys)
+        assert(list(DecisionTree.from_dict(saved).to_dict()) == keys)
+    tree = DecisionTree.from_dict({'crown': {}})
+    tree.best[ROOT] = entry
+    assert(list(tree.to_dict()) == ['crown', SAVED_BEST])
+    assert(DecisionTree.from_dict({}).to_dict() == {})
+    assert(len(DecisionTree.from_dict({'crown': {}})) == 2)
+
+
+def test_decision_tree__find():
+    saved = {'crown': {'.....': {'flick': {}, 'penny': {}},
+                       'OOO..': {SAVED_BEST: {'guesses': ['croon']},
+                                 'croon': {'OOOOO': {}}}}}
+    tree = DecisionTree.from_dict(saved)
+    assert(tree.find([]) == ROOT)
+    assert(tree.next_guesses([]) == ['crown'])
+    assert(tree.next_guesses([('crown', '.....')]) == ['flick', 'penny'])
+    # the saved best guesses are used over the children of the node
+    assert(tree.next_guesses([('crown', 'OOO..')]) == ['croon'])
+    assert(tree.next_guesses([('crown', 'OOO..'), ('croon', 'OOOOO')]) == [])
+    assert(tree.find([('crown', '+....')]) is None)
+    assert(tree.next_guesses([('flick', '.....')]) is None)
+    node = tree.find([('crown', '.....')])
+    assert(not tree.is_guess(node))
+    # adding nodes which already exist does not change the tree
+    size = len(tree)
+    guess = tree.add_guess(node, 'penny')
+    assert(tree.is_guess(guess))
+    assert(tree.add_response(guess, '.O...') == len(tree) - 1)
+    assert(len(tree) == size + 1)
+    assert(tree.add_response(guess, '.O...') == len(tree) - 1)
+    assert(tree.find([('crown', '.....'), ('penny', '.O...')])
+           == len(tree) - 1)
+
+
+def test_decision_tree__index_growth():
+    saved = {}
+    tree = DecisionTree()
+    guess = tree.add_guess(ROOT, 'crown')
+    saved['crown'] = {}
+    for code in range(3 ** 5):
+        response = tree.decode(code)
+        saved['crown'][response] = {}
+        tree.add_response(guess, response)
+    for response in saved['crown']:
+        assert(tree.next_guesses([('crown', response)]) == [])
+    assert(tree.to_dict() == saved)
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional, Sequence, Union
+
+try:  # pragma: no cover
+    from common import GameMode
+    from common import filter_remaining, best_guesses, worst_case_remaining
+    from solver import BEST_STARTERS
+    from data import load_all_data
+    from openings import first_move_remaining
+except ModuleNotFoundError:  # this is only here to help pytest find the module
+    from wordle_autosolver_lite.common import GameMode
+    from wordle_autosolver_lite.common import filter_remaining, best_guesses
+    from wordle_autosolver_lite.common import worst_case_remaining
+    from wordle_autosolver_lite.solver import BEST_STARTERS
+    from wordle_autosolver_lite.data import load_all_data
+    from wordle_autosolver_lite.openings import first_move_remaining
+
+
+MEMO_SIZE: int = 4096
+
+Turn = tuple[str, Sequence[Optional[str]]]
+History = tuple[tuple[str, tuple[Optional[str], ...]], ...]
+
+
+def next_guesses(mode: Union[GameMode, int], num_boards: int,
+                 history: Sequence[Turn], *, nyt: bool = False,
+                 limit: Optional[int] = 16) -> list[str]:
+    """Finds the best next guesses for a game with the given history.
+
+    This function does not modify any state and gives the same answer every
+    time it is called with the same arguments. Results are kept in an LRU memo
+    keyed on the normalized history, and the remaining answers are memoized
+    for every prefix of that history, so games which share their first few
+    turns only pay for those turns once.
+
+    Args:
+        mode:
+            A GameMode class instance (or its integer value) representing the
+            game mode being played; the PLAY and ENDLESS flags are ignored
+        num_boards:
+            The number of simultaneous games being played
+        history:
+            A sequence of 2-tuples where the first element is an entered guess
+            and the second element is a sequence holding the response on each
+            board; use `None` or an empty string for any board which did not
+            give a response (because it was already solved)
+
+    Keyword Args:
+        nyt:
+            A boolean value representing whether to use the New York Times word
+            list or the extended word list which works on all sites (default:
+            False)
+        limit:
+            The maximum number of guesses to return; if `None`, every ranked
+            guess will be returned (default: 16)
+
+    Returns:
+        A list of guesses ordered from best to worst. If any answers are known
+        but have not been entered yet, only those answers are ranked. Guesses
+        are ranked by the sum of their worst-case remaining answers across all
+        unsolved boards, then by how commonly the word is used.
+
+    Raises:
+        ValueError: if the history is malformed or no answer is consistent
+            with it on some board.
+    """
+    if isinstance(mode, GameMode):
+        mode = mode.value
+    ranked = _ranked_guesses(mode & GameMode.MODE_MASK, bool(nyt), num_boards,
+                             _normalize_history(num_boards, history))
+    return list(ranked if limit is None else ranked[:limit])
+
+
+def remaining_answers(mode: Union[GameMode, int], num_boards: int,
+                      history: Sequence[Turn], *, nyt: bool = False
+                      ) -> list[list[str]]:
+    """Finds the possible answers on every board for the given history.
+
+    Args:
+        mode:
+            A GameMode class instance (or its integer value) representing the
+            game mode being played; the PLAY and ENDLESS flags are ignored
+        num_boards:
+            The number of simultaneous games being played
+        history:
+            A sequence of 2-tuples in the same format used by `next_guesses`
+
+    Keyword Args:
+        nyt:
+            A boolean value representing whether to use the New York Times word
+            list (default: False)
+
+    Returns:
+        A list holding the list of remaining possible answers for each board.
+
+    Raises:
+        ValueError: if the history is malformed or no answer is consistent
+            with it on some board.
+    """
+    if isinstance(mode, GameMode):
+        mode = mode.value
+    remaining = _remaining_after(mode & GameMode.MODE_MASK, bool(nyt),
+                                 num_boards,
+                                 _normalize_history(num_boards, history))
+    return [list(board) for board in remaining]
+
+
+def clear_memo() -> None:
+    """Empties every memo used by the stateless API."""
+    _ranked_guesses.cache_clear()
+    _remaining_after.cache_clear()
+
+
+def memo_info() -> dict[str, tuple[int, int, int, int]]:
+    """Gets the hit and miss statistics of the memos used by this module.
+
+    Returns:
+        A dict mapping the name of each memo to its `(hits, misses, maxsize,
+        currsize)` tuple as reported by `functools.lru_cache`.
+    """
+    return {
+        'ranked_guesses': tuple(_ranked_guesses.cache_info()),
+        'remaining_after': tuple(_remaining_after.cache_info())
+    }
+
+
+def _normalize_history(num_boards: int, history: Sequence[Turn]) -> History:
+    """Helper function which converts a history into a hashable memo key."""
+    if num_boards < 1:
+        raise ValueError('num_boards must be at least 1')
+    normalized = []
+    for guess, responses in history:
+        if isinstance(responses, str):
+            responses = [responses]
+        if len(responses) != num_boards:
+            raise ValueError('expected {} response(s) for {}, got {}'.format(
+                num_boards, guess.upper(), len(responses)))
+        normalized.append((
+            guess.strip().lower(),
+            tuple(None if not resp else resp.strip().upper()
+                  for resp in responses)
+        ))
+    return tuple(normalized)
+
+
+@lru_cache(maxsize=4)
+def _word_data(mode: int, nyt: bool
+               ) -> tuple[list[str], list[str], dict[str, float]]:
+    """Helper function which loads the word lists for a game mode once."""
+    game_mode = GameMode(mode)
+    answers, guesses, _, freq, _, _ = load_all_data(
+        game_mode.hard, game_mode.master, game_mode.liar, nyt, False)
+    return answers, guesses, freq
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def _remaining_after(mode: int, nyt: bool, num_boards: int, history: History
+                     ) -> tuple[tuple[str, ...], ...]:
+    """Helper function which finds the remaining answers after each prefix."""
+    if len(history) == 0:
+        answers = tuple(_word_data(mode, nyt)[0])
+        return tuple(answers for _ in range(num_boards))
+    previous = _remaining_after(mode, nyt, num_boards, history[:-1])
+    guess, responses = history[-1]
+    remaining = []
+    for board, (answers, response) in enumerate(zip(previous, responses)):
+        if response is None or len(answers) == 1:
+            remaining.append(answers)
+            continue
+        filtered = None
+        if len(history) == 1:  # the first move may be precomputed
+            filtered = first_move_remaining(list(answers), guess, response,
+                                            GameMode(mode))
+        if filtered is None:
+            filtered = filter_remaining(list(answers), guess, response,
+                                        GameMode(mode))
+        filtered = tuple(filtered)
+        if len(filtered) == 0:
+            raise ValueError('response {} to {} on board {} does not match '
+                             'any possible answer'.format(
+                                 response, guess.upper(), board + 1))
+        remaining.append(filtered)
+    return tuple(remaining)
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def _ranked_guesses(mode: int, nyt: bool, num_boards: int, history: History
+                    ) -> tuple[str, ...]:
+    """Helper function for `next_guesses`."""
+    _, guesses, freq = _word_data(mode, nyt)
+    if len(history) == 0:
+        return tuple(sorted(BEST_STARTERS, key=lambda x: freq.get(x, 0.0),
+                            reverse=True))
+    game_mode = GameMode(mode)
+    remaining = _remaining_after(mode, nyt, num_boards, history)
+    entered = set(guess for guess, _ in history)
+    unsolved = [list(board) for board in remaining if len(board) > 1]
+    # recommend guessing any answers which have been found but not entered
+    options = set(board[0] for board in remaining
+                  if len(board) == 1 and board[0] not in entered)
+    if len(options) == 0:
+        for answers in unsolved:
+            options.update(best_guesses(answers, guesses, game_mode))
+        options -= entered
+
+    def rank(guess: str) -> tuple[int, float]:
+        """Helper function which gives the sort key of a single guess."""
+        score = sum(worst_case_remaining(guess, answers, game_mode)
+                    for answers in unsolved)
+        return score, -freq.get(guess, 0.0)
+
+    return tuple(sorted(sorted(options), key=rank))
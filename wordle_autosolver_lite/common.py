@@ -1,10 +1,23 @@
 from __future__ import annotations
 
 import os
-from typing import Union, Optional
+import threading
+from collections.abc import Sequence
+from json import dump
+from math import log2
+from time import perf_counter
+from typing import Iterable, Union, Optional
 from random import choice
 
-from tqdm import tqdm
+try:  # pragma: no cover
+    from kernels import NumpyKernel, numpy_kernel, NUMPY_AVAILABLE
+    from store import ResultStore
+    from events import progress
+except ModuleNotFoundError:  # this is only here to help pytest find the module
+    from wordle_autosolver_lite.kernels import NumpyKernel, numpy_kernel
+    from wordle_autosolver_lite.kernels import NUMPY_AVAILABLE
+    from wordle_autosolver_lite.store import ResultStore
+    from wordle_autosolver_lite.events import progress
 
 
 RIGHT: str = 'O'
@@ -18,9 +31,27 @@ SYM_ALTS: dict[str, list[str]] = {
     WRONG: [RIGHT, CLOSE]
 }
 
+MINIMAX: str = 'minimax'
+ENTROPY: str = 'entropy'
+HYBRID: str = 'hybrid'
+STRATEGIES: tuple[str, ...] = (MINIMAX, ENTROPY, HYBRID)
+PREFILTER_SIZE: int = 100
+RANKED: str = 'ranked'  # stored results from `top_guesses`
+SAVED_BEST: str = '_best'  # holds the best guesses at a decision tree node
+PYTHON: str = 'python'
+NUMPY: str = 'numpy'
+AUTO: str = 'auto'
+BACKENDS: tuple[str, ...] = (AUTO, PYTHON, NUMPY)
+
 _response_data: dict = {}
+_master_response_data: dict = {}  # master responses only show letter counts
 _response_data_updated: bool = False
 _best_guess_updated: bool = False
+_profile_data: Optional[dict[str, list[float]]] = None
+_kernel: Optional[NumpyKernel] = numpy_kernel(WRONG + CLOSE + RIGHT)
+_result_store: Optional[ResultStore] = None
+# holds the partition cache of each thread, see `set_partition_cache`
+_partition_local: threading.local = threading.local()
 
 if IS_MS_OS:
     os.system('color')
@@ -146,6 +177,264 @@ class GameMode():
                 self.value |= self.ENDLESS_MASK
 
 
+class Constraints():
+    """A class holding the letter constraints learned on a single board
+
+    The constraints are built from the responses of a normal game of Wordle,
+    which is also what hard mode uses. They can be updated once per turn and
+    checked against any word without calculating a single response.
+    """
+    __slots__ = ('greens', 'excluded', 'min_count', 'max_count')
+
+    def __init__(self, length: int = 5) -> None:
+        self.greens: list[Optional[str]] = [None for _ in range(length)]
+        self.excluded: list[set[str]] = [set() for _ in range(length)]
+        self.min_count: dict[str, int] = {}
+        self.max_count: dict[str, int] = {}
+
+    def copy(self) -> Constraints:
+        """Creates an independent copy of these constraints."""
+        other = Constraints(len(self.greens))
+        other.greens = self.greens[:]
+        other.excluded = [set(letters) for letters in self.excluded]
+        other.min_count = dict(self.min_count)
+        other.max_count = dict(self.max_count)
+        return other
+
+    def update(self, guess: str, response: str) -> None:
+        """Adds the information given by one guess and its response.
+
+        Args:
+            guess:
+                The word which was guessed by the player
+            response:
+                The response from the game after `guess` was entered
+        """
+        found = {}
+        missing = set()
+        for index, (letter, sym) in enumerate(zip(guess, response)):
+            if sym == RIGHT:
+                self.greens[index] = letter
+            else:
+                self.excluded[index].add(letter)
+            if sym == WRONG:
+                missing.add(letter)
+            else:
+                found[letter] = found.get(letter, 0) + 1
+        for letter, count in found.items():
+            self.min_count[letter] = max(self.min_count.get(letter, 0), count)
+        for letter in missing:
+            count = found.get(letter, 0)
+            self.max_count[letter] = min(self.max_count.get(letter, count),
+                                         count)
+
+    def allows(self, word: str) -> bool:
+        """Checks whether a word is consistent with these constraints.
+
+        Args:
+            word:
+                The word to be checked
+
+        Returns:
+            A boolean value representing whether `word` could still be the
+            answer (and is therefore a legal guess in hard mode).
+        """
+        for index, letter in enumerate(word):
+            green = self.greens[index]
+            if ((green is not None and letter != green)
+                    or letter in self.excluded[index]):
+                return False
+        for letter, count in self.min_count.items():
+            if word.count(letter) < count:
+                return False
+        for letter, count in self.max_count.items():
+            if word.count(letter) > count:
+                return False
+        return True
+
+    def filter(self, words: list[str]) -> list[str]:
+        """Creates a new list holding the words allowed by these constraints."""
+        return [word for word in words if self.allows(word)]
+
+
+class WordSet(Sequence):
+    """A class holding an ordered set of words which can be used like a list
+
+    Checking whether a word is in the set and removing a word both take
+    constant time, unlike with a list. Iteration keeps the original order.
+    The words are also kept in a list, built the first time the set is
+    indexed after it changes, so indexing takes constant time as well.
+    """
+    __slots__ = ('_words', '_list')
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        self._words: dict[str, None] = dict.fromkeys(words)
+        self._list: Optional[list[str]] = None
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def __iter__(self):
+        return iter(self._words)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, list[str]]:
+        if self._list is None:
+            self._list = list(self._words)
+        return self._list[index]
+
+    def __eq__(self, other: Iterable[str]) -> bool:
+        return list(self._words) == list(other)
+
+    def __repr__(self) -> str:
+        return 'WordSet({})'.format(list(self._words))
+
+    def append(self, word: str) -> None:
+        """Adds a word to the end of the set if it is not already in it."""
+        if word not in self._words:
+            self._words[word] = None
+            self._list = None
+
+    def remove(self, word: str) -> None:
+        """Removes a word, raising a ValueError if it is not in the set."""
+        if word not in self._words:
+            raise ValueError('{} is not in the set'.format(word))
+        del self._words[word]
+        self._list = None
+
+    def copy(self) -> WordSet:
+        """Creates an independent copy of this set."""
+        return WordSet(self._words)
+
+
+class WordList(list):
+    """A list of words which also counts how many times each word appears
+
+    Checking whether a word is in the list takes constant time. The counts are
+    kept up to date by every method that can change the contents of the list.
+    """
+    __slots__ = ('_count',)
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        super().__init__(words)
+        self._count: dict[str, int] = {}
+        self._recount()
+
+    def _recount(self) -> None:
+        self._count.clear()
+        for word in self:
+            self._add(word)
+
+    def _add(self, word: str) -> None:
+        self._count[word] = self._count.get(word, 0) + 1
+
+    def _discard(self, word: str) -> None:
+        self._count[word] -= 1
+        if self._count[word] == 0:
+            del self._count[word]
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._count
+
+    def __setitem__(self, index: Union[int, slice], value) -> None:
+        if isinstance(index, slice):
+            super().__setitem__(index, value)
+            self._recount()
+            return
+        self._discard(self[index])
+        super().__setitem__(index, value)
+        self._add(value)
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        super().__delitem__(index)
+        self._recount()
+
+    def __iadd__(self, words: Iterable[str]) -> WordList:
+        self.extend(words)
+        return self
+
+    def append(self, word: str) -> None:
+        super().append(word)
+        self._add(word)
+
+    def extend(self, words: Iterable[str]) -> None:
+        words = list(words)
+        super().extend(words)
+        for word in words:
+            self._add(word)
+
+    def insert(self, index: int, word: str) -> None:
+        super().insert(index, word)
+        self._add(word)
+
+    def remove(self, word: str) -> None:
+        super().remove(word)
+        self._discard(word)
+
+    def pop(self, index: int = -1) -> str:
+        word = super().pop(index)
+        self._discard(word)
+        return word
+
+    def clear(self) -> None:
+        super().clear()
+        self._count.clear()
+
+    def index(self, word: str, *args) -> int:
+        if word not in self._count:
+            raise ValueError('{} is not in list'.format(word))
+        return super().index(word, *args)
+
+
+class WordIndex():
+    """A class indexing a word list by letter positions and letter counts
+
+    Once built, the words allowed by a Constraints instance can be found with
+    a few set intersections instead of checking every word in the list.
+    """
+    def __init__(self, words: list[str]) -> None:
+        self.words: set[str] = set(words)
+        self.at: dict[tuple[int, str], set[str]] = {}
+        self.at_least: dict[tuple[str, int], set[str]] = {}
+        for word in self.words:
+            letter_count = {}
+            for index, letter in enumerate(word):
+                self.at.setdefault((index, letter), set()).add(word)
+                letter_count[letter] = letter_count.get(letter, 0) + 1
+                self.at_least.setdefault(
+                    (letter, letter_count[letter]), set()).add(word)
+
+    def matching(self, constraints: Constraints) -> set[str]:
+        """Finds every indexed word allowed by the given constraints.
+
+        Args:
+            constraints:
+                The Constraints instance to be checked
+
+        Returns:
+            A set holding every indexed word for which `constraints.allows`
+            would return `True`.
+        """
+        empty = set()
+        groups = [self.at.get((index, letter), empty)
+                  for index, letter in enumerate(constraints.greens)
+                  if letter is not None]
+        groups += [self.at_least.get((letter, count), empty)
+                   for letter, count in constraints.min_count.items()
+                   if count > 0]
+        matched = set(self.words)
+        for group in sorted(groups, key=len):
+            matched &= group
+        for index, letters in enumerate(constraints.excluded):
+            for letter in letters:
+                matched -= self.at.get((index, letter), empty)
+        for letter, count in constraints.max_count.items():
+            matched -= self.at_least.get((letter, count + 1), empty)
+        return matched
+
+
 def set_best_guess_updated(value: bool = True) -> None:
     """Sets the value of `best_guess_updated`.
 
@@ -188,27 +477,308 @@ def get_response_data_updated() -> bool:
     return _response_data_updated
 
 
-def set_response_data(value: dict[str, dict[str, str]] = {}) -> None:
+def set_response_data(value: dict[str, dict[str, str]] = {}, *,
+                      master: bool = False) -> None:
     """Sets the value of `response_data`.
 
     Args:
         value:
             The new dictionary to replace as the data
+
+    Keyword Args:
+        master:
+            A boolean value representing whether the data holds the responses
+            given in master mode, which are kept apart from the responses of
+            every other mode (default: False)
     """
-    global _response_data
-    _response_data = value
+    global _response_data, _master_response_data
+    if master:
+        _master_response_data = value
+    else:
+        _response_data = value
 
 
-def get_response_data() -> dict[str, dict[str, str]]:
+def get_response_data(*, master: bool = False) -> dict[str, dict[str, str]]:
     """Gets the value of `response_data`.
 
+    Keyword Args:
+        master:
+            A boolean value representing whether to get the responses given in
+            master mode instead (default: False)
+
     Returns:
         A dictionary mapping the guessed word to another dictionary mapping an
         answer to the resulting response. (In other words, if the guess was
         ALERT and the answer was OLIVE, the response would be `.O+..`, so
         `response_data['alert']['olive'] == '.O+..'` should return `True`.)
     """
-    return _response_data
+    return _master_response_data if master else _response_data
+
+
+def set_result_store(value: Optional[ResultStore] = None) -> None:
+    """Sets the store used to save and reuse ranked guesses.
+
+    Args:
+        value:
+            The ResultStore instance to use, or `None` to stop storing results
+            (default: None)
+    """
+    global _result_store
+    _result_store = value
+
+
+def get_result_store() -> Optional[ResultStore]:
+    """Gets the store used to save and reuse ranked guesses.
+
+    Returns:
+        The ResultStore instance being used, or `None` if results are not
+        being stored.
+    """
+    return _result_store
+
+
+def set_partition_cache(value: bool = True) -> None:
+    """Turns the cache of scored partitions on or off.
+
+    While the cache is on, the worst case of every guess which is fully
+    partitioned against a list of answers is kept (along with its entropy,
+    once that has been calculated), keyed by the guess and the identity of
+    that list, so scoring the same guess against the same list again costs a
+    single lookup. The solver turns the cache on at the
+    start of each turn, when the remaining answers of every board are fixed,
+    and turns it off at the end. Turning it on discards any cached scores.
+    Each thread has its own cache, so games solved at the same time by
+    different threads never share or clear each other's scores.
+
+    Args:
+        value:
+            A boolean value representing whether to cache partitions (default:
+            True)
+    """
+    # maps (guess, id of answers, mode) to [answers, worst case, entropy]
+    _partition_local.partitions = {} if value else None
+    # maps the id of answers to every (answers, `guess_classes` result) pair
+    _partition_local.classes = {} if value else None
+
+
+def get_partition_cache() -> Optional[dict]:
+    """Gets the cache of scored partitions of the current thread.
+
+    Returns:
+        The dict holding every cached partition, or `None` if the cache is off.
+    """
+    return getattr(_partition_local, 'partitions', None)
+
+
+def _cached_partition(guess: str, answers: list[str], mode: GameMode,
+                      entropy: bool = False) -> Optional[list]:
+    """Helper function which gets the cached worst case and entropy."""
+    partitions = getattr(_partition_local, 'partitions', None)
+    if partitions is None:
+        return None
+    key = mode.value & GameMode.MODE_MASK
+    cached = partitions.get((guess, id(answers), key))
+    if cached is None or cached[0] is not answers:
+        # an equivalent guess has the same partition, so its scores are used
+        cached = None
+        for known, representative in _partition_local.classes.get(
+                id(answers), ()):
+            rep = representative.get(guess, guess)
+            if known is answers and rep != guess:
+                cached = partitions.get((rep, id(answers), key))
+                break
+    if (cached is None or cached[0] is not answers
+            or (entropy and cached[2] is None)):
+        profile_count('partition_cache.misses')
+        return None
+    profile_count('partition_cache.hits')
+    return cached[1:]
+
+
+def _store_partition(guess: str, answers: list[str], mode: GameMode,
+                     counts: dict[str, int], entropy: Optional[float] = None
+                     ) -> None:
+    """Helper function which caches the scores of a complete partition."""
+    partitions = getattr(_partition_local, 'partitions', None)
+    if partitions is not None:
+        # the list is kept so its id cannot be reused while it is cached
+        partitions[(guess, id(answers), mode.value & GameMode.MODE_MASK)] = [
+            answers, max(counts.values(), default=0), entropy]
+
+
+def _share_partitions(answers: list[str],
+                      representative: dict[str, str]) -> None:
+    """Helper function which shares cached scores with each guess class."""
+    classes = getattr(_partition_local, 'classes', None)
+    if classes is None:
+        return
+    known = classes.setdefault(id(answers), [])
+    if all(pair[1] is not representative for pair in known):
+        known.append((answers, representative))
+
+
+def set_profiling(value: bool = True) -> None:
+    """Turns the collection of profiling data on or off.
+
+    While profiling is enabled, the solver keeps track of how many times each
+    of its hot paths is called, how much time is spent in each of them, and
+    how often its caches are hit. Turning profiling on discards any data that
+    was previously collected. While profiling is disabled, each instrumented
+    function only pays for a single check of a module-level variable.
+
+    Args:
+        value:
+            The boolean value to set (default: True)
+    """
+    global _profile_data
+    _profile_data = {} if value else None
+
+
+def get_profiling() -> bool:
+    """Gets whether profiling data is currently being collected.
+
+    Returns:
+        The boolean value representing whether profiling is enabled.
+    """
+    return _profile_data is not None
+
+
+def get_profile_data() -> dict[str, dict[str, float]]:
+    """Gets all profiling data collected since profiling was enabled.
+
+    Returns:
+        A dict mapping the name of each timer or counter to a dict holding the
+        number of times it was recorded (`calls`) and the total number of
+        seconds spent (`seconds`, always 0 for plain counters). If profiling is
+        disabled, the dict will be empty.
+    """
+    if _profile_data is None:
+        return {}
+    return dict((name, {'calls': int(calls), 'seconds': seconds})
+                for name, (calls, seconds) in _profile_data.items())
+
+
+def profile_time(name: str, start: float) -> None:
+    """Records one call to a timed section of code.
+
+    Callers should check `get_profiling()` before calling
+    `time.perf_counter()`, so nothing is measured while profiling is disabled.
+
+    Args:
+        name:
+            The name of the timer to record
+        start:
+            The value of `time.perf_counter()` when the section started
+    """
+    if _profile_data is not None:
+        profile_record(name, perf_counter() - start)
+
+
+def profile_record(name: str, seconds: float) -> None:
+    """Records one call to a timed section of code which was already timed.
+
+    Args:
+        name:
+            The name of the timer to record
+        seconds:
+            The number of seconds spent in the section
+    """
+    if _profile_data is not None:
+        if name not in _profile_data:
+            _profile_data[name] = [0, 0.0]
+        _profile_data[name][0] += 1
+        _profile_data[name][1] += seconds
+
+
+def profile_count(name: str, amount: int = 1) -> None:
+    """Increments a profiling counter, such as the number of cache hits.
+
+    Args:
+        name:
+            The name of the counter to increment
+        amount:
+            The amount to add to the counter (default: 1)
+    """
+    if _profile_data is not None:
+        if name not in _profile_data:
+            _profile_data[name] = [0, 0.0]
+        _profile_data[name][0] += amount
+
+
+def format_profile_data() -> str:
+    """Formats all collected profiling data as a human readable table.
+
+    Returns:
+        A str holding one line for every timer and counter, sorted by the total
+        time spent, followed by the hit rate of every cache.
+    """
+    data = get_profile_data()
+    lines = ['{:<40} {:>12} {:>12} {:>12}'.format(
+        'NAME', 'CALLS', 'SECONDS', 'USEC/CALL')]
+    for name, stats in sorted(data.items(),
+                              key=lambda x: (-x[1]['seconds'], x[0])):
+        per_call = 1e6 * stats['seconds'] / max(stats['calls'], 1)
+        lines.append('{:<40} {:>12d} {:>12.4f} {:>12.2f}'.format(
+            name, stats['calls'], stats['seconds'], per_call))
+    for name in sorted(data):
+        if name.endswith('.hits'):
+            cache = name[:-len('.hits')]
+            hits = data[name]['calls']
+            misses = data.get(cache + '.misses', {'calls': 0})['calls']
+            lines.append('{} hit rate: {:.2%}'.format(
+                cache, hits / max(hits + misses, 1)))
+    return '\n'.join(lines)
+
+
+def save_profile_data(filename: str) -> None:
+    """Writes all collected profiling data to a JSON file.
+
+    Args:
+        filename:
+            The path of the file to write
+    """
+    with open(filename, 'w') as outfile:
+        dump(get_profile_data(), outfile, indent=2, sort_keys=True)
+
+
+def set_backend(name: str = AUTO) -> str:
+    """Selects the implementation used by the response kernels.
+
+    The pure Python backend is the reference implementation and is always
+    available. The NumPy backend computes the responses for a whole list of
+    answers at once, and is only available if NumPy is installed. Both
+    backends give the same results, so this only affects speed.
+
+    Args:
+        name:
+            The name of the backend to use, which is either "python", "numpy",
+            or "auto" to use NumPy whenever it is installed (default: "auto")
+
+    Returns:
+        The name of the backend that will be used.
+
+    Raises:
+        ValueError: If `name` is not a known backend.
+        ModuleNotFoundError: If the NumPy backend is requested but NumPy is
+            not installed.
+    """
+    global _kernel
+    if name not in BACKENDS:
+        raise ValueError('Unknown backend "{}"'.format(name))
+    if name == NUMPY and not NUMPY_AVAILABLE:
+        raise ModuleNotFoundError('The numpy backend requires NumPy')
+    _kernel = None if name == PYTHON else numpy_kernel(WRONG + CLOSE + RIGHT)
+    return get_backend()
+
+
+def get_backend() -> str:
+    """Gets the name of the backend used by the response kernels.
+
+    Returns:
+        The str "numpy" if the NumPy backend is being used, or "python"
+        otherwise.
+    """
+    return PYTHON if _kernel is None else _kernel.name
 
 
 def colored_response(guess: str, response: str,
@@ -330,30 +900,39 @@ def get_response(guess: str, answer: str, mode: Optional[GameMode] = None,
     Returns:
         A string represention of the expected response.
     """
-    global _response_data, _response_data_updated
+    global _response_data_updated
+    if _profile_data is not None:
+        start = perf_counter()
     # Note: this use of memoization appears to speed up calculations by a
     #       factor of 10, but it also uses between 0.4 and 1.2GB of storage
+    if mode is None:
+        mode = GameMode()
     response = ''
-    if (use_cache and guess in _response_data
-            and answer in _response_data[guess]):
-        response = _response_data[guess][answer]
+    # liar mode adds its lie after the honest response is found
+    data = _master_response_data if mode.master else _response_data
+    if use_cache and guess in data and answer in data[guess]:
+        response = data[guess][answer]
+        if _profile_data is not None:
+            profile_count('response_cache.hits')
     else:
-        if mode is None:
-            mode = GameMode()
+        if use_cache and _profile_data is not None:
+            profile_count('response_cache.misses')
         if mode.master:
             response = _get_master_response(guess, answer)
         else:
             response = _get_easy_response(guess, answer)
         if use_cache:
-            if guess not in _response_data:
-                _response_data[guess] = {}
-            _response_data[guess][answer] = response
+            if guess not in data:
+                data[guess] = {}
+            data[guess][answer] = response
             _response_data_updated = True
     if (mode.liar):
         sym_idx = choice(list(range(len(response))))
         response = (response[:sym_idx]
                     + choice(SYM_ALTS[response[sym_idx]])
                     + response[sym_idx + 1:])
+    if _profile_data is not None:
+        profile_time('get_response', start)
     return response
 
 
@@ -382,27 +961,89 @@ def filter_remaining(remaining: list[str], guess: str, response: str,
         A new list which only includes answers that are consistent with the
         given guess and response.
     """
+    if _profile_data is not None:
+        start = perf_counter()
     if mode is None:
         mode = GameMode()
     filtered = []
-    if response == ''.join(RIGHT for _ in guess):
-        return [guess]
-    for answer in remaining:
-        if mode.liar:
-            this_response = get_response(guess, answer, GameMode(),
-                                         use_cache=use_cache)
-            # check that exactly one letter in the response is wrong
-            if 1 == sum(int(this_response[n] != response[n])
-                        for n in range(len(answer))):
-                filtered.append(answer)
-        else:
-            this_response = get_response(guess, answer, mode,
-                                         use_cache=use_cache)
-            if this_response == response:
-                filtered.append(answer)
+    solved = response == ''.join(RIGHT for _ in guess)
+    if solved and not mode.liar:
+        filtered = [guess]
+    elif _kernel is not None and len(remaining) >= _kernel.min_size:
+        filtered = _kernel.filter_remaining(remaining, guess, response,
+                                            mode.master, mode.liar)
+    else:
+        for answer in remaining:
+            if mode.liar:
+                this_response = get_response(guess, answer, GameMode(),
+                                             use_cache=use_cache)
+                # check that exactly one letter in the response is wrong
+                if 1 == sum(int(this_response[n] != response[n])
+                            for n in range(len(answer))):
+                    filtered.append(answer)
+                elif solved and answer == guess:
+                    # an all-correct response may or may not be a lie
+                    filtered.append(answer)
+            else:
+                this_response = get_response(guess, answer, mode,
+                                             use_cache=use_cache)
+                if this_response == response:
+                    filtered.append(answer)
+    if _profile_data is not None:
+        profile_time('filter_remaining', start)
     return filtered
 
 
+def filter_history(remaining: list[str], history: list[tuple[str, str]],
+                   mode: Optional[GameMode] = None, *,
+                   index: Optional[WordIndex] = None, use_cache: bool = True
+                   ) -> list[str]:
+    """Filters a given list of answers based on every guess and response.
+
+    In the default and hard game modes, the whole history is compiled into a
+    single Constraints instance, so no responses need to be calculated. If an
+    index of the word list is given, the matching words are found with set
+    intersections instead of checking every word. Other game modes fall back
+    to calling `filter_remaining` once for every guess.
+
+    Args:
+        remaining:
+            The list of remaining possible answers
+        history:
+            A list of 2-tuples where the first element is an entered guess and
+            the second element is the response given to that guess
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+
+    Keyword Args:
+        index:
+            A WordIndex instance which indexes (at least) every word in
+            `remaining`; if not set, every word will be checked (default: None)
+        use_cache:
+            A boolean value representing whether to use previously-calculated
+            response data being stored by the program (default: True)
+
+    Returns:
+        A new list which only includes answers that are consistent with every
+        guess and response in the history, in the same order as `remaining`.
+    """
+    if mode is None:
+        mode = GameMode()
+    if mode.master or mode.liar:  # these responses are not letter constraints
+        for guess, response in history:
+            remaining = filter_remaining(remaining, guess, response, mode,
+                                         use_cache=use_cache)
+        return remaining
+    constraints = Constraints()
+    for guess, response in history:
+        constraints.update(guess, response)
+    if index is None:
+        return constraints.filter(remaining)
+    matched = index.matching(constraints)
+    return [word for word in remaining if word in matched]
+
+
 def count_remaining(remaining: list[str], guess: str, response: str,
                     mode: Optional[GameMode] = None,
                     *, limit: Optional[int] = None, use_cache: bool = True
@@ -432,6 +1073,8 @@ def count_remaining(remaining: list[str], guess: str, response: str,
         The number of answers consistent with the given guess and response. If
         this value would be greater than `limit`, instead return `limit + 1`.
     """
+    if _profile_data is not None:
+        start = perf_counter()
     if mode is None:
         mode = GameMode()
     if limit is None:
@@ -451,25 +1094,229 @@ def count_remaining(remaining: list[str], guess: str, response: str,
             if this_response == response:
                 count += 1
         if count > limit:
-            return count
+            break
+    if _profile_data is not None:
+        profile_time('count_remaining', start)
     return count
 
 
+def worst_case_remaining(guess: str, answers: list[str],
+                         mode: Optional[GameMode] = None) -> int:
+    """Finds the largest number of answers that could remain after a guess.
+
+    Args:
+        guess:
+            The word which would be guessed by the player
+        answers:
+            The list of all remaining possible answers
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+
+    Returns:
+        The number of answers left by the least informative response to
+        `guess`, or 1 if every response narrows the answers down to one.
+    """
+    if mode is None:
+        mode = GameMode()
+    cached = _cached_partition(guess, answers, mode)
+    if cached is not None:
+        return max(1, cached[0])
+    return max(1, max(response_counts(guess, answers, mode).values(),
+                      default=1))
+
+
+def guess_classes(answers: list[str], guesses: list[str]) -> dict[str, str]:
+    """Groups together guesses which split the remaining answers identically.
+
+    Any letter which does not appear in a single remaining answer is always
+    marked as WRONG, no matter where it is placed in a guess. Two guesses that
+    only differ in those letters will therefore give the same response for
+    every remaining answer in every game mode, so only one guess from each
+    group needs to be scored.
+
+    Args:
+        answers:
+            The list of all remaining possible answers
+        guesses:
+            The list of all guesses to be grouped
+
+    Returns:
+        A dict mapping every guess to the representative of its group, which
+        is the first guess of that group in `guesses`.
+    """
+    letters = set(''.join(answers))
+    first = {}
+    representative = {}
+    for guess in guesses:
+        key = ''.join(letter if letter in letters else WRONG
+                      for letter in guess)
+        representative[guess] = first.setdefault(key, guess)
+    return representative
+
+
+def order_by_coverage(answers: list[str], guesses: list[str]) -> list[str]:
+    """Sorts guesses by how evenly their letters split the remaining answers.
+
+    This is a cheap estimate of how good each guess is, which costs a few
+    dict lookups per guess instead of a full pass over the answers. A letter
+    (or a letter at a specific position) splits the answers best when it
+    appears in about half of them.
+
+    Args:
+        answers:
+            The list of all remaining possible answers
+        guesses:
+            The list of all guesses to be sorted
+
+    Returns:
+        A new list holding every guess, with the most promising guesses first.
+        Guesses with the same estimate keep their original order.
+    """
+    letter_count = {}
+    position_count = {}
+    for answer in answers:
+        for letter in set(answer):
+            letter_count[letter] = letter_count.get(letter, 0) + 1
+        for index, letter in enumerate(answer):
+            key = (index, letter)
+            position_count[key] = position_count.get(key, 0) + 1
+    total = len(answers)
+
+    def coverage(guess: str) -> int:
+        """Helper function which gives the estimate for a single guess."""
+        score = 0
+        for letter in set(guess):
+            count = letter_count.get(letter, 0)
+            score += min(count, total - count)
+        for index, letter in enumerate(guess):
+            count = position_count.get((index, letter), 0)
+            score += min(count, total - count)
+        return score
+
+    return sorted(guesses, key=coverage, reverse=True)
+
+
+def response_counts(guess: str, answers: list[str],
+                    mode: Optional[GameMode] = None, *,
+                    limit: Optional[int] = None, use_cache: bool = True
+                    ) -> dict[str, int]:
+    """Partitions the remaining answers by the response they give to a guess.
+
+    This is the kernel shared by every guess-scoring strategy. Rather than
+    filtering the answers once for every distinct response, it builds the
+    whole response histogram in a single pass over the answers.
+
+    Args:
+        guess:
+            The word which would be guessed by the player
+        answers:
+            The list of all remaining possible answers
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+
+    Keyword Args:
+        limit:
+            The limit which, once exceeded by any single response, will stop
+            the count early; if not set, the limit will be ignored; it is also
+            ignored in liar mode (default: None)
+        use_cache:
+            A boolean value representing whether to use previously-calculated
+            response data being stored by the program (default: True)
+
+    Returns:
+        A dict mapping every response that `guess` can give to the number of
+        answers consistent with that response. In liar mode, every answer is
+        counted once for each of the responses that the game could give by
+        lying about exactly one letter. If the count stopped early because of
+        `limit`, the largest value will be exactly `limit + 1` and the rest of
+        the dict will be incomplete.
+    """
+    if mode is None:
+        mode = GameMode()
+    counts = {}
+    if mode.liar:
+        honest = response_counts(guess, answers, GameMode(),
+                                 use_cache=use_cache)
+        for response, count in honest.items():
+            for index, sym in enumerate(response):
+                for alt in SYM_ALTS[sym]:
+                    lie = response[:index] + alt + response[index + 1:]
+                    counts[lie] = counts.get(lie, 0) + count
+        _store_partition(guess, answers, mode, counts)
+        return counts
+    if _kernel is not None and len(answers) >= _kernel.min_size:
+        counts = _kernel.response_counts(guess, answers, mode.master)
+        _store_partition(guess, answers, mode, counts)
+        if limit is not None:
+            counts = {response: min(count, limit + 1)
+                      for response, count in counts.items()}
+        return counts
+    for answer in answers:
+        response = get_response(guess, answer, mode, use_cache=use_cache)
+        count = counts.get(response, 0) + 1
+        counts[response] = count
+        if limit is not None and count > limit:
+            return counts  # the partition is incomplete, so it is not cached
+    _store_partition(guess, answers, mode, counts)
+    return counts
+
+
+def response_entropy(guess: str, answers: list[str],
+                     mode: Optional[GameMode] = None, *,
+                     use_cache: bool = True) -> float:
+    """Finds the expected information gained by entering a guess.
+
+    Args:
+        guess:
+            The word which would be guessed by the player
+        answers:
+            The list of all remaining possible answers
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+
+    Keyword Args:
+        use_cache:
+            A boolean value representing whether to use previously-calculated
+            response data being stored by the program (default: True)
+
+    Returns:
+        The Shannon entropy (in bits) of the response to `guess`, assuming
+        every remaining answer is equally likely.
+    """
+    if mode is None:
+        mode = GameMode()
+    cached = _cached_partition(guess, answers, mode, entropy=True)
+    if cached is not None:
+        return cached[1]
+    counts = response_counts(guess, answers, mode, use_cache=use_cache)
+    total = sum(counts.values())
+    entropy = -sum(count / total * log2(count / total)
+                   for count in counts.values())
+    _store_partition(guess, answers, mode, counts, entropy)
+    return entropy
+
+
 def best_guesses(answers: list[str], guesses: Optional[list[str]] = None,
                  mode: Optional[GameMode] = None, *,
                  max_limit: Optional[int] = None, show: bool = False,
-                 return_all: bool = False, use_cache: bool = True
+                 return_all: bool = False, use_cache: bool = True,
+                 prefilter: Optional[int] = None
                  ) -> Union[list[str], dict[str, int]]:
     """Finds the best guesses to narrow down the remaining possible answers.
 
     This function minimizes the worst-case scenario for every legal guess.
     It will iterate through each possible guess, then for each guess, it will
-    iterate through every remaining possible answer. For each guess-answer
-    pair, the expected response is found, then that response is used to filter
-    the remaining answers. Whichever response results in the largest number of
-    remaining answers is recorded as the worst-case result for that guess. The
-    function will then return either a list of all guesses with the smallest
-    worst-case result or a dict containing the worst-case for every guess.
+    partition the remaining possible answers by their response using
+    `response_counts`. Whichever response results in the largest number of
+    remaining answers is recorded as the worst-case result for that guess. In
+    liar mode, every one of the 10 possible lies for every answer is taken
+    into account, so the result does not depend on which lie the game picks.
+    The function will then return either a list of all guesses with the
+    smallest worst-case result or a dict containing the worst-case for every
+    guess.
 
     Args:
         answers:
@@ -494,33 +1341,38 @@ def best_guesses(answers: list[str], guesses: Optional[list[str]] = None,
         use_cache:
             A boolean value representing whether to use previously-calculated
             response data being stored by the program (default: True)
+        prefilter:
+            If set, only this many groups of guesses with the highest expected
+            information (see `best_entropy_guesses`) are given to the exact
+            minimax pass, which makes the result approximate (default: None)
 
     Returns:
         A list of all guesses which minimize the worst-case number of remaining
         answers. If `return_all == True`, this will instead return a dict where
         the keys are the guesses and the values are the worst-case counts.
     """
+    if _profile_data is not None:
+        start = perf_counter()
     if mode is None:
         mode = GameMode()
-    if mode.hard or guesses is None or len(guesses) == 0:
-        guesses = answers
+    guesses, representative, candidates, _ = _minimax_candidates(
+        answers, guesses, mode, not return_all, prefilter, show, use_cache)
     if max_limit is None:
         max_limit = len(answers)
-    worst_case = dict([(x, 0) for x in guesses])
-    score = dict([(x, {}) for x in guesses])
-    for guess in tqdm(guesses, leave=False, ascii=PROGRESS, disable=not show):
-        for answer in answers:
-            response = get_response(guess, answer, mode, use_cache=use_cache)
-            if response not in score[guess]:
-                score[guess][response] = count_remaining(answers, guess,
-                                                         response, mode,
-                                                         limit=max_limit,
-                                                         use_cache=use_cache)
-            worst_case[guess] = max(worst_case[guess], score[guess][response])
-            if worst_case[guess] > max_limit:
-                break
+    worst_case = dict([(x, 0) for x in candidates])
+    for guess in progress(candidates, 'best_guesses', show):
+        cached = _cached_partition(guess, answers, mode)
+        if cached is None:
+            counts = response_counts(guess, answers, mode, limit=max_limit,
+                                     use_cache=use_cache)
+            cached = (max(counts.values(), default=0), )
+        worst_case[guess] = min(cached[0], max_limit + 1)
         if not return_all:
             max_limit = min(max_limit, worst_case[guess])
+    _share_partitions(answers, representative)
+    worst_case = dict((x, worst_case[representative[x]]) for x in guesses)
+    if _profile_data is not None:
+        profile_time('best_guesses', start)
     if return_all:
         return worst_case
     best = [x for x in guesses if worst_case[x] == max_limit]
@@ -530,6 +1382,142 @@ def best_guesses(answers: list[str], guesses: Optional[list[str]] = None,
     return best
 
 
+def anytime_best_guesses(answers: list[str],
+                         guesses: Optional[list[str]] = None,
+                         mode: Optional[GameMode] = None, *,
+                         time_limit: Optional[float] = None,
+                         budget: Optional[int] = None,
+                         prefilter: Optional[int] = None, show: bool = False,
+                         use_cache: bool = True) -> tuple[list[str], bool]:
+    """Finds the best guesses found within a time limit or scoring budget.
+
+    This scores guesses the same way as `best_guesses`, starting with the most
+    promising ones, but stops once the time limit or the budget runs out. At
+    least one guess is always scored. Once a guess splits the answers as
+    evenly as the number of possible responses allows, the budget no longer
+    applies, and the rest are only scored to find the guesses tied with it.
+    The result is proven optimal if every guess was scored.
+
+    Args:
+        answers:
+            The list of all remaining possible answers
+        guesses:
+            The list of all valid guesses; if not set, the answer list will be
+            used instead (default: None)
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+
+    Keyword Args:
+        time_limit:
+            The number of seconds after which no more guesses are scored; if
+            not set, there is no time limit (default: None)
+        budget:
+            The maximum number of guesses to score; if not set, there is no
+            budget (default: None)
+        prefilter:
+            If set, only this many guesses with the most information are
+            scored, in order of information, as in `best_guesses`; the time
+            limit also applies while their information is found, and any
+            guesses it was not found for are ranked last (default: None)
+        show:
+            A boolean value representing whether a progress bar should be shown
+            (default: False)
+        use_cache:
+            A boolean value representing whether to use previously-calculated
+            response data being stored by the program (default: True)
+
+    Returns:
+        A 2-tuple where the first element is the same list that `best_guesses`
+        would return if only the scored guesses were given to it, and the
+        second element is a boolean value representing whether every guess
+        was scored, so that the list is the same one `best_guesses` returns.
+    """
+    if _profile_data is not None:
+        start = perf_counter()
+    if mode is None:
+        mode = GameMode()
+    deadline = None if time_limit is None else perf_counter() + time_limit
+    guesses, representative, candidates, complete = _minimax_candidates(
+        answers, guesses, mode, True, prefilter, show, use_cache, deadline)
+    # no guess can do better than splitting the answers evenly
+    length = len(next(iter(answers), ''))
+    if mode.master:
+        lower_bound = -(-len(answers) // ((length + 1) * (length + 2) // 2))
+    elif mode.liar:  # every answer is counted once for each possible lie
+        lower_bound = -(-2 * length * len(answers) // 3 ** length)
+    else:
+        lower_bound = -(-len(answers) // 3 ** length)
+    max_limit = len(answers)
+    worst_case = {}
+    for guess in progress(candidates, 'best_guesses', show):
+        cached = _cached_partition(guess, answers, mode)
+        if cached is None:
+            counts = response_counts(guess, answers, mode, limit=max_limit,
+                                     use_cache=use_cache)
+            cached = (max(counts.values(), default=0), )
+        worst_case[guess] = min(cached[0], max_limit + 1)
+        max_limit = min(max_limit, worst_case[guess])
+        # once the bound is reached, the rest are only scored to find ties
+        if ((budget is not None and len(worst_case) >= budget
+                and max_limit > lower_bound)
+                or (deadline is not None and perf_counter() >= deadline)):
+            break
+    proven = complete and len(worst_case) == len(candidates)
+    if _profile_data is not None:
+        profile_count('anytime_best_guesses.scored', len(worst_case))
+        profile_count('anytime_best_guesses.proven', int(proven))
+        profile_time('anytime_best_guesses', start)
+    _share_partitions(answers, representative)
+    best = [x for x in guesses
+            if worst_case.get(representative[x], -1) == max_limit]
+    priority = set(best) & set(answers)
+    if len(priority) > 0:
+        return list(priority), proven
+    return best, proven
+
+
+def _minimax_candidates(answers: list[str], guesses: Optional[list[str]],
+                        mode: GameMode, ordered: bool,
+                        prefilter: Optional[int], show: bool, use_cache: bool,
+                        deadline: Optional[float] = None
+                        ) -> tuple[list[str], dict[str, str], list[str], bool]:
+    """Helper function which picks the guesses scored by `best_guesses`."""
+    if mode.hard or guesses is None or len(guesses) == 0:
+        guesses = answers
+    # only score one guess from each group of equivalent guesses
+    representative = guess_classes(answers, guesses)
+    candidates = list(dict.fromkeys(representative.values()))
+    complete = True
+    if prefilter is not None and len(candidates) > prefilter:
+        if deadline is None:
+            entropy = best_entropy_guesses(answers, candidates, mode,
+                                           show=show, return_all=True,
+                                           use_cache=use_cache)
+        else:  # the most promising guesses get their entropy first
+            candidates = order_by_coverage(answers, candidates)
+            entropy = {}
+            for guess in progress(candidates, 'best_entropy_guesses', show):
+                if perf_counter() >= deadline:
+                    complete = False
+                    break
+                entropy[guess] = response_entropy(guess, answers, mode,
+                                                  use_cache=use_cache)
+            _share_partitions(answers, representative)
+        # any guesses left without an entropy keep their order at the end
+        candidates = sorted(candidates, key=lambda x: entropy.get(x, -1.0),
+                            reverse=True)[:prefilter]
+        kept = set(candidates)
+        guesses = [x for x in guesses if representative[x] in kept]
+    elif ordered:
+        # score the most promising guesses first so the pruning starts early
+        candidates = order_by_coverage(answers, candidates)
+    if _profile_data is not None:
+        profile_count('best_guesses.guesses', len(guesses))
+        profile_count('best_guesses.scored', len(candidates))
+    return guesses, representative, candidates, complete
+
+
 def best_avg_guesses(answers: list[str], guesses: Optional[list[str]] = None,
                      mode: Optional[GameMode] = None, *, show: bool = False,
                      return_all: bool = False, use_cache: bool = True
@@ -578,7 +1566,7 @@ def best_avg_guesses(answers: list[str], guesses: Optional[list[str]] = None,
     average = dict([(x, 0.0) for x in guesses])
     count = dict([(x, {}) for x in guesses])
     best_avg = len(answers)
-    for guess in tqdm(guesses, leave=False, ascii=PROGRESS, disable=not show):
+    for guess in progress(guesses, 'best_avg_guesses', show):
         for answer in answers:
             response = get_response(guess, answer, mode, use_cache=use_cache)
             if response not in count[guess]:
@@ -598,6 +1586,212 @@ def best_avg_guesses(answers: list[str], guesses: Optional[list[str]] = None,
     return best
 
 
+def best_entropy_guesses(answers: list[str],
+                         guesses: Optional[list[str]] = None,
+                         mode: Optional[GameMode] = None, *,
+                         show: bool = False, return_all: bool = False,
+                         use_cache: bool = True
+                         ) -> Union[list[str], dict[str, float]]:
+    """Finds the best guesses to narrow down the remaining possible answers.
+
+    This function maximizes the expected information (the Shannon entropy of
+    the response) for every legal guess. Each guess costs a single pass over
+    the remaining answers to build its response histogram, so this costs
+    about the same as `best_guesses`, but it tends to give a better average
+    number of guesses.
+
+    Args:
+        answers:
+            The list of all remaining possible answers
+        guesses:
+            The list of all valid guesses; if not set, the answer list will be
+            used instead (default: None)
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+
+    Keyword Args:
+        show:
+            A boolean value representing whether a progress bar should be shown
+            (default: False)
+        return_all:
+            A boolean value representing whether to return the entropy for all
+            guesses as a dict (default: False)
+        use_cache:
+            A boolean value representing whether to use previously-calculated
+            response data being stored by the program (default: True)
+
+    Returns:
+        A list of all guesses which maximize the expected information. If
+        `return_all` is `True`, this will instead return a dict where the keys
+        are the guesses and the values are the entropies in bits.
+    """
+    if _profile_data is not None:
+        start = perf_counter()
+    if mode is None:
+        mode = GameMode()
+    if mode.hard or guesses is None or len(guesses) == 0:
+        guesses = answers
+    representative = guess_classes(answers, guesses)
+    candidates = list(dict.fromkeys(representative.values()))
+    entropy = dict((guess, response_entropy(guess, answers, mode,
+                                            use_cache=use_cache))
+                   for guess in progress(candidates, 'best_entropy_guesses',
+                                         show))
+    _share_partitions(answers, representative)
+    entropy = dict((x, entropy[representative[x]]) for x in guesses)
+    if _profile_data is not None:
+        profile_time('best_entropy_guesses', start)
+    if return_all:
+        return entropy
+    best_entropy = max(entropy.values(), default=0.0)
+    best = [x for x in guesses if entropy[x] >= best_entropy - 1e-9]
+    priority = set(best) & set(answers)
+    if len(priority) > 0:
+        return list(priority)
+    return best
+
+
+def rank_guesses(answers: list[str], guesses: Optional[list[str]] = None,
+                 mode: Optional[GameMode] = None, strategy: str = MINIMAX, *,
+                 time_limit: Optional[float] = None, show: bool = False,
+                 return_proven: bool = False
+                 ) -> Union[list[str], tuple[list[str], bool]]:
+    """Finds the best guesses using the given strategy.
+
+    Args:
+        answers:
+            The list of all remaining possible answers
+        guesses:
+            The list of all valid guesses (default: None)
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+        strategy:
+            One of `STRATEGIES`, where MINIMAX calls `best_guesses`, ENTROPY
+            calls `best_entropy_guesses`, and HYBRID calls `best_guesses` on
+            the `PREFILTER_SIZE` guesses with the most information (default:
+            MINIMAX)
+
+    Keyword Args:
+        time_limit:
+            If set, MINIMAX and HYBRID stop scoring guesses after this many
+            seconds and use `anytime_best_guesses`; results which are not
+            proven optimal are not stored (default: None)
+        show:
+            A boolean value representing whether to show a progress bar
+            (default: False)
+        return_proven:
+            A boolean value representing whether to also return whether the
+            result is proven optimal (default: False)
+
+    Returns:
+        A list of the best guesses, or if `return_proven` is set, a 2-tuple
+        holding that list and a boolean value which is only false if the time
+        limit stopped the search early.
+    """
+    if mode is None:
+        mode = GameMode()
+    pool = answers if guesses is None else guesses
+    if _result_store is not None:
+        stored = _result_store.get(mode.value & GameMode.MODE_MASK, strategy,
+                                   answers, pool)
+        if stored is not None:
+            profile_count('result_store.hits')
+            return (stored[0], True) if return_proven else stored[0]
+        profile_count('result_store.misses')
+    proven = True
+    if strategy == ENTROPY:
+        best = best_entropy_guesses(answers, guesses, mode, show=show)
+    elif time_limit is not None:
+        prefilter = PREFILTER_SIZE if strategy == HYBRID else None
+        best, proven = anytime_best_guesses(answers, guesses, mode,
+                                            time_limit=time_limit,
+                                            prefilter=prefilter, show=show)
+    else:
+        prefilter = PREFILTER_SIZE if strategy == HYBRID else None
+        best = best_guesses(answers, guesses, mode, show=show,
+                            prefilter=prefilter)
+    if _result_store is not None and len(best) > 0 and proven:
+        score = strategy_score(best[0], answers, mode, strategy)
+        _result_store.put(mode.value & GameMode.MODE_MASK, strategy, answers,
+                          pool, best, score)
+    return (best, proven) if return_proven else best
+
+
+def strategy_score(guess: str, answers: list[str],
+                   mode: Optional[GameMode] = None,
+                   strategy: str = MINIMAX) -> float:
+    """Gets the score which a strategy uses to rank a guess.
+
+    Args:
+        guess:
+            The word which would be guessed by the player
+        answers:
+            The list of all remaining possible answers
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+        strategy:
+            One of `STRATEGIES` (default: MINIMAX)
+
+    Returns:
+        The entropy of the responses to `guess` for ENTROPY, otherwise the
+        worst-case number of remaining answers after `guess`.
+    """
+    if strategy == ENTROPY:
+        return response_entropy(guess, answers, mode)
+    return worst_case_remaining(guess, answers, mode)
+
+
+def top_guesses(answers: list[str], guesses: list[str],
+                mode: Optional[GameMode] = None, size: int = 16, *,
+                show: bool = False) -> list[str]:
+    """Finds the guesses with the lowest worst-case remaining answers.
+
+    Unlike `best_guesses`, this ranks every guess, so the result includes
+    guesses which are worse than the best ones.
+
+    Args:
+        answers:
+            The list of all remaining possible answers
+        guesses:
+            The list of all valid guesses
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+        size:
+            The maximum number of guesses to return (default: 16)
+
+    Keyword Args:
+        show:
+            A boolean value representing whether to show a progress bar
+            (default: False)
+
+    Returns:
+        A list of up to `size` guesses, from best to worst; guesses with the
+        same score stay in the same order as in `guesses`. In hard mode, only
+        the answers are ranked.
+    """
+    if mode is None:
+        mode = GameMode()
+    # in hard mode only the answers are scored, as in `best_guesses`
+    scored = answers if mode.hard or not guesses else guesses
+    if _result_store is not None:
+        stored = _result_store.get(mode.value & GameMode.MODE_MASK, RANKED,
+                                   answers, guesses)
+        if stored is not None and len(stored[0]) >= min(size, len(scored)):
+            profile_count('result_store.hits')
+            return stored[0][:size]
+        profile_count('result_store.misses')
+    info = best_guesses(answers, guesses, mode, return_all=True, show=show)
+    ranked = sorted(scored, key=info.get)[:size]
+    if _result_store is not None and len(ranked) > 0:
+        _result_store.put(mode.value & GameMode.MODE_MASK, RANKED, answers,
+                          guesses, ranked, info[ranked[0]])
+    return ranked
+
+
 def rec_build_best_tree(answers: list[str], guesses: list[str], start: str,
                         mode: Optional[GameMode] = None, depth: int = 0,
                         *, show: bool = True) -> dict:
@@ -635,7 +1829,7 @@ def rec_build_best_tree(answers: list[str], guesses: list[str], start: str,
     if mode is None:
         mode = GameMode()
     tree = {start: {}}
-    for answer in tqdm(answers, ascii=PROGRESS, disable=not show):
+    for answer in progress(answers, 'rec_build_best_tree', show):
         response = get_response(start, answer, mode)
         if response in tree[start]:
             continue
@@ -645,10 +1839,9 @@ def rec_build_best_tree(answers: list[str], guesses: list[str], start: str,
             # if there is only one option, then it must be the best guess
             tree[start][response] = {filtered[0]: {}}
             continue
-        info = best_guesses(filtered, guesses, return_all=True)
         valid_path = {}
         limit = 2 ** (depth + 3)
-        for next_guess in sorted(guesses, key=lambda x: info[x])[:limit]:
+        for next_guess in top_guesses(filtered, guesses, mode, limit):
             valid_path = rec_build_best_tree(filtered, guesses, next_guess,
                                              mode, depth - 1, show=False)
             if next_guess in valid_path:
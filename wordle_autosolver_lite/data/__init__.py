@@ -1,10 +1,11 @@
 import os
-from json import load, dump
+from json import load, dump, loads, dumps
 
 
 DATA_PATH = os.path.relpath(__file__)
 DATA_PATH = '/'.join(DATA_PATH.split('/' if '/' in DATA_PATH else '\\')[:-1])
 DATA_PATH += '/'
+RESULT_STORE_FILE = 'results.sqlite'
 
 
 def format_bytes(num_bytes: int) -> str:
@@ -161,13 +162,129 @@ def save_all_data(hard: bool, master: bool, liar: bool,
         print('Save complete.')
 
 
+def load_first_moves(nyt=False) -> dict:
+    """Loads the precalculated first-move partitions for an answer list.
+
+    Args:
+        nyt:
+            A boolean value representing whether to load the partitions of the
+            New York Times answer list instead of the curated one (default:
+            False)
+
+    Returns:
+        A dict in the format given by `openings.build_first_moves`, or an
+        empty dict if the partitions have not been built.
+    """
+    filename = 'first_moves_nyt.json' if nyt else 'first_moves.json'
+    try:
+        with open(DATA_PATH + filename, 'r') as data:
+            return load(data)
+    except FileNotFoundError:
+        return {}
+
+
+def save_first_moves(first_moves: dict, nyt=False, allow_print=True) -> None:
+    """Saves the precalculated first-move partitions for an answer list.
+
+    Args:
+        first_moves:
+            A dict in the format given by `openings.build_first_moves`
+        nyt:
+            A boolean value representing whether the partitions are of the New
+            York Times answer list instead of the curated one (default: False)
+        allow_print:
+            A boolean value representing whether to allow print statements
+    """
+    filename = 'first_moves_nyt.json' if nyt else 'first_moves.json'
+    with open(DATA_PATH + filename, 'w') as data:
+        dump(first_moves, data, sort_keys=True, separators=(',', ':'))
+    if allow_print:  # pragma: no cover
+        print('  "{}"  {:>8}'.format(
+            filename, format_bytes(os.path.getsize(DATA_PATH + filename))))
+
+
+def book_filename(hard: bool, master: bool, liar: bool, nyt: bool,
+                  strategy: str) -> str:
+    """Gets the name of the file holding an opening book.
+
+    Args:
+        hard:
+            A boolean value representing whether the game mode is Hard
+        master:
+            A boolean value representing whether the game mode is Wordzy Master
+        liar:
+            A boolean value representing whether the game mode is Fibble
+        nyt:
+            A boolean value representing whether the book uses the New York
+            Times answer list
+        strategy:
+            The name of the strategy used to rank the guesses in the book
+
+    Returns:
+        The name of the file, relative to the data folder.
+    """
+    mode = 'default'
+    if hard:
+        mode = 'hard'
+    elif master:
+        mode = 'master'
+    elif liar:
+        mode = 'liar'
+    return 'book_{}{}_{}.jsonl'.format(mode, '_nyt' if nyt else '', strategy)
+
+
+def load_book(filename: str) -> list[dict]:
+    """Loads every complete line of an opening book.
+
+    The book is written one JSON object per line as it is built, so a build
+    which was interrupted may leave an incomplete last line; any such line is
+    ignored so that the build can be resumed.
+
+    Args:
+        filename:
+            The name of the file, relative to the data folder
+
+    Returns:
+        A list holding the dict stored on each line, or an empty list if the
+        file does not exist.
+    """
+    rows = []
+    try:
+        with open(DATA_PATH + filename, 'r') as data:
+            for line in data:
+                try:
+                    rows.append(loads(line))
+                except ValueError:
+                    break  # the rest of the book was never written
+    except FileNotFoundError:
+        pass
+    return rows
+
+
+def append_book(filename: str, rows: list[dict], reset=False) -> None:
+    """Adds lines to the end of an opening book.
+
+    Args:
+        filename:
+            The name of the file, relative to the data folder
+        rows:
+            The dicts to write, one per line
+        reset:
+            A boolean value representing whether to replace the contents of
+            the file instead of adding to them (default: False)
+    """
+    with open(DATA_PATH + filename, 'w' if reset else 'a') as data:
+        for row in rows:
+            data.write(dumps(row, separators=(',', ':')) + '\n')
+
+
 def clean_all_data() -> bool:
     """Empties the contents of local files written by the program.
 
     Will replace all files named "data/best_guess.json", "data/responses.json",
     and each of their variants to relieve some storage space. Additionally, if
     any of the expected files do not exist, this will create the file and write
-    an empty dict to that file.
+    an empty dict to that file. The result store is deleted.
 
     Returns:
         True if any data was added or deleted successfully, else False.
@@ -187,6 +304,9 @@ def clean_all_data() -> bool:
         with open(DATA_PATH + filename, 'w') as file:
             dump({}, file)
         added += os.path.getsize(DATA_PATH + filename)
+    if os.path.exists(DATA_PATH + RESULT_STORE_FILE):
+        deleted += os.path.getsize(DATA_PATH + RESULT_STORE_FILE)
+        os.remove(DATA_PATH + RESULT_STORE_FILE)
     if deleted - added == 0:
         print('Nothing to clean.')
         return False
@@ -1,29 +1,57 @@
 from argparse import ArgumentParser  # pragma: no cover
+from atexit import register  # pragma: no cover
 from json import load, dump  # pragma: no cover
 from traceback import print_exc  # pragma: no cover
-
-from tqdm import tqdm  # pragma: no cover
+from typing import Optional  # pragma: no cover
 
 try:  # pragma: no cover
     from common import set_response_data, get_response_data, GameMode
     from common import get_best_guess_updated, get_response_data_updated
     from common import PROGRESS, rec_build_best_tree
+    from common import set_profiling, format_profile_data, save_profile_data
+    from common import STRATEGIES, MINIMAX, BACKENDS, AUTO, set_backend
+    from common import set_result_store, get_result_store
     from solver import solve_wordle, manual_guess, manual_response
     from solver import simulate, simulated_response, SessionInfo
+    from solver import BEST_STARTERS
     from data import load_all_data, save_all_data, clean_all_data
+    from data import save_first_moves, book_filename
+    from data import DATA_PATH, RESULT_STORE_FILE
+    from store import ResultStore
+    from openings import build_first_moves, build_book
+    from events import progress, add_observer, ProgressBarObserver
+    from events import ConsoleObserver, LogObserver
 except ModuleNotFoundError:  # this is only here to help pytest find the module
     from wordle_autosolver_lite.common import set_response_data
     from wordle_autosolver_lite.common import get_best_guess_updated, GameMode
     from wordle_autosolver_lite.common import get_response_data_updated
     from wordle_autosolver_lite.common import get_response_data, PROGRESS
     from wordle_autosolver_lite.common import rec_build_best_tree
+    from wordle_autosolver_lite.common import set_profiling, save_profile_data
+    from wordle_autosolver_lite.common import format_profile_data
+    from wordle_autosolver_lite.common import STRATEGIES, MINIMAX
+    from wordle_autosolver_lite.common import BACKENDS, AUTO, set_backend
+    from wordle_autosolver_lite.common import set_result_store
+    from wordle_autosolver_lite.common import get_result_store
     from wordle_autosolver_lite.solver import solve_wordle, SessionInfo
     from wordle_autosolver_lite.solver import manual_guess, manual_response
     from wordle_autosolver_lite.solver import simulate, simulated_response
+    from wordle_autosolver_lite.solver import BEST_STARTERS
+    from wordle_autosolver_lite.data import load_all_data, save_all_data
+    from wordle_autosolver_lite.data import clean_all_data, save_first_moves
+    from wordle_autosolver_lite.data import book_filename, DATA_PATH
+    from wordle_autosolver_lite.data import RESULT_STORE_FILE
+    from wordle_autosolver_lite.store import ResultStore
+    from wordle_autosolver_lite.openings import build_first_moves, build_book
+    from wordle_autosolver_lite.events import progress, add_observer
+    from wordle_autosolver_lite.events import ProgressBarObserver
+    from wordle_autosolver_lite.events import ConsoleObserver, LogObserver
 
 
 def parse_command_line_args() -> tuple[int, bool, bool, bool, str, int, bool,
-                                       str, int, bool, bool, bool, bool]:
+                                       str, int, bool, bool, bool, bool,
+                                       str, str, str, bool, str,
+                                       Optional[float], Optional[str]]:
     """Parse all command line arguments using `argparse.ArgumentParser`."""
     parser = ArgumentParser(
         description=('Solve a Wordle game on one board or multiple by '
@@ -79,13 +107,71 @@ def parse_command_line_args() -> tuple[int, bool, bool, bool, str, int, bool,
                               'variants to relieve some storage space (the '
                               'program will not execute any other commands '
                               'when this flag is set)'))
+    parser.add_argument('--build-first-moves', metavar='WORD', nargs='*',
+                        default=None,
+                        help=('precalculate how every starting word in the '
+                              'built-in list (and any WORD given) splits each '
+                              'answer list, so the first guess in a game can '
+                              'be applied with a single lookup (the program '
+                              'will not execute any other commands when this '
+                              'flag is set)'))
+    parser.add_argument('--build-book', metavar='WORD', nargs='*',
+                        default=None,
+                        help=('precalculate the best second guesses after '
+                              'every response to each WORD (or to every '
+                              'starting word in the built-in list if no WORD '
+                              'is given) for the selected mode and strategy; '
+                              'an interrupted build continues where it '
+                              'stopped when run again (the program will not '
+                              'execute any other commands when this flag is '
+                              'set)'))
+    parser.add_argument('--jobs', type=int, default=None,
+                        help=('number of processes used by --build-book '
+                              '(default: one per CPU)'))
+    parser.add_argument('--no-store', action='store_false', dest='store',
+                        help=('do not read or write the best guesses saved in '
+                              '"data/{}" for every set of remaining answers '
+                              'seen in past runs'.format(RESULT_STORE_FILE)))
+    parser.add_argument('--time-limit', metavar='SECONDS', type=float,
+                        default=None,
+                        help=('stop ranking the guesses on a board after '
+                              'SECONDS and suggest the best guess found so '
+                              'far (default: no limit)'))
+    parser.add_argument('--records', metavar='FILE', default=None,
+                        help=('with --sim, write one CSV row per simulated '
+                              'game to FILE as it finishes, holding its '
+                              'answers, guesses, score, and time'))
+    parser.add_argument('--log', metavar='FILE', default=None,
+                        help=('write every progress and result event to FILE '
+                              'as one line of JSON per event'))
     parser.add_argument('--start', metavar='WORD', nargs='+', default=[],
                         help=('set this flag if there are certain words you '
                               'want to start with regardless of the response'))
+    parser.add_argument('--strategy', choices=STRATEGIES, default=MINIMAX,
+                        help=('how guesses are ranked: "minimax" minimizes the '
+                              'worst case, "entropy" maximizes the expected '
+                              'information, and "hybrid" only runs minimax on '
+                              'the guesses with the most information '
+                              '(default: minimax)'))
+    parser.add_argument('--profile', metavar='FILE', nargs='?', const='',
+                        default=None,
+                        help=('set this flag to print call counts, timings, '
+                              'and cache statistics for the solver hot paths '
+                              'when the program exits; if FILE is given, '
+                              'the data is also written to FILE as JSON'))
+    parser.add_argument('--backend', choices=BACKENDS, default=AUTO,
+                        help=('which implementation to use when scoring '
+                              'guesses: "numpy" requires NumPy to be '
+                              'installed, "python" never uses it, and "auto" '
+                              'uses NumPy whenever it is available (default: '
+                              'auto)'))
     args = parser.parse_args()
     if args.clean:  # pragma: no cover
         clean_all_data()
         exit()
+    if args.build_first_moves is not None:  # pragma: no cover
+        build_all_first_moves(args.build_first_moves)
+        exit()
     lim = max(min(args.board_limit, 500), args.num)
     mode = GameMode()
     if args.hard:
@@ -98,19 +184,78 @@ def parse_command_line_args() -> tuple[int, bool, bool, bool, str, int, bool,
         mode.play = True
     if args.inf:
         mode.endless = True
+    if args.build_book is not None:  # pragma: no cover
+        build_opening_book(args.build_book, mode, args.nyt, args.strategy,
+                           args.jobs)
+        exit()
     return (args.num, lim, mode, args.nyt, args.start, args.sim,
-            args.stro, args.best)
+            args.stro, args.best, args.profile, args.strategy, args.backend,
+            args.store, args.log, args.time_limit, args.records)
+
+
+def build_all_first_moves(words: list[str]) -> None:  # pragma: no cover
+    """Builds and saves the first-move partitions of both answer lists."""
+    starters = list(dict.fromkeys(BEST_STARTERS + [w.lower() for w in words]))
+    print('Building first moves for {} starters...'.format(len(starters)))
+    for nyt in (False, True):
+        answers = load_all_data(False, False, False, nyt, False)[0]
+        save_first_moves(build_first_moves(answers, starters), nyt)
+
+
+def build_opening_book(words: list[str], mode: GameMode, nyt: bool,
+                       strategy: str, jobs: Optional[int]
+                       ) -> None:  # pragma: no cover
+    """Builds (or continues building) the opening book for a game mode."""
+    starters = [w.lower() for w in words] if len(words) > 0 else BEST_STARTERS
+    filename = book_filename(mode.hard, mode.master, mode.liar, nyt, strategy)
+    answers, guesses, _, freq, _, _ = load_all_data(mode.hard, mode.master,
+                                                    mode.liar, nyt, False)
+    print('Building "{}" for {} starters...'.format(filename, len(starters)))
+    rows = build_book(answers, guesses, freq, starters, mode, strategy,
+                      filename, jobs=jobs)
+    print('Book complete. {} entries.'.format(len(rows) - 1))
+
+
+def close_result_store() -> None:  # pragma: no cover
+    """Saves every pending result before the program exits."""
+    store = get_result_store()
+    if store is not None:
+        store.close()
+        set_result_store(None)
+
+
+def report_profile(filename: str = '') -> None:  # pragma: no cover
+    """Prints all collected profiling data and optionally saves it as JSON."""
+    print('\nPROFILE:')
+    print(format_profile_data())
+    if filename != '':
+        save_profile_data(filename)
+        print('Profile written to "{}"'.format(filename))
 
 
 def main() -> None:  # pragma: no cover
     """Main entry point into the program."""
+    add_observer(ProgressBarObserver(PROGRESS))
+    add_observer(ConsoleObserver())
     # main variable initializations
-    (n_games, lim, mode, nyt, start,
-        sim, stro, best) = parse_command_line_args()
+    (n_games, lim, mode, nyt, start, sim, stro, best, profile,
+        strategy, backend, store, log, time_limit,
+        records) = parse_command_line_args()
+    if log is not None:
+        log_file = open(log, 'a')
+        add_observer(LogObserver(log_file))
+        register(log_file.close)
+    set_backend(backend)
+    if store:
+        set_result_store(ResultStore(DATA_PATH + RESULT_STORE_FILE))
+        register(close_result_store)
+    if profile is not None:
+        set_profiling()
+        register(report_profile, profile)
     (answers, guesses, _, freq,
         saved_best, resp_data) = load_all_data(mode.hard, mode.master,
                                                mode.liar, nyt)
-    set_response_data(resp_data)
+    set_response_data(resp_data, master=mode.master)
     auto_guess = manual_guess
     auto_response = simulated_response if mode.play else manual_response
     if mode.endless:
@@ -131,8 +276,12 @@ def main() -> None:  # pragma: no cover
         saved_best = tree
     if sim > 0:
         session = SessionInfo(n_games, answers, guesses, saved_best, freq,
-                              start, mode)
-        simulate(session, sim, show=True)
+                              start, mode, strategy, time_limit)
+        if records is None:
+            simulate(session, sim, show=True)
+        else:
+            with open(records, 'w', newline='') as stream:
+                simulate(session, sim, show=True, records=stream)
     elif sim == -1:
         best_case = -8
         best_start = []
@@ -140,9 +289,10 @@ def main() -> None:  # pragma: no cover
         with open('data/ordered_guesses.json', 'r') as ordered:
             worst_case = load(ordered)
         modified = sorted(answers, key=lambda x: worst_case[x])
-        for starter in tqdm(modified, ascii=PROGRESS):
+        for starter in progress(modified, 'best_starters'):
             session = SessionInfo(n_games, answers, guesses, saved_best, freq,
-                                  [starter], mode)
+                                  [starter], mode, strategy,
+                                  time_limit)
             _, worst = simulate(session, len(answers), best_case, show=False,
                                 return_if_worse=True)
             if worst == best_case:
@@ -154,11 +304,12 @@ def main() -> None:  # pragma: no cover
     if sim != 0:
         save_all_data(session.hard, session.master, session.liar,
                       get_best_guess_updated(), saved_best,
-                      get_response_data_updated(), get_response_data(), nyt)
+                      get_response_data_updated(),
+                      get_response_data(master=session.master), nyt)
         exit()
     while n_games <= lim:
         session = SessionInfo(n_games, answers, guesses, saved_best, freq,
-                              start, mode)
+                              start, mode, strategy, time_limit)
         try:
             session = solve_wordle(session, auto_guess, auto_response, True)
         except Exception:
@@ -171,5 +322,5 @@ def main() -> None:  # pragma: no cover
         if stro:
             start = session.solved
     save_all_data(mode.hard, mode.master, mode.liar, get_best_guess_updated(),
-                  saved_best, get_response_data_updated(), get_response_data(),
-                  nyt)
+                  saved_best, get_response_data_updated(),
+                  get_response_data(master=mode.master), nyt)
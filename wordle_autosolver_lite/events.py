@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+from json import dumps
+from time import time
+from typing import Iterable, Optional, TextIO, TypeVar
+
+from tqdm import tqdm
+
+
+PROGRESS_STEPS: int = 100  # the most updates sent for any single loop
+
+T = TypeVar('T')
+
+_observers: list[Observer] = []
+_progress_count: int = 0
+
+
+class Observer():
+    """A base class for anything which receives events from the solver
+
+    Every event has a name and a dict of data which can be written as JSON.
+    Events are sent whether or not the solver was asked to print anything;
+    apart from the progress events, their data holds a "show" flag which is
+    only true when the caller wanted the event printed to the console. The
+    events sent by the solver are:
+
+        progress.start, progress.update, progress.finish:
+            A long loop started, made progress, or stopped; the data holds a
+            unique "id", the "name" of the loop, the number of items "done",
+            and the "total" number of items
+        solve.start:
+            The solver started playing some number of "boards"
+        solve.starter:
+            The suggested starting "guess" was chosen
+        solve.progress:
+            A new turn started, with the "solved" letters of every board, the
+            "count" of solved boards, and the total number of "boards"
+        guess.predetermined:
+            The next "guess" is one of the session's starting words
+        guess.enter:
+            The next "guess" is about to be entered; "answer" is true when it
+            is known to be the answer to some board
+        board.response:
+            The "response" to a "guess" was given on a "board" (counting from
+            0); "text" holds the guess colored to match the response
+        board.new_word:
+            The responses on a "board" do not match any known answer, so every
+            word is now a possible answer
+        board.answer:
+            The "answer" on a "board" (out of some number of "boards") was
+            found
+        board.best:
+            The best "guesses" on a "board" (out of some number of "boards")
+            were ranked, with the number of answers "remaining", and the
+            "answers" themselves if there are at most 9 of them
+        best_guess:
+            The solver chose the next "guess"
+        solve.finish:
+            The game ended; "play" is true when the user was playing the game
+        answers.start:
+            The answers which were found but not entered, out of a "total",
+            are about to be entered
+        answers.enter:
+            The "answer" to the board at "index" (out of a "total") is being
+            entered, or was already "entered"
+        solutions:
+            The game ended, with the "solutions" to every board
+        simulate.start:
+            A simulation of some number of "games" started, using the given
+            "starters"
+        simulate.finish:
+            A simulation finished, with the "scores" mapping every score to
+            its count, the "total" number of games, the "average" score, and
+            the list of "failures" (only the first 64 are kept)
+    """
+
+    def notify(self, event: str, data: dict) -> None:
+        """Receives a single event.
+
+        Args:
+            event:
+                The name of the event
+            data:
+                A dict holding the data attached to the event
+        """
+
+
+class ProgressBarObserver(Observer):
+    """An observer which shows every progress event as a tqdm progress bar"""
+
+    def __init__(self, ascii: Optional[str] = None) -> None:
+        """Creates a new observer.
+
+        Args:
+            ascii:
+                The characters used to draw each bar, as used by `tqdm`
+                (default: None)
+        """
+        self.ascii = ascii
+        self._bars: dict[int, tqdm] = {}
+
+    def notify(self, event: str, data: dict) -> None:
+        if event == 'progress.start':
+            self._bars[data['id']] = tqdm(total=data['total'], leave=False,
+                                          ascii=self.ascii)
+        elif event in ('progress.update', 'progress.finish'):
+            bar = self._bars.get(data['id'])
+            if bar is None:
+                return
+            bar.update(data['done'] - bar.n)
+            if event == 'progress.finish':
+                del self._bars[data['id']]
+                bar.close()
+
+
+class ConsoleObserver(Observer):
+    """An observer which prints the results of the solver to the console
+
+    Only the events with a true "show" flag are printed.
+    """
+
+    def notify(self, event: str, data: dict) -> None:
+        if not data.get('show', True):
+            return
+        if event == 'solve.start':
+            print('\n\nStarting solver.' + (
+                '' if data['boards'] == 1 else
+                ' Simulating {} simultaneous Wordle games.'.format(
+                    data['boards'])
+            ))
+        elif event == 'solve.starter':
+            print("\nSuggested starting word is {}\n".format(
+                data['guess'].upper()))
+        elif event == 'solve.progress':
+            print("\nSolved {:>2d}/{:<2d} boards: [{}]".format(
+                data['count'], data['boards'],
+                ', '.join(data['solved']).upper()))
+        elif event == 'guess.predetermined':
+            print("\n  Predetermined guess is {}\n".format(
+                data['guess'].upper()))
+        elif event == 'guess.enter':
+            print("\n  {} {}...\n".format(
+                'Entering' if data['answer'] else 'Guessing',
+                data['guess'].upper()))
+        elif event == 'board.response':
+            print("  Response was \"{}\" on board {}".format(
+                data['text'], data['board'] + 1))
+        elif event == 'board.new_word':
+            print("\n\nBOARD {} USES A NEW WORD\n\n".format(data['board'] + 1))
+        elif event == 'board.answer':
+            print("\n    The answer{} is {}\n".format(
+                _on_board(data), data['answer'].upper()))
+        elif event == 'board.best':
+            print('  Best guess(es){}: {}'.format(
+                _on_board(data), ', '.join(data['guesses'][:8]).upper()
+                + ('' if len(data['guesses']) <= 8 else ', ...')))
+            print('    {} possible answers{}'.format(
+                data['remaining'],
+                ': ' + ', '.join(data['answers']).upper()
+                if data['remaining'] <= 9 else ''))
+        elif event == 'best_guess':
+            print("\n  Best next guess: {}".format(data['guess'].upper()))
+        elif event == 'solve.finish':
+            print('\n{} complete.\n'.format(
+                'Game' if data['play'] else 'Solve'))
+        elif event == 'answers.start':
+            print('Entering all remaining answers... ({} total)'.format(
+                data['total']))
+        elif event == 'answers.enter':
+            print('  {} {:>4d}/{:<4d} {}'.format(
+                'Entered ' if data['entered'] else 'Entering',
+                data['index'] + 1, data['total'], data['answer'].upper()))
+        elif event == 'solutions':
+            print("\nSOLUTIONS:")
+            for index, answer in enumerate(data['solutions']):
+                print("{:>4d}. {}".format(index + 1, answer))
+        elif event == 'simulate.start':
+            starting = str(data['starters'])[1:-1]
+            print("Simulating {} unique games{}...".format(
+                data['games'],
+                '' if starting == '' else ' with starting word(s) ' + starting
+            ))
+        elif event == 'simulate.finish':
+            print('\n\nSimulation complete.\n\n SCORE | COUNT | %TOTAL')
+            for score in range(-8, 6):
+                if score in data['scores']:
+                    count = data['scores'][score]
+                    print('{:^7d}|{:^7d}| {:<.4f}'.format(
+                        score, count, 100 * count / data['total']))
+            print("\nAVERAGE = {:.2f}".format(data['average']))
+            if len(data['failures']) < 64:
+                print("FAILURES = {}".format(str(data['failures'])))
+            print()
+
+
+def _on_board(data: dict) -> str:
+    """Helper function which names the board of an event, if there are many."""
+    return '' if data['boards'] == 1 else ' on board {}'.format(
+        data['board'] + 1)
+
+
+class LogObserver(Observer):
+    """An observer which writes every event as a line of JSON"""
+
+    def __init__(self, stream: TextIO) -> None:
+        """Creates a new observer.
+
+        Args:
+            stream:
+                The file-like object to write to
+        """
+        self.stream = stream
+
+    def notify(self, event: str, data: dict) -> None:
+        self.stream.write(dumps(dict(event=event, time=time(), **data)) + '\n')
+
+
+def add_observer(observer: Observer) -> None:
+    """Starts sending every event to the given observer.
+
+    Args:
+        observer:
+            The Observer instance to add
+    """
+    _observers.append(observer)
+
+
+def remove_observer(observer: Observer) -> None:
+    """Stops sending events to the given observer.
+
+    Args:
+        observer:
+            The Observer instance to remove
+    """
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def get_observers() -> list[Observer]:
+    """Gets every observer which is receiving events.
+
+    Returns:
+        A copy of the list of observers.
+    """
+    return _observers[:]
+
+
+def emit(event: str, **data) -> None:
+    """Sends an event to every observer.
+
+    Args:
+        event:
+            The name of the event
+
+    Keyword Args:
+        Any data to attach to the event
+    """
+    for observer in _observers:
+        observer.notify(event, data)
+
+
+def progress(items: Iterable[T], name: str, show: bool = True,
+             total: Optional[int] = None) -> Iterable[T]:
+    """Reports the progress of a loop to every observer.
+
+    If there are no observers (or `show` is false), the items are returned
+    unchanged, so the loop does not pay anything for being observed.
+    Otherwise, at most `PROGRESS_STEPS` updates are sent while looping.
+
+    Args:
+        items:
+            The items to loop through
+        name:
+            The name of the loop, which is attached to each event
+        show:
+            A boolean value representing whether to report progress (default:
+            True)
+        total:
+            The number of items; if not set, `len(items)` is used (default:
+            None)
+
+    Returns:
+        An iterable holding the same items.
+    """
+    if not show or len(_observers) == 0:
+        return items
+    return _progress(items, name, len(items) if total is None else total)
+
+
+def _progress(items: Iterable[T], name: str, total: int) -> Iterable[T]:
+    """Helper function which sends the progress events for `progress`."""
+    global _progress_count
+    _progress_count += 1
+    ident = _progress_count
+    step = max(1, total // PROGRESS_STEPS)
+    done = 0
+    emit('progress.start', id=ident, name=name, done=done, total=total)
+    try:
+        for item in items:
+            yield item
+            done += 1
+            if done % step == 0:
+                emit('progress.update', id=ident, name=name, done=done,
+                     total=total)
+    finally:
+        emit('progress.finish', id=ident, name=name, done=done, total=total)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Optional
+
+try:  # NumPy is optional; without it, only the pure Python kernels are used
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+NUMPY_AVAILABLE: bool = np is not None
+MIN_SIZE: int = 32  # smaller word lists are faster in pure Python
+CACHE_SIZE: int = 64
+
+
+class NumpyKernel():
+    """A class holding vectorized versions of the response kernels
+
+    Every word list is converted to a 2D array of letter codes before it is
+    used. The array of a tuple or a frozenset is kept for as long as it stays
+    in the cache, since those are identified by the instance and cannot be
+    changed; any other list is converted again each time, since it may have
+    been changed in place.
+    """
+    name = 'numpy'
+
+    def __init__(self, symbols: str, min_size: int = MIN_SIZE,
+                 cache_size: int = CACHE_SIZE) -> None:
+        """Creates a new kernel.
+
+        Args:
+            symbols:
+                A str holding the response symbols for a wrong letter, a
+                letter in the wrong position, and a letter in the right
+                position, in that order
+            min_size:
+                The smallest word list which should use this kernel; callers
+                should use the pure Python kernels for anything smaller
+                (default: MIN_SIZE)
+            cache_size:
+                The maximum number of encoded word lists to keep (default:
+                CACHE_SIZE)
+        """
+        self.symbols = symbols
+        self.min_size = min_size
+        self.cache_size = cache_size
+        self._arrays: OrderedDict[int, tuple[tuple[str, ...], np.ndarray]] = (
+            OrderedDict())
+        self._tables: dict[int, list[str]] = {}
+
+    def encode(self, words: list[str]) -> np.ndarray:
+        """Gets the 2D array of letter codes for a list of words.
+
+        Args:
+            words:
+                The list of words to encode, which must all have the same
+                length
+
+        Returns:
+            An array with one row for each word and one column for each
+            letter position.
+        """
+        immutable = isinstance(words, (tuple, frozenset))
+        key = id(words)
+        cached = self._arrays.get(key) if immutable else None
+        if cached is not None and cached[0] is words:
+            self._arrays.move_to_end(key)
+            return cached[1]
+        length = len(next(iter(words), ''))
+        array = np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8)
+        array = array.reshape(len(words), length)
+        if immutable:  # the words are kept, so their id is never reused
+            self._arrays[key] = (words, array)
+            if len(self._arrays) > self.cache_size:
+                self._arrays.popitem(last=False)
+        return array
+
+    def responses(self, guess: str, answers: list[str], master: bool = False
+                  ) -> np.ndarray:
+        """Gets the response to a guess for every answer as symbol indexes.
+
+        Args:
+            guess:
+                The word which would be guessed by the player
+            answers:
+                The list of all remaining possible answers
+            master:
+                A boolean value representing whether the game only reveals how
+                many letters are right or close (default: False)
+
+        Returns:
+            An array with one row for each answer, where each element is the
+            index of its response symbol in `symbols`.
+        """
+        words = self.encode(answers)
+        target = np.frombuffer(guess.encode('ascii'), dtype=np.uint8)
+        green = words == target
+        response = np.where(green, 2, 0).astype(np.int8)
+        for letter in np.unique(target):
+            # count the copies of this letter which have not been matched yet
+            available = ((words == letter) & ~green).sum(axis=1)
+            for index in np.flatnonzero(target == letter):
+                close = ~green[:, index] & (available > 0)
+                response[close, index] = 1
+                available -= close
+        if master:  # the order of the symbols is not revealed
+            response = -np.sort(-response, axis=1)
+        return response
+
+    def _codes(self, response: np.ndarray) -> np.ndarray:
+        """Helper function which converts each response row to an integer."""
+        powers = 3 ** np.arange(response.shape[1], dtype=np.int64)
+        return response.astype(np.int64) @ powers
+
+    def _table(self, length: int) -> list[str]:
+        """Helper function which maps every response code to its string."""
+        if length not in self._tables:
+            table = ['']
+            for _ in range(length):
+                table = [prefix + sym for sym in self.symbols
+                         for prefix in table]
+            self._tables[length] = table
+        return self._tables[length]
+
+    def response_counts(self, guess: str, answers: list[str],
+                        master: bool = False) -> dict[str, int]:
+        """Partitions the answers by the response they give to a guess.
+
+        Args:
+            guess:
+                The word which would be guessed by the player
+            answers:
+                The list of all remaining possible answers
+            master:
+                A boolean value representing whether the game only reveals how
+                many letters are right or close (default: False)
+
+        Returns:
+            A dict mapping every response to the number of answers which give
+            it, in the order each response first appears in `answers`.
+        """
+        if len(answers) == 0:
+            return {}
+        codes = self._codes(self.responses(guess, answers, master))
+        unique, first, counts = np.unique(codes, return_index=True,
+                                          return_counts=True)
+        table = self._table(len(guess))
+        return dict((table[unique[n]], int(counts[n]))
+                    for n in np.argsort(first))
+
+    def filter_remaining(self, remaining: list[str], guess: str,
+                         response: str, master: bool = False,
+                         liar: bool = False) -> list[str]:
+        """Filters a given list of answers based on a guess and response.
+
+        Args:
+            remaining:
+                The list of remaining possible answers
+            guess:
+                The word which was guessed by the player
+            response:
+                The response from the game after `guess` was entered
+            master:
+                A boolean value representing whether the game only reveals how
+                many letters are right or close (default: False)
+            liar:
+                A boolean value representing whether exactly one symbol of the
+                response is a lie (default: False)
+
+        Returns:
+            A new list which only includes answers that are consistent with
+            the given guess and response.
+        """
+        if (len(remaining) == 0 or len(response) != len(guess)
+                or any(sym not in self.symbols for sym in response)):
+            return []  # no answer can give an invalid response
+        honest = self.responses(guess, remaining, master)
+        target = np.array([self.symbols.index(sym) for sym in response],
+                          dtype=np.int8)
+        if liar:
+            keep = (honest != target).sum(axis=1) == 1
+            if response == self.symbols[2] * len(response):
+                # an all-correct response may or may not be a lie
+                keep |= (honest == 2).all(axis=1)
+        else:
+            keep = (honest == target).all(axis=1)
+        if not isinstance(remaining, list):  # may not be indexed in O(1)
+            remaining = list(remaining)
+        return [remaining[index] for index in np.flatnonzero(keep)]
+
+
+def numpy_kernel(symbols: str) -> Optional[NumpyKernel]:
+    """Creates a NumPy kernel if NumPy is installed.
+
+    Args:
+        symbols:
+            The response symbols to use, as described in `NumpyKernel`
+
+    Returns:
+        A new NumpyKernel instance, or `None` if NumPy is not installed.
+    """
+    return NumpyKernel(symbols) if NUMPY_AVAILABLE else None
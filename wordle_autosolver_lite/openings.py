@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+from hashlib import sha1
+from itertools import accumulate, chain
+from multiprocessing import Pool
+from typing import Iterable, Optional
+
+try:  # pragma: no cover
+    from common import GameMode, RIGHT, CLOSE, WRONG, get_response
+    from common import Constraints, filter_remaining, response_counts
+    from common import rank_guesses, profile_count
+    from common import MINIMAX, STRATEGIES
+    from data import load_first_moves, book_filename, load_book, append_book
+    from store import fingerprint
+    from events import progress
+except ModuleNotFoundError:  # this is only here to help pytest find the module
+    from wordle_autosolver_lite.common import GameMode, RIGHT, CLOSE, WRONG
+    from wordle_autosolver_lite.common import get_response
+    from wordle_autosolver_lite.common import Constraints, filter_remaining
+    from wordle_autosolver_lite.common import response_counts, rank_guesses
+    from wordle_autosolver_lite.common import profile_count
+    from wordle_autosolver_lite.common import MINIMAX, STRATEGIES
+    from wordle_autosolver_lite.data import load_first_moves, book_filename
+    from wordle_autosolver_lite.data import load_book, append_book
+    from wordle_autosolver_lite.store import fingerprint
+    from wordle_autosolver_lite.events import progress
+
+
+BOOK_SIZE: int = 16  # the solver keeps this many best guesses on each board
+
+# maps the fingerprint of an answer list to its first-move partitions
+_first_moves: Optional[dict[str, dict]] = None
+# maps each mode and strategy to the headers and entries of its books
+_books: Optional[dict[tuple[int, str], list[tuple[dict, dict]]]] = None
+_worker_data: tuple = ()
+
+
+def answers_fingerprint(answers: Iterable[str]) -> str:
+    """Gets a short str which identifies an ordered list of answers.
+
+    Args:
+        answers:
+            The list of possible answers
+
+    Returns:
+        The hex digest of the SHA-1 hash of all answers, in order.
+    """
+    return sha1('\n'.join(answers).encode('utf-8')).hexdigest()
+
+
+def build_first_moves(answers: list[str], starters: Iterable[str]) -> dict:
+    """Partitions a list of answers by the response to each starting word.
+
+    The partitions only hold honest responses; the partitions for master and
+    liar mode are derived from them in `first_move_remaining`. Each partition
+    is stored as the indexes of its answers in `answers`, sorted and
+    delta-encoded to keep the file small.
+
+    Args:
+        answers:
+            The list of all possible answers
+        starters:
+            The words which may be entered as the first guess
+
+    Returns:
+        A dict with the number of answers under "size", the fingerprint of
+        `answers` under "fingerprint", and a dict under "moves" mapping each
+        starter to a dict which maps every response to its encoded partition.
+    """
+    moves = {}
+    for starter in starters:
+        partitions = {}
+        for index, answer in enumerate(answers):
+            response = get_response(starter, answer, use_cache=False)
+            partitions.setdefault(response, []).append(index)
+        moves[starter] = dict(
+            (response, [ids[0]] + [b - a for a, b in zip(ids, ids[1:])])
+            for response, ids in partitions.items())
+    return {
+        'size': len(answers),
+        'fingerprint': answers_fingerprint(answers),
+        'moves': moves
+    }
+
+
+def set_first_moves(tables: Optional[Iterable[dict]] = None) -> None:
+    """Sets the first-move partitions available to `first_move_remaining`.
+
+    Args:
+        tables:
+            The dicts given by `build_first_moves`; if not set, the shipped
+            partitions will be loaded again the next time they are needed
+            (default: None)
+    """
+    global _first_moves
+    if tables is None:
+        _first_moves = None
+        return
+    _first_moves = dict((table['fingerprint'], table) for table in tables
+                        if len(table) > 0)
+
+
+def get_first_moves(answers: list[str]) -> Optional[dict]:
+    """Gets the first-move partitions of a list of answers, if available.
+
+    The shipped partitions are loaded the first time this is called.
+
+    Args:
+        answers:
+            The list of all possible answers
+
+    Returns:
+        The dict given by `build_first_moves` for `answers`, or `None` if the
+        partitions of this list have not been built.
+    """
+    if _first_moves is None:
+        set_first_moves([load_first_moves(False), load_first_moves(True)])
+    if not any(table['size'] == len(answers)
+               for table in _first_moves.values()):
+        return None  # avoid hashing lists which cannot match
+    return _first_moves.get(answers_fingerprint(answers))
+
+
+def first_move_remaining(answers: list[str], guess: str, response: str,
+                         mode: Optional[GameMode] = None
+                         ) -> Optional[list[str]]:
+    """Filters a full list of answers by looking up the first move.
+
+    Args:
+        answers:
+            The list of all possible answers
+        guess:
+            The word which was guessed by the player
+        response:
+            The response from the game after `guess` was entered
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+
+    Returns:
+        The same list given by `filter_remaining`, or `None` if the partitions
+        for `answers` and `guess` have not been built.
+    """
+    if mode is None:
+        mode = GameMode()
+    table = get_first_moves(answers)
+    if table is None or guess not in table['moves']:
+        return None
+    solved = response == ''.join(RIGHT for _ in guess)
+    if solved and not mode.liar:
+        return [guess]
+    partitions = table['moves'][guess]
+    if mode.liar:
+        # the honest response differs by exactly one letter (unless solved)
+        keys = [honest for honest in partitions
+                if 1 == sum(int(a != b) for a, b in zip(honest, response))
+                or (solved and honest == response)]
+    elif mode.master:
+        keys = [honest for honest in partitions
+                if ''.join(sym * honest.count(sym)
+                           for sym in (RIGHT, CLOSE, WRONG)) == response]
+    else:
+        keys = [response] if response in partitions else []
+    profile_count('first_moves.hits')
+    ids = chain.from_iterable(accumulate(partitions[key]) for key in keys)
+    return [answers[index] for index in sorted(ids)]
+
+
+def _book_pool(guesses: Iterable[str], starter: str) -> str:
+    """Helper function which fingerprints the guess pool of a session.
+
+    The solver removes every entered guess from the session's guesses, so the
+    starter is added back before the pool is compared with a book. The pool
+    may change in place between calls, so it is fingerprinted each time.
+    """
+    return fingerprint(set(guesses) | {starter})
+
+
+def _init_book_worker(answers: list[str], guesses: list[str],
+                      freq: dict[str, float], mode: int,
+                      strategy: str) -> None:
+    """Helper function which gives each worker the data for its entries."""
+    global _worker_data
+    _worker_data = (answers, guesses, freq, GameMode(mode), strategy)
+
+
+def _book_entry(task: tuple[str, str]) -> dict:
+    """Helper function which ranks the second guesses after one response."""
+    answers, guesses, freq, mode, strategy = _worker_data
+    starter, response = task
+    remaining = first_move_remaining(answers, starter, response, mode)
+    if remaining is None:
+        remaining = filter_remaining(answers, starter, response, mode,
+                                     use_cache=False)
+    if mode.hard:  # the solver only allows guesses which could be the answer
+        constraints = Constraints()
+        constraints.update(starter, response)
+        subset = constraints.filter(guesses)
+    else:  # the solver never recommends a guess that was already entered
+        subset = [guess for guess in guesses if guess != starter]
+    best = sorted(rank_guesses(remaining, subset, mode, strategy),
+                  key=lambda x: freq[x], reverse=True)[:BOOK_SIZE]
+    return {'starter': starter, 'response': response, 'best': best}
+
+
+def build_book(answers: list[str], guesses: list[str], freq: dict[str, float],
+               starters: Iterable[str], mode: Optional[GameMode] = None,
+               strategy: str = MINIMAX, filename: Optional[str] = None, *,
+               jobs: Optional[int] = None, show: bool = True) -> list[dict]:
+    """Builds an opening book of the best second guesses.
+
+    For every starter and every response it can get, the book holds the same
+    list of best guesses that the solver would find after that response.
+    Each entry is written to `filename` as soon as it is ranked, and entries
+    which are already in the file are skipped, so an interrupted build can be
+    resumed by building the same book again.
+
+    Args:
+        answers:
+            The list of all possible answers
+        guesses:
+            The list of all valid guesses
+        freq:
+            A dict mapping every guess to its frequency of use
+        starters:
+            The words which may be entered as the first guess
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+        strategy:
+            One of `STRATEGIES`, used to rank the guesses (default: MINIMAX)
+        filename:
+            The name of the book file, relative to the data folder; if not set,
+            the book is only returned (default: None)
+
+    Keyword Args:
+        jobs:
+            The number of worker processes to use; if not set, one is used for
+            every CPU, and if 1, no worker processes are started (default:
+            None)
+        show:
+            A boolean value representing whether to show a progress bar
+            (default: True)
+
+    Returns:
+        A list holding the header of the book followed by all of its entries.
+
+    Raises:
+        ValueError: If `filename` holds a book built with different words, a
+            different mode, or a different strategy.
+    """
+    if mode is None:
+        mode = GameMode()
+    header = {
+        'answers': answers_fingerprint(answers),
+        'guesses': fingerprint(guesses),
+        'mode': mode.value & GameMode.MODE_MASK,
+        'strategy': strategy
+    }
+    rows = [] if filename is None else load_book(filename)
+    if len(rows) > 0 and rows[0] != header:
+        raise ValueError('"{}" was built for a different game; delete it to '
+                         'build a new book'.format(filename))
+    rows = rows if len(rows) > 0 else [header]
+    if filename is not None:  # drop any line left incomplete by a past build
+        append_book(filename, rows, reset=True)
+    done = set((row['starter'], row['response']) for row in rows[1:])
+    tasks = []
+    for starter in dict.fromkeys(starters):
+        for response in response_counts(starter, answers, mode,
+                                        use_cache=False):
+            if (starter, response) in done:
+                continue
+            remaining = first_move_remaining(answers, starter, response, mode)
+            if remaining is None:
+                remaining = filter_remaining(answers, starter, response, mode,
+                                             use_cache=False)
+            if len(remaining) > 1:  # the solver stops once a board is solved
+                tasks.append((starter, response))
+    args = (answers, guesses, freq, mode.value, strategy)
+    if jobs == 1:
+        _init_book_worker(*args)
+        pool = None
+        entries = map(_book_entry, tasks)
+    else:
+        pool = Pool(jobs, _init_book_worker, args)
+        entries = pool.imap_unordered(_book_entry, tasks)
+    try:
+        for entry in progress(entries, 'build_book', show, len(tasks)):
+            rows.append(entry)
+            if filename is not None:
+                append_book(filename, [entry])
+    finally:
+        if pool is not None:
+            pool.terminate()
+    return rows
+
+
+def set_books(books: Optional[Iterable[list[dict]]] = None) -> None:
+    """Sets the opening books available to `book_guesses`.
+
+    Args:
+        books:
+            The lists given by `build_book`; if not set, the books in the data
+            folder will be loaded again the next time they are needed (default:
+            None)
+    """
+    global _books
+    if books is None:
+        _books = None
+        return
+    _books = {}
+    for rows in books:
+        if len(rows) == 0:
+            continue
+        header = rows[0]
+        key = (header['mode'], header['strategy'])
+        _books.setdefault(key, []).append((header, dict(
+            ((row['starter'], row['response']), row['best'])
+            for row in rows[1:])))
+
+
+def book_guesses(answers: Iterable[str], guesses: Iterable[str],
+                 starter: str, response: str, mode: Optional[GameMode] = None,
+                 strategy: str = MINIMAX) -> Optional[list[str]]:
+    """Looks up the best second guesses in an opening book.
+
+    Args:
+        answers:
+            The list of all possible answers
+        guesses:
+            The guesses which have not been entered yet
+        starter:
+            The first guess which was entered
+        response:
+            The response from the game after `starter` was entered
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+        strategy:
+            One of `STRATEGIES`, used to rank the guesses (default: MINIMAX)
+
+    Returns:
+        The list of best guesses that the solver would find, or `None` if no
+        book holds the given game.
+    """
+    if mode is None:
+        mode = GameMode()
+    if _books is None:
+        books = []
+        for hard, master, liar in ((False, False, False), (True, False, False),
+                                   (False, True, False), (False, False, True)):
+            for nyt in (False, True):
+                for name in STRATEGIES:
+                    books.append(load_book(book_filename(hard, master, liar,
+                                                         nyt, name)))
+        set_books(books)
+    books = _books.get((mode.value & GameMode.MODE_MASK, strategy), [])
+    for header, book in books:
+        if (book.get((starter, response)) is not None
+                and header['answers'] == answers_fingerprint(answers)
+                and header['guesses'] == _book_pool(guesses, starter)):
+            profile_count('book.hits')
+            return book[(starter, response)]
+    return None
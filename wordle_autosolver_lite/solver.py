@@ -1,28 +1,67 @@
 from __future__ import annotations
 
-from random import sample, shuffle, choice
+from random import sample, shuffle, choice, randrange
 from itertools import combinations
-from typing import Callable, Optional
-from math import factorial as fac
-
-from tqdm import tqdm
+from csv import writer as csv_writer
+from inspect import isawaitable
+from asyncio import get_running_loop
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Awaitable, Callable, Generator, Iterable, Optional, Union
+from typing import TextIO
+from math import comb
+from time import perf_counter
 
 try:  # pragma: no cover
-    from common import GameMode
-    from common import RIGHT, CLOSE, WRONG, PROGRESS, SYM_ALTS
+    from common import GameMode, Constraints, WordIndex, filter_history
+    from common import WordSet, WordList
+    from common import RIGHT, CLOSE, WRONG, SYM_ALTS
     from common import get_response, filter_remaining
-    from common import colored_response, count_remaining
-    from common import best_guesses, set_best_guess_updated
+    from common import colored_response
+    from common import rank_guesses, set_best_guess_updated
+    from common import worst_case_remaining, response_entropy
+    from common import response_counts, strategy_score, profile_count
+    from common import SAVED_BEST, set_partition_cache
+    from common import MINIMAX, ENTROPY, HYBRID
+    from common import get_profiling, profile_time, profile_record
+    from openings import first_move_remaining, book_guesses
+    from events import emit, progress
+    from store import fingerprint
 except ModuleNotFoundError:  # this is only here to help pytest find the module
-    from wordle_autosolver_lite.common import RIGHT, CLOSE, WRONG, PROGRESS
+    from wordle_autosolver_lite.common import RIGHT, CLOSE, WRONG
+    from wordle_autosolver_lite.common import Constraints, WordIndex
+    from wordle_autosolver_lite.common import filter_history
+    from wordle_autosolver_lite.common import WordSet, WordList
     from wordle_autosolver_lite.common import get_response, filter_remaining
-    from wordle_autosolver_lite.common import colored_response, count_remaining
+    from wordle_autosolver_lite.common import colored_response
     from wordle_autosolver_lite.common import set_best_guess_updated
-    from wordle_autosolver_lite.common import GameMode, SYM_ALTS, best_guesses
+    from wordle_autosolver_lite.common import GameMode, SYM_ALTS, rank_guesses
+    from wordle_autosolver_lite.common import worst_case_remaining
+    from wordle_autosolver_lite.common import response_counts
+    from wordle_autosolver_lite.common import response_entropy
+    from wordle_autosolver_lite.common import strategy_score, profile_count
+    from wordle_autosolver_lite.common import SAVED_BEST, set_partition_cache
+    from wordle_autosolver_lite.common import MINIMAX, ENTROPY, HYBRID
+    from wordle_autosolver_lite.common import get_profiling, profile_time
+    from wordle_autosolver_lite.common import profile_record
+    from wordle_autosolver_lite.openings import first_move_remaining
+    from wordle_autosolver_lite.openings import book_guesses
+    from wordle_autosolver_lite.events import emit, progress
+    from wordle_autosolver_lite.store import fingerprint
 
 
 simulated_answers: list[str] = []
 
+# the columns written by `simulate` for each game
+RECORD_FIELDS: tuple[str, ...] = ('game', 'answers', 'guesses', 'score',
+                                  'seconds')
+MAX_FAILURES: int = 64  # the most failed games kept by `simulate`
+
+# requests made by `_solve_steps`, see `_run_steps` and `solve_wordle_async`
+_GUESS: str = 'guess'
+_RESPONSE: str = 'response'
+# the kernels hold the GIL and share global caches, so one thread is enough
+_executor: Optional[Executor] = None
+
 WORST_ANSWERS = [
     'fuzzy', 'epoxy', 'nymph', 'cynic', 'boozy', 'vivid', 'depot', 'movie',
     'their', 'aroma', 'allow', 'tacit', 'swill', 'ferry', 'forgo', 'fewer',
@@ -54,29 +93,92 @@ BEST_STARTERS = [  # these have been tested and will always solve in 6 or less
 
 
 class SessionInfo:
-    """Class holding all variables that define the current state of the game"""
+    """Class holding all variables that define the current state of the game
+
+    Per-board state is stored compactly: boards in the same state share their
+    remaining answers list, legal guess list, and Constraints instance, so a
+    session only holds one copy of each distinct state no matter how many
+    boards are being played. None of these shared objects are ever modified;
+    they are always replaced with new objects instead.
+    """
+    __slots__ = (
+        '_answers', '_guesses', '_entered', '_solved', 'unentered_answers',
+        'solve_count', 'num_boards', 'saved_best', 'freq', 'starters', 'mode',
+        'strategy', 'expected', 'remaining', 'subtree', 'best', 'constraints',
+        'legal', 'word_index', 'actual_best', 'time_limit'
+    )
+
     def __init__(self, num_boards: int, answers: list[str], guesses: list[str],
                  saved_best: dict, freq: dict[str, float],
                  starters: Optional[list[str]] = None,
-                 mode: Optional[GameMode] = None) -> None:
+                 mode: Optional[GameMode] = None,
+                 strategy: str = MINIMAX,
+                 time_limit: Optional[float] = None) -> None:
+        if strategy not in (MINIMAX, ENTROPY, HYBRID):
+            raise ValueError('unknown strategy: {}'.format(strategy))
         self.entered = []
         self.unentered_answers = set()
         self.solve_count = 0
         self.num_boards = num_boards
-        self.answers = answers[:]
-        self.guesses = guesses[:]
+        self.answers = answers
+        self.guesses = guesses
         self.saved_best = saved_best
         self.freq = freq
         self.starters = [] if starters is None else starters[:]
         self.mode = GameMode() if mode is None else mode
+        self.strategy = strategy
+        self.time_limit = time_limit  # seconds allowed to rank each board
         self.expected = list(range(num_boards))
-        self.remaining = [answers[:] for _ in range(num_boards)]
+        # boards in the same state share one list, see `_apply_responses`
+        remaining = answers[:]
+        self.remaining = [remaining for _ in range(num_boards)]
         self.solved = ['*****' for _ in range(num_boards)]
         self.subtree = [saved_best for _ in range(num_boards)]
         self.best = [[] for _ in range(num_boards)]
+        # hard mode only: what is known about each board and its legal guesses
+        constraints = Constraints()
+        self.constraints = [constraints for _ in range(num_boards)]
+        legal = guesses[:]
+        self.legal = [legal for _ in range(num_boards)]
+        self.word_index = None  # only built if a board uses a new word
         self.actual_best = (choice(BEST_STARTERS)
-                            if len(starters) == 0
-                            else starters[0])
+                            if len(self.starters) == 0
+                            else self.starters[0])
+
+    # the word containers below are checked for membership on every turn, so
+    # any list assigned to them is converted to a set-backed container
+
+    @property
+    def answers(self) -> WordSet:
+        return self._answers
+
+    @answers.setter
+    def answers(self, value: Iterable[str]) -> None:
+        self._answers = WordSet(value)
+
+    @property
+    def guesses(self) -> WordSet:
+        return self._guesses
+
+    @guesses.setter
+    def guesses(self, value: Iterable[str]) -> None:
+        self._guesses = WordSet(value)
+
+    @property
+    def entered(self) -> WordList:
+        return self._entered
+
+    @entered.setter
+    def entered(self, value: Iterable[str]) -> None:
+        self._entered = WordList(value)
+
+    @property
+    def solved(self) -> WordList:
+        return self._solved
+
+    @solved.setter
+    def solved(self, value: Iterable[str]) -> None:
+        self._solved = WordList(value)
 
     def copy(self, *,
              num_boards: Optional[int] = None,
@@ -86,6 +188,8 @@ class SessionInfo:
              freq: Optional[dict[str, float]] = None,
              starters: Optional[list[str]] = None,
              mode: Optional[GameMode] = None,
+             strategy: Optional[str] = None,
+             time_limit: Optional[float] = None
              ) -> SessionInfo:
         return SessionInfo(
             self.num_boards if num_boards is None else num_boards,
@@ -94,9 +198,38 @@ class SessionInfo:
             self.saved_best if saved_best is None else saved_best,
             self.freq if freq is None else freq,
             self.starters if starters is None else starters,
-            self.mode if mode is None else mode
+            self.mode if mode is None else mode,
+            self.strategy if strategy is None else strategy,
+            self.time_limit if time_limit is None else time_limit
         )
 
+    def fork(self) -> SessionInfo:
+        """Creates an independent copy of the current state of this session.
+
+        Unlike `copy`, which starts a new game with the same parameters, the
+        returned instance continues the current game from exactly this point.
+        The word lists and decision tree are shared with this instance, but
+        every container that the solver modifies is copied.
+
+        Returns:
+            A new SessionInfo instance which can be solved separately.
+        """
+        other = SessionInfo.__new__(SessionInfo)
+        for name in SessionInfo.__slots__:
+            setattr(other, name, getattr(self, name))
+        other.entered = self.entered
+        other.unentered_answers = set(self.unentered_answers)
+        other._guesses = self.guesses.copy()
+        other.starters = self.starters[:]
+        other.expected = self.expected[:]
+        other.remaining = self.remaining[:]
+        other.solved = self.solved
+        other.subtree = self.subtree[:]
+        other.best = [best[:] for best in self.best]
+        other.constraints = self.constraints[:]
+        other.legal = self.legal[:]
+        return other
+
     def __str__(self):
         PADDING, MAX_LENGTH = 24, 20
 
@@ -177,17 +310,17 @@ def get_worst_liar_response(guess: str, answer: str, remaining: list[str]):
     Returns:
         The response which results in the most remaining possible answers.
     """
-    mode = GameMode()
-    response = get_response(guess, answer, mode)
-    mode.liar = True
+    response = get_response(guess, answer, GameMode())
+    # one pass over the remaining answers scores every possible lie at once
+    counts = response_counts(guess, remaining, GameMode(GameMode.LIAR))
     worst_response = ''
     worst_count = 0
     for sym_idx in range(len(response)):
         for alt in SYM_ALTS[response[sym_idx]]:
-            response = response[:sym_idx] + alt + response[sym_idx + 1:]
-            count = count_remaining(remaining, guess, response, mode)
+            lie = response[:sym_idx] + alt + response[sym_idx + 1:]
+            count = counts.get(lie, 0)
             if count > worst_count:
-                worst_response = response
+                worst_response = lie
                 worst_count = count
     return worst_response
 
@@ -211,14 +344,22 @@ def manual_guess(session: SessionInfo, help: bool = False) -> str:
     Returns:
         The word which was selected as the guess.
     """
-    guesses = session.guesses
-    if session.mode.hard:
-        guesses = set(sum(session.remaining, []))
+    allowed = session.guesses
+    if session.mode.hard:  # only a remaining answer can be entered
+        allowed = set()
+        # boards in the same state share one list, which is only added once
+        for answers in dict((id(x), x) for x in session.remaining).values():
+            allowed.update(answers)
+
+    def is_valid(word: str) -> bool:
+        """Helper function which checks whether a guess can be entered."""
+        return word in allowed
+
     if help:
         print("\n  Best guess is {}\n".format(session.actual_best.upper()))
     guess = input("  What is your next guess?\n    (Enter '!help' to see "
                   "the best guess)\n  >>> ").strip().lower()
-    while guess not in guesses:
+    while not is_valid(guess):
         if guess == '!help':
             return manual_guess(session, True)
         guess = input("  Invalid guess. Try again.\n  >>> ").strip().lower()
@@ -297,21 +438,18 @@ def simulated_response(session: SessionInfo) -> list[tuple[str, int]]:
             and len(simulated_answers) != session.num_boards):
         simulated_answers = sample(session.remaining[0],
                                    session.num_boards)  # pragma: no cover
-    responses = []
-    for board in session.expected:
-        if session.mode.liar:
-            responses.append(
-                (get_worst_liar_response(session.entered[-1],
-                                         simulated_answers[board],
-                                         session.remaining[board]),
-                 board)
-            )
-        else:
-            responses.append(
-                (get_response(session.entered[-1], simulated_answers[board],
-                              session.mode), board)
-            )
-    return responses
+    return [(_simulated_board_response(session, board,
+                                       simulated_answers[board]), board)
+            for board in session.expected]
+
+
+def _simulated_board_response(session: SessionInfo, board: int, answer: str
+                              ) -> str:
+    """Helper function for `simulated_response` and `solve_batch`."""
+    if session.mode.liar:
+        return get_worst_liar_response(session.entered[-1], answer,
+                                       session.remaining[board])
+    return get_response(session.entered[-1], answer, session.mode)
 
 
 ###############################################################################
@@ -322,7 +460,8 @@ def simulated_response(session: SessionInfo) -> list[tuple[str, int]]:
 def solve_wordle(session: SessionInfo,
                  auto_guess: Callable[[SessionInfo], str],
                  auto_response: Callable[[SessionInfo], list[tuple[str, int]]],
-                 allow_print=False) -> SessionInfo:
+                 allow_print=False, *, max_guesses: Optional[int] = None
+                 ) -> SessionInfo:
     """PRIMARY SOLVE FUNCTION - Solves Wordle(s) based on the given parameters.
 
     Args:
@@ -336,128 +475,376 @@ def solve_wordle(session: SessionInfo,
             A function which takes a SessionInfo instance and returns a list;
             for an example of what is expected, refer to `manual_response`
         allow_print:
-            A boolean value representing whether the program should print info
-            to the console (each guess/response, PROGRESS bars, etc.) (default:
-            False)
+            A boolean value representing whether the events sent to any
+            observers (each guess/response, PROGRESS bars, etc.) should be
+            printed to the console (default: False)
+
+    Keyword Args:
+        max_guesses:
+            If set, the solver gives up once this many guesses have been
+            entered, even if some boards are still unsolved (default: None)
 
     Returns:
         The given SessionInfo instance after it has been modified by the solver
     """
-    if allow_print:
-        print(
-            '\n\nStarting solver.' + (
-                '' if session.num_boards == 1 else
-                ' Simulating {} simultaneous Wordle games.'.format(
-                    session.num_boards
-                )
-            )
-        )
-    if allow_print and not session.mode.play:
-        print("\nSuggested starting word is {}\n".format(
-            session.actual_best.upper()
-        ))
+    steps = _solve_steps(session, auto_guess, auto_response, allow_print,
+                         max_guesses)
+    _run_steps(steps, session, auto_guess, auto_response)
+    return session
+
+
+async def solve_wordle_async(
+    session: SessionInfo,
+    auto_guess: Callable[[SessionInfo], Union[str, Awaitable[str]]],
+    auto_response: Callable[[SessionInfo],
+                            Union[list[tuple[str, int]],
+                                  Awaitable[list[tuple[str, int]]]]],
+    allow_print=False, *, max_guesses: Optional[int] = None,
+    executor: Optional[Executor] = None
+) -> SessionInfo:
+    """Solves Wordle(s) like `solve_wordle`, without blocking the event loop.
+
+    The guess and response functions may be coroutine functions (or return
+    any other awaitable), so one event loop can play many games at once while
+    waiting on each game for its responses. All filtering and ranking for a
+    turn is run in `executor`, and the session ends in the same state that
+    `solve_wordle` would leave it in given the same guesses and responses.
+
+    Args:
+        session:
+            A SessionInfo instance containing all information about the current
+            set of games being solved
+        auto_guess:
+            A function which takes a SessionInfo instance and returns a str (or
+            an awaitable giving a str); refer to `manual_guess`
+        auto_response:
+            A function which takes a SessionInfo instance and returns a list
+            (or an awaitable giving a list); refer to `manual_response`
+        allow_print:
+            A boolean value representing whether the events sent to any
+            observers should be printed to the console (default: False)
+
+    Keyword Args:
+        max_guesses:
+            If set, the solver gives up once this many guesses have been
+            entered, even if some boards are still unsolved (default: None)
+        executor:
+            The executor used to run the work for each turn; if not set, one
+            worker thread shared by every game is used, since the work for
+            separate games cannot run in parallel anyway (default: None)
+
+    Returns:
+        The given SessionInfo instance after it has been modified by the solver
+    """
+    global _executor
+    if executor is None:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(1, 'solve_wordle_async')
+        executor = _executor
+    loop = get_running_loop()
+    steps = _solve_steps(session, auto_guess, auto_response, allow_print,
+                         max_guesses)
+    value = None
+    while True:
+        try:
+            request = steps.send(value)
+        except StopIteration:
+            return session
+        if request == _GUESS:
+            value = auto_guess(session)
+        elif request == _RESPONSE:
+            value = auto_response(session)
+        else:
+            value = await loop.run_in_executor(executor, *request)
+        if isawaitable(value):
+            value = await value
+
+
+def _solve_steps(session: SessionInfo, auto_guess: Callable,
+                 auto_response: Callable, allow_print: bool,
+                 max_guesses: Optional[int]) -> Generator:
+    """Helper function which holds the main loop of `solve_wordle`.
+
+    Instead of calling the guess and response functions, this yields `_GUESS`
+    or `_RESPONSE` and expects the result to be sent back. Any slow work is
+    yielded as a tuple holding a function and its arguments, and its result is
+    sent back once it has been called. This lets `solve_wordle` and
+    `solve_wordle_async` share every step of the solver.
+    """
+    emit('solve.start', boards=session.num_boards, show=allow_print)
+    emit('solve.starter', guess=session.actual_best,
+         show=allow_print and not session.mode.play)
     # continue as long as there are still any unsolved boards
-    while (any(len(r) > 1 for r in session.remaining) or
-           (session.mode.play and
-            not all(x in session.entered for x in session.solved))):
-        # print the currently known letters/answers and display the best guess
-        if session.num_boards > 1 and allow_print and not session.mode.play:
-            print("\nSolved {:>2d}/{:<2d} boards: [{}]".format(
-                session.solve_count, session.num_boards,
-                ', '.join(session.solved).upper()
-            ))
-        if any(x not in session.entered for x in session.starters):
-            for guess in session.starters:
-                if guess not in session.entered:
-                    session.actual_best = guess
-                    if allow_print and not session.mode.play:
-                        print("\n  Predetermined guess is {}\n"
-                              .format(guess.upper()))
-                    break
-        elif allow_print and auto_guess != manual_guess:
-            print("\n  {} {}...\n".format((
-                    'Entering'
-                    if session.actual_best in session.solved
-                    else 'Guessing'
-                ), session.actual_best.upper()
-            ))
-        # enter the guess into the game; update `entered` and `guesses`
-        session.entered.append(auto_guess(session))
+    while not _is_finished(session, max_guesses):
+        _choose_guess(session, auto_guess, allow_print)
+        _record_guess(session, (yield _GUESS))
+        yield (_apply_responses, session, (yield _RESPONSE), auto_response,
+               allow_print)
+    yield from _finish_steps(session, auto_guess, allow_print)
+
+
+def _run_steps(steps: Generator, session: SessionInfo, auto_guess: Callable,
+               auto_response: Optional[Callable]) -> None:
+    """Helper function which runs every step given by a step generator."""
+    value = None
+    while True:
+        try:
+            request = steps.send(value)
+        except StopIteration:
+            return
+        if request == _GUESS:
+            value = auto_guess(session)
+        elif request == _RESPONSE:
+            value = auto_response(session)
+        else:
+            value = request[0](*request[1:])
+
+
+def solve_batch(session: SessionInfo,
+                jobs: Iterable[tuple[Optional[GameMode], list[str]]],
+                *, max_guesses: Optional[int] = None) -> list[SessionInfo]:
+    """Solves many independent simulated games at the same time.
+
+    Every job is solved exactly as `solve_wordle` would solve it using
+    `simulated_guess` and `simulated_response`. However, games are advanced
+    together one turn at a time, and any games which have received the same
+    responses so far share one SessionInfo instance. Since those games also
+    share the same remaining answers on every board, the filtering and best
+    guess calculations for that turn only need to be done once for the whole
+    group. Groups are split apart whenever their responses start to differ.
+
+    Args:
+        session:
+            A SessionInfo instance holding the word lists, decision tree,
+            frequency data, and starting words to use for every job
+        jobs:
+            An iterable of 2-tuples where the first element is the GameMode to
+            use (or `None` to use the mode of `session`) and the second element
+            is the list of answers, one for each board; only the jobs played
+            in the mode of `session` use its decision tree
+
+    Keyword Args:
+        max_guesses:
+            If set, each game is given up once this many guesses have been
+            entered, even if some boards are still unsolved (default: None)
+
+    Returns:
+        A list holding one solved SessionInfo instance for each job, in the
+        same order as the given jobs.
+    """
+    jobs = [(session.mode if mode is None else mode, answers)
+            for mode, answers in jobs]
+    results = [None for _ in jobs]
+    groups = {}
+    for index, (mode, answers) in enumerate(jobs):
+        key = (mode.value, len(answers))
+        if key not in groups:
+            groups[key] = []
+        groups[key].append(index)
+    # a decision tree only holds the best guesses of a single mode
+    trees = {session.mode.value & GameMode.MODE_MASK: session.saved_best}
+    pending = [
+        (session.copy(num_boards=num_boards, mode=GameMode(value),
+                      saved_best=trees.setdefault(
+                          value & GameMode.MODE_MASK, {})),
+         indices)
+        for (value, num_boards), indices in groups.items()
+    ]
+    while len(pending) > 0:
+        group, indices = pending.pop()
+        if _is_finished(group, max_guesses):
+            _finish_session(group, simulated_guess, False)
+            results[indices[0]] = group
+            for index in indices[1:]:
+                results[index] = group.fork()
+            continue
+        _enter_guess(group, simulated_guess, False)
+        # split the group apart based on the responses for each job
+        split = {}
+        for index in indices:
+            responses = tuple(
+                _simulated_board_response(group, board, jobs[index][1][board])
+                for board in group.expected
+            )
+            if responses not in split:
+                split[responses] = []
+            split[responses].append(index)
+        branches = [group.fork() for _ in range(len(split) - 1)] + [group]
+        for branch, (responses, members) in zip(branches, split.items()):
+            _apply_responses(branch, list(zip(responses, branch.expected)),
+                             simulated_response, False)
+            pending.append((branch, members))
+    return results
+
+
+def _is_finished(session: SessionInfo, max_guesses: Optional[int] = None
+                 ) -> bool:
+    """Helper function for `solve_wordle` and `solve_batch`."""
+    if max_guesses is not None and len(session.entered) >= max_guesses:
+        return True
+    return not (any(len(r) > 1 for r in session.remaining) or
+                (session.mode.play and
+                 not all(x in session.entered for x in session.solved)))
+
+
+def _enter_guess(session: SessionInfo, auto_guess: Callable,
+                 allow_print: bool) -> None:
+    """Helper function for `solve_batch`."""
+    _choose_guess(session, auto_guess, allow_print)
+    _record_guess(session, auto_guess(session))
+
+
+def _choose_guess(session: SessionInfo, auto_guess: Callable,
+                  allow_print: bool) -> None:
+    """Helper function which picks the guess to suggest before entering it."""
+    # report the currently known letters/answers and the best guess
+    emit('solve.progress', solved=session.solved[:],
+         count=session.solve_count, boards=session.num_boards,
+         show=(session.num_boards > 1 and allow_print
+               and not session.mode.play))
+    if any(x not in session.entered for x in session.starters):
+        for guess in session.starters:
+            if guess not in session.entered:
+                session.actual_best = guess
+                emit('guess.predetermined', guess=guess,
+                     show=allow_print and not session.mode.play)
+                break
+    else:
+        emit('guess.enter', guess=session.actual_best,
+             answer=session.actual_best in session.solved,
+             show=allow_print and auto_guess != manual_guess)
+
+
+def _record_guess(session: SessionInfo, guess: str) -> None:
+    """Helper function which enters a guess into the game."""
+    # update `entered` and `guesses`
+    session.entered.append(guess)
+    if session.entered[-1] in session.guesses:  # liar mode may repeat guesses
         session.guesses.remove(session.entered[-1])
-        # parse the response for each board and find the best guess(es)
-        session.best = [[] for _ in range(session.num_boards)]
-        for response, board in auto_response(session):
-            if all(x == RIGHT for x in response) and board in session.expected:
-                session.expected.remove(board)
-                session.solve_count += 1
-            session.best[board], session.remaining[board] = _parse_response(
-                response, board, auto_response, session, allow_print)
-        # recommend guessing any answers which have been found but not entered
-        _find_best_overall_guess(session, allow_print)
-    # function complete -- print any final information the user might need
-    if allow_print:
-        print('\n{} complete.\n'.format(
-            'Game' if session.mode.play else 'Solve'
-        ))
+    session.best = [[] for _ in range(session.num_boards)]
+
+
+def _apply_responses(session: SessionInfo,
+                     responses: Iterable[tuple[str, int]],
+                     auto_response: Callable, allow_print: bool) -> None:
+    """Helper function for `solve_wordle` and `solve_batch`."""
+    # the boards keep their remaining answers for the rest of the turn, so
+    # any partitions scored while ranking them can be reused until it ends
+    set_partition_cache()
+    try:
+        _apply_turn(session, responses, auto_response, allow_print)
+    finally:
+        set_partition_cache(False)
+
+
+def _apply_turn(session: SessionInfo, responses: Iterable[tuple[str, int]],
+                auto_response: Callable, allow_print: bool) -> None:
+    """Helper function which does the work for `_apply_responses`."""
+    profiling = get_profiling()
+    turn_time = 0.0
+    # boards that share a state and a response share the work done this turn
+    memo = {}
+    # parse the response for each board and find the best guess(es)
+    for response, board in responses:
+        if profiling:
+            start = perf_counter()
+        session.best[board], session.remaining[board] = _parse_response(
+            response, board, auto_response, session, allow_print, memo=memo)
+        if profiling:
+            elapsed = perf_counter() - start
+            turn_time += elapsed
+            profile_record('_parse_response/board {}'.format(board + 1),
+                           elapsed)
+        # in liar mode, a response with all letters correct may be a lie
+        if (all(x == RIGHT for x in response) and board in session.expected
+                and len(session.remaining[board]) == 1):
+            session.expected.remove(board)
+            session.solve_count += 1
+    if profiling:
+        profile_record('_parse_response/turn {}'.format(len(session.entered)),
+                       turn_time)
+        start = perf_counter()
+    # recommend guessing any answers which have been found but not entered
+    _find_best_overall_guess(session, allow_print)
+    if profiling:
+        profile_time('_find_best_overall_guess', start)
+
+
+def _finish_session(session: SessionInfo, auto_guess: Callable,
+                    allow_print: bool) -> None:
+    """Helper function for `solve_batch`."""
+    _run_steps(_finish_steps(session, auto_guess, allow_print), session,
+               auto_guess, None)
+
+
+def _finish_steps(session: SessionInfo, auto_guess: Callable,
+                  allow_print: bool) -> Generator:
+    """Helper function which enters any known answers, see `_solve_steps`."""
+    # function complete -- report any final information the user might need
+    emit('solve.finish', play=session.mode.play, show=allow_print)
     if len(session.unentered_answers) > 0 and auto_guess != manual_guess:
         # if in "auto" mode, and all answers are known, enter them one by one
-        if allow_print:
-            print('Entering all remaining answers... ({} total)'.format(
-                len(session.unentered_answers)
-            ))
+        emit('answers.start', total=len(session.unentered_answers),
+             show=allow_print)
         for index, answer in enumerate(session.solved):
-            if answer not in session.unentered_answers:
-                if allow_print:
-                    print('  Entered  {:>4d}/{:<4d} {}'.format(
-                        index + 1, len(session.remaining), answer.upper()
-                    ))
+            entered = answer not in session.unentered_answers
+            emit('answers.enter', index=index, total=len(session.remaining),
+                 answer=answer, entered=entered, show=allow_print)
+            if entered:
                 continue
-            if allow_print:
-                print('  Entering {:>4d}/{:<4d} {}'.format(
-                    index + 1, len(session.remaining), answer.upper()
-                ))
             session.actual_best = answer
-            session.entered.append(auto_guess(session))
-    if len(session.solved) > 4 and auto_guess == manual_guess and allow_print:
-        # if 5 or more games and "manual" mode, list all solutions in order
-        print("\nSOLUTIONS:")
-        for index, answer in enumerate(session.solved):
-            print("{:>4d}. {}".format(index + 1, answer))
-    session.unentered_answers = (
-        set(session.solved) & set(session.answers)) - set(session.entered)
-    return session
+            session.entered.append((yield _GUESS))
+    # if 5 or more games and "manual" mode, list all solutions in order
+    emit('solutions', solutions=session.solved[:],
+         show=(len(session.solved) > 4 and auto_guess == manual_guess
+               and allow_print))
+    session.unentered_answers = set(
+        x for x in session.solved
+        if x in session.answers and x not in session.entered)
 
 
 def _parse_response(response: str, board: int, auto_response: Callable,
-                    session: SessionInfo, allow_print: bool
+                    session: SessionInfo, allow_print: bool,
+                    *, memo: Optional[dict] = None
                     ) -> tuple[list[str], list[str]]:
-    """Helper function for `solve_wordle`."""
+    """Helper function for `solve_wordle`.
+
+    Boards are in the same state when they share the same remaining answers
+    list, saved guesses, and (in hard mode) legal guess list. Any work
+    which only depends on that state and the response is stored in `memo`,
+    keyed by the identities of those lists, so that every other board in the
+    same state can reuse it during this turn. Each value also holds the lists
+    in its key, so no identity can be reused by a new list during the turn.
+    """
+    if memo is None:
+        memo = {}
     guess = session.entered[-1]
     answers = session.remaining[board]
-    if (allow_print and
-            (session.mode.play or (auto_response != manual_response
-                                   and len(answers) > 1))):
-        print("  Response was \"{}\" on board {}".format(
-            colored_response(guess, response, session.mode), board + 1
-        ))
+    emit('board.response', board=board, guess=guess, response=response,
+         text=colored_response(guess, response, session.mode),
+         show=(allow_print and
+               (session.mode.play or (auto_response != manual_response
+                                      and len(answers) > 1))))
     if len(answers) == 1:  # this board has already been solved
         return [], answers
-    # just in case filtering results in an empty list, keep one element
-    valid_answer = answers[0]
-    answers = filter_remaining(answers, guess, response, session.mode)
-    if len(answers) == 0:  # response does not match any known answers
-        if allow_print:
-            print("\n\nBOARD {} USES A NEW WORD\n\n".format(board + 1))
-        answers = session.guesses  # create a new list using ALL words
-        # valid_answer only holds true up to the previous guess
-        for entry in session.entered[:-1]:
-            resp = get_response(entry, valid_answer, session.mode)
-            answers = filter_remaining(answers, entry, resp, session.mode)
-        # now filter the new list using the current guess and response
-        answers = filter_remaining(answers, guess, response, session.mode)
+    key = ('filter', id(answers), response)
+    if key not in memo:
+        memo[key] = (answers, *_filter_board(answers, guess, response,
+                                             session))
+    _, answers, new_word = memo[key]
+    if new_word:
+        emit('board.new_word', board=board, show=allow_print)
     if len(answers) == 0:  # response STILL does not match
         exit('ERROR: BAD RESPONSE ON BOARD {}: {}'
              .format(board + 1, response))
+    if session.mode.hard:  # only the newest response needs to be applied
+        legal = session.legal[board]
+        key = ('legal', id(legal), response)
+        if key not in memo:
+            constraints = session.constraints[board].copy()
+            constraints.update(guess, response)
+            memo[key] = (legal, constraints, constraints.filter(legal))
+        _, session.constraints[board], session.legal[board] = memo[key]
     if session.num_boards > 1:
         for index in range(len(response)):
             if all(r[index] == answers[0][index] for r in answers):
@@ -465,92 +852,154 @@ def _parse_response(response: str, board: int, auto_response: Callable,
                 session.solved[board] = (pattern[:index] + answers[0][index]
                                          + pattern[index + 1:])
     # update subtree (and by extension, also saved_best)
-    if guess not in session.subtree:
+    if guess not in session.subtree[board]:
         session.subtree[board][guess] = {}
         set_best_guess_updated()
     if response not in session.subtree[board][guess]:
         session.subtree[board][guess][response] = {}
         set_best_guess_updated()
     session.subtree[board] = session.subtree[board][guess][response]
-    # print best guesses (or the answer) to the console
+    # report best guesses (or the answer) to the observers
     best = []
     if len(answers) == 1:
         solution = answers[0]
         session.solved[board] = solution
-        if allow_print and (not session.mode.play or
-                            response == ''.join([RIGHT for _ in response])):
-            print("\n    The answer{} is {}\n".format(
-                    '' if session.num_boards == 1 else
-                    (' on board ' + str(board + 1)), solution.upper()))
+        emit('board.answer', board=board, boards=session.num_boards,
+             answer=solution,
+             show=allow_print and (not session.mode.play or
+                                   response == RIGHT * len(response)))
         return [], answers
     elif (auto_response != simulated_response or
             all(guess in session.entered for guess in session.starters)):
         # update tree with best guesses if the game is still unsolved
-        subset = list(session.subtree[board].keys())  # use any saved answers
-        if len(subset) == 0:
-            subset = session.guesses  # default to the entire allowed word list
-        if session.mode.hard:
-            for entry in session.entered:
-                resp = get_response(entry, answers[0], session.mode)
-                subset = filter_remaining(subset, entry, resp, session.mode)
-        best = sorted(
-            best_guesses(answers, subset, session.mode, show=allow_print),
-            key=lambda x: session.freq[x], reverse=True)[:16]
-        for best_guess in best:
-            if best_guess not in session.subtree[board]:
-                session.subtree[board][best_guess] = {}
+        node = session.subtree[board]
+        saved = tuple(x for x in node if x != SAVED_BEST)
+        legal = session.legal[board] if session.mode.hard else None
+        key = ('best', id(answers), saved, id(legal))
+        if key not in memo:
+            best = None
+            proven = True
+            entry = node.get(SAVED_BEST)
+            remaining_key = fingerprint(answers)
+            if (entry is None or entry['strategy'] != session.strategy
+                    or entry['remaining'] != remaining_key):
+                entry = None
+            else:  # this node was ranked before, so no search is needed
+                profile_count('saved_best.hits')
+                best = entry['guesses']
+            if (best is None and len(saved) == 0
+                    and len(session.entered) == 1 and not new_word):
+                # the second guess may be in an opening book
+                best = book_guesses(session.answers, session.guesses, guess,
+                                    response, session.mode, session.strategy)
+            if best is None:
+                subset = list(saved)  # use any saved answers
+                if session.mode.hard:
+                    subset = (legal if len(subset) == 0
+                              else session.constraints[board].filter(subset))
+                elif len(subset) == 0:
+                    subset = session.guesses  # default to the entire word list
+                best, proven = _best_board_guesses(session, answers, subset,
+                                                   allow_print)
+                best = sorted(best, key=lambda x: session.freq[x],
+                              reverse=True)[:16]
+            if entry is None and proven and len(best) > 0:
+                entry = {
+                    'guesses': best,
+                    'score': strategy_score(best[0], answers, session.mode,
+                                            session.strategy),
+                    'remaining': remaining_key,
+                    'strategy': session.strategy
+                }
+            memo[key] = (answers, legal, best, entry)
+        best, entry = memo[key][2:]
+        # guesses found before the time limit ran out are only suggestions
+        if entry is not None and node.get(SAVED_BEST) != entry:
+            node[SAVED_BEST] = entry
+            set_best_guess_updated()
+        for best_guess in best if entry is not None else []:
+            if best_guess not in node:
+                node[best_guess] = {}
                 set_best_guess_updated()
-        if allow_print and not session.mode.play:
-            print('  Best guess(es){}: {}'.format(
-                '' if session.num_boards == 1 else
-                (' on board ' + str(board + 1)),
-                (', '.join(best[:8]).upper() +
-                    ('' if len(best) <= 8 else ', ...'))
-                ))
-            print('    {} possible answers{}'.format(len(answers),
-                  (': ' + str(', '.join(answers)).upper())
-                   if (len(answers) <= 9) else ''))
+        # only short lists of answers are attached, to keep logs small
+        emit('board.best', board=board, boards=session.num_boards,
+             guesses=best[:], remaining=len(answers),
+             answers=answers[:] if len(answers) <= 9 else [],
+             show=allow_print and not session.mode.play)
     return best, answers
 
 
+def _filter_board(answers: list[str], guess: str, response: str,
+                  session: SessionInfo) -> tuple[list[str], bool]:
+    """Helper function which filters the answers on a single board."""
+    # just in case filtering results in an empty list, keep one element
+    valid_answer = answers[0]
+    filtered = None
+    if len(session.entered) == 1:  # the first move may be precomputed
+        filtered = first_move_remaining(answers, guess, response, session.mode)
+    if filtered is None:
+        filtered = filter_remaining(answers, guess, response, session.mode)
+    answers = filtered
+    if len(answers) > 0:
+        return answers, False
+    # the response does not match any known answers, so use ALL words
+    if session.word_index is None:
+        session.word_index = WordIndex(session.guesses)
+    # valid_answer only holds true up to the previous guess
+    history = [(entry, get_response(entry, valid_answer, session.mode))
+               for entry in session.entered[:-1]]
+    answers = filter_history(session.guesses, history, session.mode,
+                             index=session.word_index)
+    # now filter the new list using the current guess and response
+    return filter_remaining(answers, guess, response, session.mode), True
+
+
+def _best_board_guesses(session: SessionInfo, answers: list[str],
+                        subset: list[str], allow_print: bool
+                        ) -> tuple[list[str], bool]:
+    """Helper function which ranks guesses using the session's strategy."""
+    return rank_guesses(answers, subset, session.mode, session.strategy,
+                        time_limit=session.time_limit, show=allow_print,
+                        return_proven=True)
+
+
+def _guess_score(session: SessionInfo, guess: str, board: int) -> float:
+    """Helper function which scores a guess on one board (lower is better)."""
+    if session.strategy == ENTROPY:
+        return -response_entropy(guess, session.remaining[board], session.mode)
+    return worst_case_remaining(guess, session.remaining[board], session.mode)
+
+
 def _find_best_overall_guess(session: SessionInfo, allow_print: bool
                              ) -> tuple[str, set]:
     """Helper function for `solve_wordle`."""
-    session.unentered_answers = (
-        set(session.solved) & set(session.answers)) - set(session.entered)
+    session.unentered_answers = set(
+        x for x in session.solved
+        if x in session.answers and x not in session.entered)
     if ((len(session.unentered_answers) > 0 or
          session.solve_count < session.num_boards) and
             all(guess in session.entered for guess in session.starters)):
-        options = set(session.unentered_answers
-                      if len(session.unentered_answers) > 0
-                      else sum(session.best, []))
+        options = (set(session.unentered_answers)
+                   if len(session.unentered_answers) > 0
+                   else set().union(*session.best))
         if 1 <= len(options) <= 2:
             session.actual_best = sorted(
                 list(options), key=lambda x: session.freq[x], reverse=True
             )[0]
         else:
             best_score = len(session.guesses) * session.num_boards
-            for next_guess in tqdm(options, ascii=PROGRESS, leave=False,
-                                   disable=not allow_print):
-                worst = []
-                for board in range(session.num_boards):
-                    found = set()
-                    worst_case = 1
-                    if len(session.remaining[board]) == 1:
-                        continue  # ignore any solved boards
-                    for answer in session.remaining[board]:
-                        response = get_response(next_guess, answer,
-                                                session.mode)
-                        if response in found:
-                            continue
-                        found.add(response)
-                        count = count_remaining(session.remaining[board],
-                                                next_guess, response,
-                                                session.mode)
-                        if count > worst_case:
-                            worst_case = count
-                    worst.append(worst_case)
-                total = sum(worst)
+            # boards sharing a remaining answers list only need one score
+            states = {}
+            for board in range(session.num_boards):
+                if len(session.remaining[board]) == 1:
+                    continue  # ignore any solved boards
+                state = states.setdefault(id(session.remaining[board]),
+                                          [board, 0])
+                state[1] += 1
+            for next_guess in progress(options, 'best_overall_guess',
+                                       allow_print):
+                total = sum(count * _guess_score(session, next_guess, board)
+                            for board, count in states.values())
                 if total < best_score:
                     best_score = total
                     session.actual_best = next_guess
@@ -562,17 +1011,18 @@ def _find_best_overall_guess(session: SessionInfo, allow_print: bool
             solved_board = session.solved.index(session.actual_best)
             if solved_board in session.expected:
                 session.expected.remove(solved_board)
-        if allow_print and not session.mode.play:
-            print("\n  Best next guess: {}".format(
-                session.actual_best.upper()
-            ))
+        emit('best_guess', guess=session.actual_best,
+             show=allow_print and not session.mode.play)
 
 
 def simulate(session: SessionInfo, total_sims: int = 0, best: int = -8,
              *, show: bool = True, return_if_worse: bool = False,
-             ) -> tuple[float, int]:
+             records: Optional[TextIO] = None) -> tuple[float, int]:
     """Runs a simulation to collect data about the given parameters.
 
+    Games are generated one at a time, so memory use does not grow with the
+    number of games, even when every combination of answers is simulated.
+
     Args:
         session:
             A SessionInfo instance containing all information about the current
@@ -583,9 +1033,19 @@ def simulate(session: SessionInfo, total_sims: int = 0, best: int = -8,
         best:
             Integer value representing the best worst-case score of all other
             simulations using different starting parameters (default: -8)
+
+    Keyword Args:
         show:
             A boolean value representing whether to show PROGRESS bars and more
             detailed results (default: True)
+        return_if_worse:
+            A boolean value representing whether to stop as soon as any game
+            scores less than `best` (default: False)
+        records:
+            If set, a text stream which one CSV row is written to as each game
+            finishes, holding the `RECORD_FIELDS` of that game: its number, the
+            answers and the guesses entered (each separated by spaces), its
+            score, and the seconds it took to solve (default: None)
 
     Returns:
         A 2-tuple where the first element is the average score and the second
@@ -594,64 +1054,89 @@ def simulate(session: SessionInfo, total_sims: int = 0, best: int = -8,
         is the list of all guesses used to solve the game.
     """
     global simulated_answers
-    answers = session.answers
-    n, r = len(answers), session.num_boards
-    max_sims = fac(n) / (fac(r) * fac(n - r))
+    answers = list(session.answers)
+    max_sims = comb(len(answers), session.num_boards)
     if total_sims == 0:
         total_sims = max_sims
-    generated = []
     if session.num_boards == 1:
         if total_sims < len(answers):
             generated = answers[:]
             shuffle(generated)
-            generated = generated[:total_sims]
+            generated = [[ans] for ans in generated[:total_sims]]
         else:
-            generated += [ans for ans in WORST_ANSWERS if ans in answers]
-            generated += [ans for ans in answers if ans not in WORST_ANSWERS]
+            generated = [[ans] for ans in WORST_ANSWERS if ans in answers]
+            generated += [[ans] for ans in answers if ans not in WORST_ANSWERS]
     elif total_sims < max_sims:
-        while len(generated) < total_sims:
-            answer_list = ','.join(sample(answers, session.num_boards))
-            if answer_list not in generated:
-                generated.append(answer_list)
+        generated = _sample_games(answers, session.num_boards, total_sims)
     else:
-        generated = [','.join(c) for c in
-                     combinations(answers, session.num_boards)]
-    total_sims = len(generated)
+        generated = combinations(answers, session.num_boards)
+    total_sims = min(total_sims, max_sims)
+    writer = None
+    if records is not None:
+        writer = csv_writer(records)
+        writer.writerow(RECORD_FIELDS)
     scores = {}
     failures = []
-    starting = str(session.starters)[1:-1]
-    if show:
-        print("Simulating {} unique games{}...".format(
-            len(generated),
-            '' if starting == '' else ' with starting word(s) ' + starting)
-        )
-    for answer_list in tqdm(generated, ascii=PROGRESS,
-                            leave=False, disable=not show):
-        simulated_answers = answer_list.split(',')
+    emit('simulate.start', games=total_sims, starters=list(session.starters),
+         show=show)
+    for game, answer_list in enumerate(progress(generated, 'simulate', show,
+                                                total_sims)):
+        simulated_answers = list(answer_list)
+        start = perf_counter()
+        # any game needing more guesses than this would score below -8
         result = solve_wordle(session.copy(), simulated_guess,
-                              simulated_response)
+                              simulated_response,
+                              max_guesses=session.num_boards + 13)
         score = -8
         if result.solved == simulated_answers:
             score = session.num_boards + 5
             score -= len(result.entered) + len(result.unentered_answers)
+        if writer is not None:
+            writer.writerow((game, ' '.join(answer_list),
+                             ' '.join(result.entered), score,
+                             '{:.6f}'.format(perf_counter() - start)))
         if score < best and return_if_worse:
             return score, score
         if score not in scores:
             scores[score] = 0
-        if score < 0:
-            failures.append(answer_list)
+        if score < 0 and len(failures) < MAX_FAILURES:
+            failures.append(','.join(answer_list))
         scores[score] += 1
     avg = sum(score * count for score, count in scores.items()) / total_sims
     worst = min(scores.keys())
-    if show:
-        print('\n\nSimulation complete.\n\n SCORE | COUNT | %TOTAL')
-        for score in range(-8, 6):
-            if score in scores:
-                count = scores[score]
-                print('{:^7d}|{:^7d}| {:<.4f}'.format(score, count, 100 *
-                                                      count / total_sims))
-        print("\nAVERAGE = {:.2f}".format(avg))
-        if len(failures) < 64:
-            print("FAILURES = {}".format(str(failures)))
-        print()
+    emit('simulate.finish', scores=scores, total=total_sims, average=avg,
+         failures=failures, show=show)
     return avg, worst
+
+
+def _sample_games(answers: list[str], num_boards: int, total_sims: int
+                  ) -> Iterable[tuple[str, ...]]:
+    """Helper function which picks distinct random games for `simulate`.
+
+    Every combination of answers has an index in the combinatorial number
+    system, and the indexes are visited in the order given by a random linear
+    congruential generator with a full period, skipping any which are too big.
+    Each index is visited at most once, so no games need to be remembered.
+    """
+    max_sims = comb(len(answers), num_boards)
+    modulus = 1 << max(2, (max_sims - 1).bit_length())
+    factor = 4 * randrange(modulus // 4) + 1  # full period for any odd step
+    step = 2 * randrange(modulus // 2) + 1
+    index = randrange(modulus)
+    count = 0
+    while count < total_sims:
+        index = (factor * index + step) % modulus
+        if index >= max_sims:
+            continue
+        count += 1
+        # convert the index back to the combination it represents
+        game = []
+        rest = index
+        top = len(answers)
+        for size in range(num_boards, 0, -1):
+            top -= 1
+            while comb(top, size) > rest:
+                top -= 1
+            rest -= comb(top, size)
+            game.append(answers[top])
+        yield tuple(reversed(game))
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import sqlite3
+from hashlib import sha1
+from json import dumps, loads
+from threading import Lock
+from typing import Iterable, Optional
+
+
+COMMIT_INTERVAL: int = 64  # results written before they are committed
+
+
+class ResultStore():
+    """A class which stores ranked guesses in a SQLite database
+
+    Each result is keyed by the game mode, the strategy used to rank the
+    guesses, the set of remaining answers, and the set of guesses which were
+    ranked. The order of the words in either set does not matter, so any two
+    paths through a game which leave the same answers share their results.
+    """
+
+    def __init__(self, filename: str = ':memory:') -> None:
+        """Opens (or creates) a result store.
+
+        Args:
+            filename:
+                The path to the database file; by default, the store is only
+                kept in memory (default: ':memory:')
+        """
+        self.filename = filename
+        # the connection is shared by every thread which ranks guesses (such
+        # as the async solver's workers), so it is only used under the lock
+        self._lock = Lock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'mode INTEGER, strategy TEXT, remaining TEXT, pool TEXT, '
+            'best TEXT, score REAL, '
+            'PRIMARY KEY (mode, strategy, remaining, pool))')
+        self._connection.commit()
+        self._pending = 0
+        self._last_pool: tuple = (None, '')
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def _pool_key(self, pool: Iterable[str]) -> str:
+        """Helper function which fingerprints a guess pool.
+
+        The same pool is usually used for every board in a turn, so the last
+        fingerprint is kept if the pool is a tuple or a frozenset. Any other
+        pool may have been changed in place, so it is fingerprinted each time.
+        """
+        if not isinstance(pool, (tuple, frozenset)):
+            return fingerprint(pool)
+        last, key = self._last_pool
+        if last is not pool:  # the pool is kept, so its id is never reused
+            key = fingerprint(pool)
+            self._last_pool = (pool, key)
+        return key
+
+    def get(self, mode: int, strategy: str, remaining: Iterable[str],
+            pool: Iterable[str]) -> Optional[tuple[list[str], float]]:
+        """Gets a stored result.
+
+        Args:
+            mode:
+                The value of the game mode, without the PLAY and ENDLESS flags
+            strategy:
+                The name of the strategy used to rank the guesses
+            remaining:
+                The remaining possible answers
+            pool:
+                The guesses which were ranked
+
+        Returns:
+            A 2-tuple holding the list of ranked guesses and the score of the
+            best guess, or `None` if no result is stored for this key.
+        """
+        key = (mode, strategy, fingerprint(remaining), self._pool_key(pool))
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT best, score FROM results WHERE mode = ? AND '
+                'strategy = ? AND remaining = ? AND pool = ?', key).fetchone()
+        if row is None:
+            return None
+        return loads(row[0]), row[1]
+
+    def put(self, mode: int, strategy: str, remaining: Iterable[str],
+            pool: Iterable[str], best: list[str], score: float) -> None:
+        """Stores a result, replacing any result with the same key.
+
+        Args:
+            mode:
+                The value of the game mode, without the PLAY and ENDLESS flags
+            strategy:
+                The name of the strategy used to rank the guesses
+            remaining:
+                The remaining possible answers
+            pool:
+                The guesses which were ranked
+            best:
+                The list of ranked guesses
+            score:
+                The score of the best guess
+        """
+        row = (mode, strategy, fingerprint(remaining), self._pool_key(pool),
+               dumps(best), score)
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                row)
+            self._pending += 1
+            if self._pending >= COMMIT_INTERVAL:
+                self._commit()
+
+    def commit(self) -> None:
+        """Writes every pending result to the database file."""
+        with self._lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        """Helper function which commits while the lock is held."""
+        self._connection.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Commits every pending result and closes the database."""
+        with self._lock:
+            self._commit()
+            self._connection.close()
+
+
+def fingerprint(words: Iterable[str]) -> str:
+    """Gets a short str which identifies an unordered set of words.
+
+    Args:
+        words:
+            The words in the set
+
+    Returns:
+        The hex digest of the SHA-1 hash of all words, in sorted order.
+    """
+    return sha1('\n'.join(sorted(words)).encode('utf-8')).hexdigest()
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Optional
+
+try:  # pragma: no cover
+    from common import RIGHT, CLOSE, WRONG, SAVED_BEST
+except ModuleNotFoundError:  # this is only here to help pytest find the module
+    from wordle_autosolver_lite.common import RIGHT, CLOSE, WRONG, SAVED_BEST
+
+
+SYMBOLS: str = WRONG + CLOSE + RIGHT  # the digits of every response code
+ROOT: int = 0
+MIN_CAPACITY: int = 64  # the smallest size of the history index
+
+
+class DecisionTree():
+    """A class which stores a decision tree as flat arrays of integers
+
+    The nested dict trees used by the solver alternate between state nodes,
+    which map each guess to a guess node, and guess nodes, which map each
+    response to the state node reached after it. Here every node is given an
+    integer id instead, and each node only stores the id of its parent, its
+    label, its first child, and its next sibling, in four parallel arrays. The
+    label of a guess node is the id of its word, and the label of a state node
+    is its response as a base-3 integer. State node 0 is the root.
+
+    Every state node can also be found with a single lookup by the history of
+    guesses and responses which leads to it, see `find`. The history index is
+    an open-addressing hash table, also stored in two flat arrays, which holds
+    the hash of each history next to the id of the node it leads to.
+    """
+    __slots__ = ('words', 'word_ids', 'parent', 'label', 'first_child',
+                 'next_sibling', 'best', 'best_index', 'length', '_hashes',
+                 '_ids', '_indexed')
+
+    def __init__(self) -> None:
+        self.words: list[str] = []
+        self.word_ids: dict[str, int] = {}
+        self.parent = array('i', [-1])
+        self.label = array('i', [-1])
+        self.first_child = array('i', [-1])
+        self.next_sibling = array('i', [-1])
+        # maps the id of a state node to its SAVED_BEST entry, if any
+        self.best: dict[int, dict] = {}
+        # maps the id of a state node to the number of guesses before its
+        # SAVED_BEST entry in the dict it came from
+        self.best_index: dict[int, int] = {}
+        self.length = 0
+        self._hashes = array('q', [0]) * MIN_CAPACITY
+        self._ids = array('i', [-1]) * MIN_CAPACITY
+        self._indexed = 0
+        self._insert(hash(''), ROOT)
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    @classmethod
+    def from_dict(cls, tree: dict) -> DecisionTree:
+        """Converts a nested dict tree to a new DecisionTree.
+
+        Args:
+            tree:
+                A dict in the format given by `rec_build_best_tree` or used for
+                `SessionInfo.saved_best`
+
+        Returns:
+            A new DecisionTree instance holding the same tree.
+        """
+        result = cls()
+        stack = [(ROOT, '', tree)]
+        while len(stack) > 0:
+            node, key, guesses = stack.pop()
+            if SAVED_BEST in guesses:
+                result.best[node] = guesses[SAVED_BEST]
+                result.best_index[node] = list(guesses).index(SAVED_BEST)
+            for guess, responses in guesses.items():
+                if guess == SAVED_BEST:
+                    continue
+                guess_node = result.add_guess(node, guess)
+                for response, subtree in responses.items():
+                    child = result.add_response(guess_node, response)
+                    stack.append((child, key + guess + response, subtree))
+        return result
+
+    def to_dict(self) -> dict:
+        """Converts this tree to the nested dict format.
+
+        Returns:
+            A new dict holding the same tree, in the format used by
+            `SessionInfo.saved_best`. Each SAVED_BEST entry is put back in the
+            same place among the guesses as in the dict given to `from_dict`,
+            or after every guess if it was added later.
+        """
+        nodes = [{} for _ in range(len(self))]
+        for node, entry in self.best.items():
+            if self.best_index.get(node) == 0:
+                nodes[node][SAVED_BEST] = entry
+        for node in range(1, len(self)):
+            name = (self.words[self.label[node]]
+                    if self.is_guess(node)
+                    else self.decode(self.label[node]))
+            parent = self.parent[node]
+            nodes[parent][name] = nodes[node]
+            if (parent in self.best
+                    and self.best_index.get(parent) == len(nodes[parent])):
+                nodes[parent][SAVED_BEST] = self.best[parent]
+        for node, entry in self.best.items():
+            if SAVED_BEST not in nodes[node]:
+                nodes[node][SAVED_BEST] = entry
+        return nodes[ROOT]
+
+    def is_guess(self, node: int) -> bool:
+        """Checks whether a node is a guess node.
+
+        Args:
+            node:
+                The id of the node
+
+        Returns:
+            True if the node is a guess node, or False if it is a state node.
+        """
+        depth = 0
+        while node != ROOT:
+            node = self.parent[node]
+            depth += 1
+        return depth % 2 == 1
+
+    def encode(self, response: str) -> int:
+        """Converts a response to its integer code.
+
+        Args:
+            response:
+                The response to convert
+
+        Returns:
+            The response as a base-3 integer, where each symbol is a digit.
+        """
+        code = 0
+        for sym in reversed(response):
+            code = 3 * code + SYMBOLS.index(sym)
+        return code
+
+    def decode(self, code: int) -> str:
+        """Converts an integer code back to its response.
+
+        Args:
+            code:
+                The code given by `encode`
+
+        Returns:
+            The response represented by the code.
+        """
+        response = []
+        for _ in range(self.length):
+            code, digit = divmod(code, 3)
+            response.append(SYMBOLS[digit])
+        return ''.join(response)
+
+    def children(self, node: int) -> Iterable[int]:
+        """Gets the ids of every child of a node.
+
+        Args:
+            node:
+                The id of the node
+
+        Returns:
+            An iterable holding the id of each child, newest first.
+        """
+        child = self.first_child[node]
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+    def _add(self, node: int, label: int) -> int:
+        """Helper function which finds or creates a child with a label."""
+        for child in self.children(node):
+            if self.label[child] == label:
+                return child
+        child = len(self.parent)
+        self.parent.append(node)
+        self.label.append(label)
+        self.first_child.append(-1)
+        self.next_sibling.append(self.first_child[node])
+        self.first_child[node] = child
+        return child
+
+    def add_guess(self, node: int, guess: str) -> int:
+        """Adds a guess to a state node, unless it was already added.
+
+        Args:
+            node:
+                The id of the state node
+            guess:
+                The guess to add
+
+        Returns:
+            The id of the guess node.
+        """
+        if guess not in self.word_ids:
+            self.word_ids[guess] = len(self.words)
+            self.words.append(guess)
+            self.length = len(guess)
+        return self._add(node, self.word_ids[guess])
+
+    def add_response(self, node: int, response: str) -> int:
+        """Adds a response to a guess node, unless it was already added.
+
+        Args:
+            node:
+                The id of the guess node
+            response:
+                The response to add
+
+        Returns:
+            The id of the state node reached after the response.
+        """
+        child = self._add(node, self.encode(response))
+        key = self.key(self.parent[node]) + self.words[self.label[node]]
+        if self._lookup(key + response) is None:
+            self._insert(hash(key + response), child)
+        return child
+
+    def _insert(self, key_hash: int, node: int) -> None:
+        """Helper function which adds a state node to the history index."""
+        if 4 * (self._indexed + 1) > 3 * len(self._ids):  # keep a quarter free
+            entries = [(h, n) for h, n in zip(self._hashes, self._ids)
+                       if n != -1]
+            self._hashes = array('q', [0]) * (2 * len(self._ids))
+            self._ids = array('i', [-1]) * (2 * len(self._ids))
+            self._indexed = 0
+            for entry in entries:
+                self._insert(*entry)
+        mask = len(self._ids) - 1
+        slot = key_hash & mask
+        while self._ids[slot] != -1:
+            slot = (slot + 1) & mask
+        self._hashes[slot] = key_hash
+        self._ids[slot] = node
+        self._indexed += 1
+
+    def _lookup(self, key: str) -> Optional[int]:
+        """Helper function which finds a state node in the history index."""
+        key_hash = hash(key)
+        mask = len(self._ids) - 1
+        slot = key_hash & mask
+        while self._ids[slot] != -1:
+            node = self._ids[slot]
+            if self._hashes[slot] == key_hash and self.key(node) == key:
+                return node
+            slot = (slot + 1) & mask
+        return None
+
+    def key(self, node: int) -> str:
+        """Gets the history key of a state node.
+
+        Args:
+            node:
+                The id of the state node
+
+        Returns:
+            Every guess and response leading to the node, joined into a str.
+        """
+        parts = []
+        while node != ROOT:
+            response = self.decode(self.label[node])
+            node = self.parent[node]
+            parts.append(self.words[self.label[node]] + response)
+            node = self.parent[node]
+        return ''.join(reversed(parts))
+
+    def find(self, history: Iterable[tuple[str, str]]) -> Optional[int]:
+        """Finds the state node reached after a game history.
+
+        Args:
+            history:
+                The guesses entered so far, each paired with its response
+
+        Returns:
+            The id of the state node, or `None` if it is not in the tree.
+        """
+        return self._lookup(''.join(guess + response
+                                    for guess, response in history))
+
+    def guesses(self, node: int) -> list[str]:
+        """Gets the guesses saved at a state node.
+
+        Args:
+            node:
+                The id of the state node
+
+        Returns:
+            The best guesses saved at the node if there are any, otherwise
+            the guesses which have a child in the tree.
+        """
+        if node in self.best:
+            return self.best[node]['guesses']
+        return [self.words[self.label[child]]
+                for child in reversed(list(self.children(node)))]
+
+    def next_guesses(self, history: Iterable[tuple[str, str]]
+                     ) -> Optional[list[str]]:
+        """Gets the guesses saved after a game history.
+
+        Args:
+            history:
+                The guesses entered so far, each paired with its response
+
+        Returns:
+            The list given by `guesses`, or `None` if the history is not in the
+            tree.
+        """
+        node = self.find(history)
+        return None if node is None else self.guesses(node)